@@ -15,15 +15,23 @@ locals {
   primary_ipv4_subnet_offset = try(var.cidrs.primary_ipv4_subnet_offset, 0)
   primary_ipv4_subnet_step   = try(var.cidrs.primary_ipv4_subnet_step, 1)
   secondaries                = try(var.cidrs.secondaries, null) == null ? {} : var.cidrs.secondaries
-  subnets = { for i, region in var.regions :
+
+  # Stable slot number of each region, falling back to the position of the region in var.regions
+  region_slots = { for i, region in var.regions : region => try(var.cidrs.region_slots[region], i) }
+  subnets = { for region in var.regions :
     format("%s-%s", var.name, module.regions.results[region].abbreviation) => {
       region                = region
-      primary_ipv4_cidr     = cidrsubnet(local.primary_ipv4_cidr, local.primary_ipv4_subnet_size - tonumber(split("/", local.primary_ipv4_cidr)[1]), local.primary_ipv4_subnet_offset + i * local.primary_ipv4_subnet_step)
-      secondary_ipv4_ranges = { for k, v in local.secondaries : k => cidrsubnet(v.ipv4_cidr, try(v.ipv4_subnet_size, 24) - tonumber(split("/", v.ipv4_cidr)[1]), try(v.ipv4_subnet_offset, 0) + i * try(v.ipv4_subnet_step, 1)) }
+      primary_ipv4_cidr     = cidrsubnet(local.primary_ipv4_cidr, local.primary_ipv4_subnet_size - tonumber(split("/", local.primary_ipv4_cidr)[1]), local.primary_ipv4_subnet_offset + local.region_slots[region] * local.primary_ipv4_subnet_step)
+      secondary_ipv4_ranges = { for k, v in local.secondaries : k => cidrsubnet(v.ipv4_cidr, try(v.ipv4_subnet_size, 24) - tonumber(split("/", v.ipv4_cidr)[1]), try(v.ipv4_subnet_offset, 0) + local.region_slots[region] * try(v.ipv4_subnet_step, 1)) }
       stack_type            = try(var.options.ipv6_ula, false) ? "IPV4_IPV6" : "IPV4_ONLY"
       ipv6_access_type      = try(var.options.ipv6_ula, false) ? "INTERNAL" : null
     }
   }
+
+  # Secondary ranges of each subnet to include in the NAT, or null if the NAT applies to all ranges of all subnets
+  nat_secondary_ranges = try(var.nat.include_secondary_ranges, null) == null && try(var.nat.exclude_secondary_ranges, null) == null ? null : { for k, v in local.subnets : k => [
+    for range_name in keys(v.secondary_ipv4_ranges) : range_name if try(var.nat.include_secondary_ranges, null) == null ? !contains(var.nat.exclude_secondary_ranges, range_name) : contains(var.nat.include_secondary_ranges, range_name)
+  ] }
 }
 
 module "regions" {
@@ -74,6 +82,13 @@ resource "google_compute_subnetwork" "subnet" {
       filter_expr          = coalesce(try(var.flow_logs.filter_expr, "true"), "true")
     }
   }
+
+  lifecycle {
+    precondition {
+      condition     = length(distinct(values(local.region_slots))) == length(local.region_slots)
+      error_message = "Each region must have a unique CIDR slot; add an explicit region_slots entry for every region."
+    }
+  }
 }
 
 resource "google_compute_route" "apis" {
@@ -109,18 +124,57 @@ resource "google_compute_router" "nat" {
   region      = each.key
 }
 
+# Reserve the requested number of static external addresses for the NAT in each
+# region; NATs in regions without static addresses allocate them automatically.
+resource "google_compute_address" "nat" {
+  for_each     = var.nat == null ? {} : merge([for region in var.regions : { for i in range(try(var.nat.static_ips[region], 0)) : format("%s-%s-%d", substr(var.name, 0, 63 - length(format("-%s-%d", module.regions.results[region].abbreviation, i))), module.regions.results[region].abbreviation, i) => region }]...)
+  project      = var.project_id
+  name         = each.key
+  description  = "Static address for NAT gateway internet egress"
+  address_type = "EXTERNAL"
+  region       = each.value
+  labels       = var.labels
+}
+
 resource "google_compute_router_nat" "nat" {
-  for_each                           = google_compute_router.nat
-  project                            = var.project_id
-  name                               = each.value.name
-  nat_ip_allocate_option             = "AUTO_ONLY"
-  source_subnetwork_ip_ranges_to_nat = "ALL_SUBNETWORKS_ALL_IP_RANGES"
-  router                             = each.value.name
-  region                             = each.value.region
+  for_each                            = google_compute_router.nat
+  project                             = var.project_id
+  name                                = each.value.name
+  nat_ip_allocate_option              = try(var.nat.static_ips[each.key], 0) > 0 ? "MANUAL_ONLY" : "AUTO_ONLY"
+  nat_ips                             = [for address in google_compute_address.nat : address.self_link if address.region == each.key]
+  source_subnetwork_ip_ranges_to_nat  = local.nat_secondary_ranges == null ? "ALL_SUBNETWORKS_ALL_IP_RANGES" : "LIST_OF_SUBNETWORKS"
+  router                              = each.value.name
+  region                              = each.value.region
+  enable_dynamic_port_allocation      = try(var.nat.enable_dynamic_port_allocation, false)
+  min_ports_per_vm                    = try(var.nat.min_ports_per_vm, null)
+  max_ports_per_vm                    = try(var.nat.enable_dynamic_port_allocation, false) ? try(var.nat.max_ports_per_vm, null) : null
+  enable_endpoint_independent_mapping = try(var.nat.enable_endpoint_independent_mapping, null)
+  tcp_established_idle_timeout_sec    = try(var.nat.tcp_established_idle_timeout_sec, null)
+  tcp_transitory_idle_timeout_sec     = try(var.nat.tcp_transitory_idle_timeout_sec, null)
+  tcp_time_wait_timeout_sec           = try(var.nat.tcp_time_wait_timeout_sec, null)
+  udp_idle_timeout_sec                = try(var.nat.udp_idle_timeout_sec, null)
+  icmp_idle_timeout_sec               = try(var.nat.icmp_idle_timeout_sec, null)
+
+  dynamic "subnetwork" {
+    for_each = local.nat_secondary_ranges == null ? {} : { for k, v in local.subnets : k => local.nat_secondary_ranges[k] if v.region == each.key }
+    content {
+      name                     = google_compute_subnetwork.subnet[subnetwork.key].id
+      source_ip_ranges_to_nat  = length(subnetwork.value) > 0 ? ["PRIMARY_IP_RANGE", "LIST_OF_SECONDARY_IP_RANGES"] : ["PRIMARY_IP_RANGE"]
+      secondary_ip_range_names = subnetwork.value
+    }
+  }
+
   log_config {
     enable = coalesce(try(var.nat.logging_filter, null), "unspecified") != "unspecified"
     filter = coalesce(try(var.nat.logging_filter, null), "unspecified") != "unspecified" ? var.nat.logging_filter : "ALL"
   }
+
+  lifecycle {
+    precondition {
+      condition     = alltrue([for region in keys(coalesce(try(var.nat.static_ips, null), {})) : contains(var.regions, region)])
+      error_message = "Each static_ips entry must be keyed by one of the regions of the network."
+    }
+  }
 }
 
 resource "google_compute_global_address" "psc" {
@@ -42,3 +42,15 @@ output "subnets_by_region" {
   A map of subnet region to name, self_link, and CIDRs.
   EOD
 }
+
+output "nat_addresses" {
+  value = length(google_compute_address.nat) == 0 ? null : { for region in var.regions : region => [for address in google_compute_address.nat : {
+    name      = address.name
+    address   = address.address
+    self_link = address.self_link
+  } if address.region == region] if try(var.nat.static_ips[region], 0) > 0 }
+  description = <<-EOD
+  A map of region to the static external addresses reserved for the Cloud NAT in that region, or null if no static NAT
+  addresses are reserved.
+  EOD
+}
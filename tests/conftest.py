@@ -1,21 +1,76 @@
 """Common testing fixtures."""
 
+import inspect
 import json
 import os
 import pathlib
 import shutil
-import subprocess
-import tempfile
 from collections.abc import Callable, Generator
-from contextlib import contextmanager
+from contextlib import ExitStack, contextmanager
 from typing import Any
 
 import pytest
 from google import auth
+from google.auth.credentials import AnonymousCredentials
 from google.cloud import compute_v1
 
+from .harness.cassettes import RECORD, REPLAY, cassette_clients, cassette_mode, fixture_cassette, recorded_project_ids
+from .harness.checkpoints import ResumedDestroyError
+from .harness.engine import default_engine
+from .harness.environment import getenv_bool
+from .harness.fake_compute import FakeCompute, FakeComputeServer, serve_fake_compute
+from .harness.golden import clone_golden_dir, prepare_golden_dir
+from .harness.plans import planned_resources
+from .harness.prefetch import PREFETCH_VAR, default_prefetch
+from .harness.scheduling import DurationScheduler
+from .harness.snapshot import ComputeClients, ComputeSnapshot, fetch_snapshot
+from .harness.state_server import StateServer, serve_state
+from .harness.timing import PhaseTimingReport
+
 DEFAULT_PREFIX = "mrpn"
 DEFAULT_TF_STATE_PREFIX = "tests/terraform-google-multi-region-private-network"
+DEFAULT_TF_BACKEND = "gcs"
+TF_BACKENDS = ("gcs", "local", "http")
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Register the tofu phase timing report and longest-first module scheduling plugins.
+
+    The JSON report is written to the file named by environment variable TEST_TF_TIMING_REPORT, and the module duration
+    history to the file named by TEST_TF_SCHEDULE_HISTORY, with fallback to the pytest cache directory when caching is
+    enabled.
+
+    NOTE: Prefetching fixtures with TEST_TF_PREFETCH requires pytest-xdist to be disabled, e.g. with `-n0`; see
+    harness.prefetch.
+    """
+    if getenv_bool(PREFETCH_VAR) and config.getoption("numprocesses", None):
+        msg = f"{PREFETCH_VAR} requires a single pytest process; add -n0 to the pytest arguments"
+        raise pytest.UsageError(msg)
+    report_path = os.getenv("TEST_TF_TIMING_REPORT")
+    if report_path:
+        report_path = report_path.strip()
+    cache = getattr(config, "cache", None)
+    config.pluginmanager.register(
+        PhaseTimingReport(
+            config=config,
+            report_path=pathlib.Path(report_path)
+            if report_path
+            else (cache.mkdir("tofu").joinpath("phase-timings.json") if cache else None),
+        ),
+        "tofu-phase-timing-report",
+    )
+    history_path = os.getenv("TEST_TF_SCHEDULE_HISTORY")
+    if history_path:
+        history_path = history_path.strip()
+    config.pluginmanager.register(
+        DurationScheduler(
+            config=config,
+            history_path=pathlib.Path(history_path)
+            if history_path
+            else (cache.mkdir("tofu").joinpath("module-durations.json") if cache else None),
+        ),
+        "tofu-duration-scheduler",
+    )
 
 
 @pytest.fixture(scope="session")
@@ -38,11 +93,16 @@ def project_id() -> str:
     """Return the project id to use for tests.
 
     Preference will be given to the environment variables TEST_GOOGLE_CLOUD_PROJECT and GOOGLE_CLOUD_PROJECT followed by
-    the default project identifier associated with local ADC credentials.
+    the default project identifier associated with local ADC credentials. When replaying cassettes the project that the
+    cassettes were recorded against is used instead of ADC.
     """
     project_id = os.getenv("TEST_GOOGLE_CLOUD_PROJECT") or os.getenv("GOOGLE_CLOUD_PROJECT")
     if project_id:
         project_id = project_id.strip()
+    if not project_id and cassette_mode() == REPLAY:
+        recorded = recorded_project_ids()
+        assert len(recorded) <= 1, f"Cassettes were recorded against more than one project: {', '.join(recorded)}"
+        project_id = next(iter(recorded), None)
     if not project_id:
         _, project_id = auth.default()
     assert project_id
@@ -89,8 +149,73 @@ def tf_state_prefix() -> str:
 
 
 @pytest.fixture(scope="session")
-def backend_tf_builder(tf_state_bucket: str, tf_state_prefix: str) -> Callable[[pathlib.Path, str], None]:
-    """Create or overwrite a _backend.tf file in the provided fixture_dir that configures GCS backend for state."""
+def tf_backend() -> str:
+    """Return the tofu/terraform backend to use for fixture state.
+
+    Preference will be given to the environment variable TEST_TF_BACKEND with fallback to the default value of 'gcs'.
+    The 'local' backend keeps state in the fixture directory, and the 'http' backend keeps state in a state server on
+    localhost; neither needs a state bucket and both remove state round trips to Google Cloud Storage.
+    """
+    backend = os.getenv("TEST_TF_BACKEND", DEFAULT_TF_BACKEND)
+    if backend:
+        backend = backend.strip().lower()
+    if not backend:
+        backend = DEFAULT_TF_BACKEND
+    assert backend in TF_BACKENDS, f"TEST_TF_BACKEND must be one of {', '.join(TF_BACKENDS)}"
+    return backend
+
+
+@pytest.fixture(scope="session")
+def tf_state_server(tmp_path_factory: pytest.TempPathFactory) -> Generator[StateServer, None, None]:
+    """Start a localhost state server for the http backend, shutting it down when the session finishes.
+
+    State files are kept in the directory named by environment variable TEST_TF_STATE_DIR, with fallback to a directory
+    shared by all pytest-xdist workers of the session so that each worker can use its own server.
+    """
+    state_dir = os.getenv("TEST_TF_STATE_DIR")
+    if state_dir:
+        state_dir = state_dir.strip()
+    with serve_state(
+        pathlib.Path(state_dir) if state_dir else tmp_path_factory.getbasetemp().parent.joinpath("tf-state"),
+    ) as server:
+        yield server
+
+
+@pytest.fixture(scope="session")
+def backend_tf_builder(
+    request: pytest.FixtureRequest,
+    tf_backend: str,
+    tf_state_prefix: str,
+) -> Callable[[pathlib.Path, str], None]:
+    """Create or overwrite a _backend.tf file in the provided fixture_dir that configures the backend for state.
+
+    NOTE: The state bucket or state server are only required by the gcs and http backends respectively.
+    """
+    match tf_backend:
+        case "gcs":
+            tf_state_bucket = request.getfixturevalue("tf_state_bucket")
+
+            def _settings(name: str) -> list[str]:
+                return [
+                    f'    bucket = "{tf_state_bucket}"',
+                    f'    prefix = "{tf_state_prefix}/{name}"',
+                ]
+
+        case "http":
+            tf_state_server = request.getfixturevalue("tf_state_server")
+
+            def _settings(name: str) -> list[str]:
+                address = tf_state_server.address(f"{tf_state_prefix}/{name}")
+                return [
+                    f'    address        = "{address}"',
+                    f'    lock_address   = "{address}"',
+                    f'    unlock_address = "{address}"',
+                ]
+
+        case _:
+
+            def _settings(_: str) -> list[str]:
+                return []
 
     def _backend_tf(fixture_dir: pathlib.Path, name: str) -> None:
         assert fixture_dir.exists()
@@ -99,9 +224,8 @@ def backend_tf_builder(tf_state_bucket: str, tf_state_prefix: str) -> Callable[[
             "\n".join(
                 [
                     "terraform {",
-                    '  backend "gcs" {',
-                    f'    bucket = "{tf_state_bucket}"',
-                    f'    prefix = "{tf_state_prefix}/{name}"',
+                    f'  backend "{tf_backend}" {{',
+                    *_settings(name),
                     "  }",
                     "}",
                 ],
@@ -118,26 +242,82 @@ def common_fixture_dir_ignores() -> Callable[[Any, list[str]], set[str]]:
 
 
 @pytest.fixture(scope="session")
-def root_fixture_dir(
-    tmp_path_factory: pytest.TempPathFactory,
-    backend_tf_builder: Callable[..., None],
-    common_fixture_dir_ignores: Callable[[Any, list[str]], set[str]],
-) -> Callable[[str], pathlib.Path]:
-    """Return a builder that makes a copy of the root module with backend configured appropriately."""
+def root_module_dir() -> pathlib.Path:
+    """Return the path to the root module under test."""
     root_module_dir = pathlib.Path(__file__).parent.parent.resolve()
     assert root_module_dir.exists()
     assert root_module_dir.is_dir()
     assert root_module_dir.joinpath("main.tf").exists()
     assert root_module_dir.joinpath("outputs.tf").exists()
     assert root_module_dir.joinpath("variables.tf").exists()
+    return root_module_dir
+
+
+@pytest.fixture(scope="session")
+def tf_plugin_cache_dir(tmp_path_factory: pytest.TempPathFactory) -> Generator[pathlib.Path, None, None]:
+    """Return the provider plugin cache directory to share between all fixtures and pytest-xdist workers.
+
+    Preference will be given to the environment variables TEST_TF_PLUGIN_CACHE_DIR and TF_PLUGIN_CACHE_DIR, which allow
+    the cache to be persisted between sessions, with fallback to a directory shared by all workers of the session. The
+    directory is exported as TF_PLUGIN_CACHE_DIR for the duration of the session so every tofu/terraform execution uses
+    it.
+    """
+    cache_dir = os.getenv("TEST_TF_PLUGIN_CACHE_DIR") or os.getenv("TF_PLUGIN_CACHE_DIR")
+    if cache_dir:
+        cache_dir = cache_dir.strip()
+    plugin_cache_dir = (
+        pathlib.Path(cache_dir) if cache_dir else tmp_path_factory.getbasetemp().parent.joinpath("tf-plugin-cache")
+    )
+    plugin_cache_dir.mkdir(parents=True, exist_ok=True)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("TF_PLUGIN_CACHE_DIR", str(plugin_cache_dir))
+        yield plugin_cache_dir
+
+
+@pytest.fixture(scope="session")
+def tf_golden_dir(
+    tf_plugin_cache_dir: pathlib.Path,
+    root_module_dir: pathlib.Path,
+    common_fixture_dir_ignores: Callable[[Any, list[str]], set[str]],
+) -> pathlib.Path:
+    """Return a copy of the root module that has been initialized once for the session, without a backend.
+
+    The golden directory contains the providers, child modules, and dependency lock file that every fixture needs.
+    """
+    golden_dir = prepare_golden_dir(
+        cache_dir=tf_plugin_cache_dir,
+        module_dir=root_module_dir,
+        tf_command=get_tf_command(),
+        ignore=common_fixture_dir_ignores,
+    )
+    assert golden_dir.joinpath("main.tf").exists()
+    return golden_dir
+
+
+@pytest.fixture(scope="session")
+def root_fixture_dir(
+    request: pytest.FixtureRequest,
+    tmp_path_factory: pytest.TempPathFactory,
+) -> Callable[[str], pathlib.Path]:
+    """Return a builder that clones the pre-initialized root module with backend configured appropriately.
+
+    Each fixture differs from the golden directory only by its _backend.tf file; the init executed by the fixture just
+    has to configure the backend.
+
+    NOTE: When replaying cassettes the fixture is not executed, so an empty directory is returned without requiring a
+    tofu/terraform binary or state bucket.
+    """
+    if cassette_mode() == REPLAY:
+        return tmp_path_factory.mktemp
+    tf_golden_dir = request.getfixturevalue("tf_golden_dir")
+    backend_tf_builder = request.getfixturevalue("backend_tf_builder")
 
     def _builder(name: str) -> pathlib.Path:
-        fixture_dir = tmp_path_factory.mktemp(name)
-        shutil.copytree(
-            src=root_module_dir,
-            dst=fixture_dir,
-            dirs_exist_ok=True,
-            ignore=common_fixture_dir_ignores,
+        # The numbered temporary directory keeps fixtures unique, while the fixture keeps its name for timing reports.
+        fixture_dir = tmp_path_factory.mktemp(name).joinpath(name)
+        clone_golden_dir(
+            golden_dir=tf_golden_dir,
+            fixture_dir=fixture_dir,
         )
         backend_tf_builder(
             fixture_dir=fixture_dir,
@@ -149,44 +329,279 @@ def root_fixture_dir(
 
 
 @pytest.fixture(scope="session")
-def networks_client() -> compute_v1.NetworksClient:
+def plan_fixture_dir(
+    tmp_path_factory: pytest.TempPathFactory,
+    tf_golden_dir: pathlib.Path,
+) -> Callable[[str], pathlib.Path]:
+    """Return a builder that clones the pre-initialized root module for the plan-only tier.
+
+    No backend is configured; the plan is made against empty local state so a state bucket is not required.
+    """
+
+    def _builder(name: str) -> pathlib.Path:
+        # The numbered temporary directory keeps fixtures unique, while the fixture keeps its name for timing reports.
+        fixture_dir = tmp_path_factory.mktemp(name).joinpath(name)
+        clone_golden_dir(
+            golden_dir=tf_golden_dir,
+            fixture_dir=fixture_dir,
+        )
+        return fixture_dir
+
+    return _builder
+
+
+@pytest.fixture(scope="session", autouse=True)
+def deferred_destroys() -> Generator[None, None, None]:
+    """Close the engine of this process at the end of the session, failing if any deferred destroy failed.
+
+    Destroys are deferred when environment variable TEST_TF_DEFERRED_DESTROY is 'background', where each destroy starts
+    as soon as the tests of its fixture finish, or 'session', where all destroys are executed concurrently here. This is
+    the only fixture that drains and closes the default engine; see harness.engine.TofuEngine.close().
+    """
+    yield
+    if not default_engine.cache_info().currsize:
+        return
+    try:
+        default_engine().close()
+    finally:
+        default_engine.cache_clear()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def prefetch_fixtures(request: pytest.FixtureRequest) -> Generator[None, None, None]:
+    """Start the lifecycle of every collected test module that declares fixture_tfvars, if TEST_TF_PREFETCH is true.
+
+    The parameters of each module's fixture_tfvars function are resolved as session fixtures, and the lifecycles are
+    started in collection order so that all fixtures are applied concurrently, bounded by TEST_TF_CONCURRENCY. Each
+    module's output fixture claims its own lifecycle through run_tofu_in_workspace(); lifecycles that are never claimed,
+    e.g. because every test of the module was skipped, are destroyed at the end of the session. See harness.prefetch.
+    """
+    if not getenv_bool(PREFETCH_VAR) or cassette_mode() == REPLAY:
+        yield
+        return
+    # Depend on deferred_destroys so that unclaimed lifecycles are exited before the engine is closed.
+    request.getfixturevalue("deferred_destroys")
+    root_fixture_dir = request.getfixturevalue("root_fixture_dir")
+    tf_command = get_tf_command()
+    prefetch = default_prefetch()
+    modules = dict.fromkeys(getattr(item, "module", None) for item in request.session.items)
+    try:
+        for module in modules:
+            fixture_tfvars = getattr(module, "fixture_tfvars", None)
+            if fixture_tfvars is None:
+                continue
+            tfvars = fixture_tfvars(
+                **{name: request.getfixturevalue(name) for name in inspect.signature(fixture_tfvars).parameters},
+            )
+            fixture = root_fixture_dir(module.FIXTURE_NAME)
+            prefetch.add(
+                fixture,
+                tfvars,
+                default_engine().start(
+                    tf_command=tf_command,
+                    fixture=fixture,
+                    tfvars=tfvars,
+                    destroy=not skip_destroy_phase(),
+                ),
+            )
+        yield
+    finally:
+        prefetch.close()
+
+
+@pytest.fixture(scope="session")
+def fake_compute_server() -> Generator[FakeComputeServer, None, None]:
+    """Return a localhost fake of the Compute REST API for the session.
+
+    The plan-only tier seeds the fake with the plan of each fixture; see planned_compute_snapshot. The fake is also
+    seeded from the tofu/terraform state or plan JSON files listed in environment variable
+    TEST_GOOGLE_COMPUTE_FAKE_SEED, separated by the platform path separator; see harness.fake_compute.
+    """
+    seeds = os.getenv("TEST_GOOGLE_COMPUTE_FAKE_SEED")
+    store = FakeCompute()
+    for seed in (seeds or "").split(os.pathsep):
+        if seed.strip():
+            store.seed(json.loads(pathlib.Path(seed.strip()).read_text()))
+    with serve_fake_compute(store) as server:
+        yield server
+
+
+@pytest.fixture(scope="session")
+def compute_client_options(request: pytest.FixtureRequest) -> dict[str, Any]:
+    """Return the keyword arguments used to initialize every compute v1 client.
+
+    If the environment variable TEST_GOOGLE_COMPUTE_ENDPOINT is set, the clients use anonymous credentials with that
+    endpoint, such as a fake or replay server; if TEST_GOOGLE_COMPUTE_FAKE_SEED is set the clients use the session's
+    fake_compute_server. Otherwise the clients use ADC with the default endpoint.
+
+    NOTE: The applied fixtures are still applied to Google Cloud; only the verification calls are sent to the endpoint.
+
+    NOTE: When replaying cassettes the clients are never called, so they use anonymous credentials and do not require
+    ADC.
+    """
+    if cassette_mode() == REPLAY:
+        return {
+            "credentials": AnonymousCredentials(),
+        }
+    endpoint = os.getenv("TEST_GOOGLE_COMPUTE_ENDPOINT")
+    if endpoint:
+        endpoint = endpoint.strip()
+    if not endpoint and os.getenv("TEST_GOOGLE_COMPUTE_FAKE_SEED"):
+        endpoint = request.getfixturevalue("fake_compute_server").endpoint
+    if not endpoint:
+        return {}
+    return {
+        "credentials": AnonymousCredentials(),
+        "client_options": {
+            "api_endpoint": endpoint,
+        },
+    }
+
+
+@pytest.fixture(scope="session")
+def networks_client(compute_client_options: dict[str, Any]) -> compute_v1.NetworksClient:
     """Return an initialized compute v1 NetworksClient."""
-    return compute_v1.NetworksClient()
+    return compute_v1.NetworksClient(**compute_client_options)
 
 
 @pytest.fixture(scope="session")
-def subnetworks_client() -> compute_v1.SubnetworksClient:
+def subnetworks_client(compute_client_options: dict[str, Any]) -> compute_v1.SubnetworksClient:
     """Return an initialized compute v1 SubnetworksClient."""
-    return compute_v1.SubnetworksClient()
+    return compute_v1.SubnetworksClient(**compute_client_options)
 
 
 @pytest.fixture(scope="session")
-def routes_client() -> compute_v1.RoutesClient:
+def routes_client(compute_client_options: dict[str, Any]) -> compute_v1.RoutesClient:
     """Return an initialized compute v1 RoutesClient."""
-    return compute_v1.RoutesClient()
+    return compute_v1.RoutesClient(**compute_client_options)
 
 
 @pytest.fixture(scope="session")
-def routers_client() -> compute_v1.RoutersClient:
+def routers_client(compute_client_options: dict[str, Any]) -> compute_v1.RoutersClient:
     """Return an initialized compute v1 RoutersClient."""
-    return compute_v1.RoutersClient()
+    return compute_v1.RoutersClient(**compute_client_options)
 
 
 @pytest.fixture(scope="session")
-def global_addresses_client() -> compute_v1.GlobalAddressesClient:
+def global_addresses_client(compute_client_options: dict[str, Any]) -> compute_v1.GlobalAddressesClient:
     """Return an initialized compute v1 GlobalAddressesClient."""
-    return compute_v1.GlobalAddressesClient()
+    return compute_v1.GlobalAddressesClient(**compute_client_options)
 
 
 @pytest.fixture(scope="session")
-def global_forwarding_rules_client() -> compute_v1.GlobalForwardingRulesClient:
+def global_forwarding_rules_client(compute_client_options: dict[str, Any]) -> compute_v1.GlobalForwardingRulesClient:
     """Return an initialized compute v1 GlobalForwardingRulesClient."""
-    return compute_v1.GlobalForwardingRulesClient()
+    return compute_v1.GlobalForwardingRulesClient(**compute_client_options)
+
+
+@pytest.fixture(scope="session")
+def compute_clients(
+    *,
+    networks_client: compute_v1.NetworksClient,
+    subnetworks_client: compute_v1.SubnetworksClient,
+    routes_client: compute_v1.RoutesClient,
+    routers_client: compute_v1.RoutersClient,
+    global_addresses_client: compute_v1.GlobalAddressesClient,
+    global_forwarding_rules_client: compute_v1.GlobalForwardingRulesClient,
+) -> ComputeClients:
+    """Return the compute v1 clients used to snapshot fixtures, from the session fixture of each client."""
+    return ComputeClients(
+        networks=networks_client,
+        subnetworks=subnetworks_client,
+        routes=routes_client,
+        routers=routers_client,
+        global_addresses=global_addresses_client,
+        global_forwarding_rules=global_forwarding_rules_client,
+    )
+
+
+@pytest.fixture(scope="session")
+def compute_snapshot(
+    project_id: str,
+    compute_clients: ComputeClients,
+) -> Callable[[str, dict[str, Any]], ComputeSnapshot]:
+    """Return a builder that fetches a snapshot of the named network and its resources after a fixture is applied.
+
+    The regions to snapshot are taken from the subnets_by_region output of the fixture. Test modules should request the
+    snapshot once from a module-scoped fixture and assert against it, rather than calling the compute clients per test.
+
+    If the environment variable TEST_CASSETTE_MODE is 'record' the responses are saved to the cassette of the network,
+    and if it is 'replay' they are served from the cassette without calling the compute clients.
+    """
+    mode = cassette_mode()
+
+    def _builder(network: str, output: dict[str, Any]) -> ComputeSnapshot:
+        clients = compute_clients
+        if mode:
+            clients = cassette_clients(fixture_cassette(network), None if mode == REPLAY else compute_clients)
+        return fetch_snapshot(
+            clients=clients,
+            project_id=project_id,
+            network=network,
+            regions=output["subnets_by_region"].keys(),
+        )
+
+    return _builder
+
+
+@pytest.fixture(scope="session")
+def planned_compute_snapshot(
+    fake_compute_server: FakeComputeServer,
+    project_id: str,
+) -> Callable[[str, dict[str, Any]], ComputeSnapshot]:
+    """Return a builder that seeds the fake compute server with a saved plan, then fetches a snapshot of the network.
+
+    This lets the plan-only tier verify the Compute resources of a fixture with the compute v1 clients, without network
+    access or Google Cloud credentials. The regions to snapshot are those of the planned subnetworks; attributes that
+    are unknown in the plan are synthesized by the fake, see harness.fake_compute.
+    """
+    options: dict[str, Any] = {
+        "credentials": AnonymousCredentials(),
+        "client_options": {
+            "api_endpoint": fake_compute_server.endpoint,
+        },
+    }
+    clients = ComputeClients(
+        networks=compute_v1.NetworksClient(**options),
+        subnetworks=compute_v1.SubnetworksClient(**options),
+        routes=compute_v1.RoutesClient(**options),
+        routers=compute_v1.RoutersClient(**options),
+        global_addresses=compute_v1.GlobalAddressesClient(**options),
+        global_forwarding_rules=compute_v1.GlobalForwardingRulesClient(**options),
+    )
+
+    def _builder(network: str, plan: dict[str, Any]) -> ComputeSnapshot:
+        fake_compute_server.store.seed(plan)
+        return fetch_snapshot(
+            clients=clients,
+            project_id=project_id,
+            network=network,
+            regions={
+                values["region"]
+                for address, values in planned_resources(plan).items()
+                if address.startswith("google_compute_subnetwork.")
+            },
+        )
+
+    return _builder
 
 
 def skip_destroy_phase() -> bool:
     """Determine if tofu destroy phase should be skipped for successful fixtures."""
-    return os.getenv("TEST_SKIP_DESTROY_PHASE", "False").lower() in ["true", "t", "yes", "y", "1"]
+    return getenv_bool("TEST_SKIP_DESTROY_PHASE")
+
+
+def offline_plan_env() -> dict[str, str]:
+    """Return environment overrides that let the plan-only tier execute without Google Cloud credentials.
+
+    If the environment variable TEST_TF_OFFLINE is true, the Google provider is given a placeholder access token so that
+    it can be configured without ADC; a plan of new resources against empty state does not call Google Cloud APIs.
+    """
+    if not getenv_bool("TEST_TF_OFFLINE"):
+        return {}
+    return {
+        "GOOGLE_OAUTH_ACCESS_TOKEN": "offline",
+    }
 
 
 def get_tf_command() -> str:
@@ -208,146 +623,66 @@ def run_tofu_in_workspace(
 ) -> Generator[dict[str, Any], None, None]:
     """Execute tofu fixture lifecycle in an optional workspace, yielding the output post-apply.
 
+    The phases are executed by the process-wide engine; see harness.engine.default_engine(). If the environment variable
+    TEST_CASSETTE_MODE is 'record' the output is saved to the cassette of the fixture, named by the name input var, and
+    if it is 'replay' the recorded output is yielded without executing tofu/terraform. A fixture that was verified by
+    a previous session that failed to destroy it is skipped once the resumed destroy succeeds; see harness.checkpoints.
+    If the lifecycle of the fixture was started by the prefetch_fixtures fixture with the same input vars and no
+    workspace, it is claimed instead of starting a new one; see harness.prefetch.
+
     NOTE: Resources will not be destroyed if the test case raises an error.
     """
     if tfvars is None:
         tfvars = {}
+    mode = cassette_mode()
+    if mode == REPLAY:
+        yield fixture_cassette(tfvars["name"]).output
+        return
     if not tf_command:
         tf_command = get_tf_command()
-    if workspace is not None and workspace != "":
-        subprocess.run(
-            [
-                tf_command,
-                f"-chdir={fixture!s}",
-                "workspace",
-                "select",
-                "-or-create",
-                workspace,
-            ],
-            check=True,
-            capture_output=True,
-        )
-    subprocess.run(
-        [
-            tf_command,
-            f"-chdir={fixture!s}",
-            "init",
-            "-no-color",
-            "-input=false",
-        ],
-        check=True,
-        capture_output=True,
-    )
-    with tempfile.NamedTemporaryFile(
-        mode="w",
-        prefix="tfvars",
-        suffix=".json",
-        encoding="utf-8",
-        delete_on_close=False,
-        delete=True,
-    ) as tfvar_file:
-        json.dump(tfvars, tfvar_file, ensure_ascii=False, indent=2)
-        tfvar_file.close()
-        # Validate module
-        subprocess.run(
-            [
-                tf_command,
-                f"-chdir={fixture!s}",
-                "validate",
-                "-no-color",
-                f"-var-file={tfvar_file.name}",
-            ],
-            check=True,
-            capture_output=True,
-        )
-        # Execute plan then apply with a common plan file.
-        with tempfile.NamedTemporaryFile(
-            mode="w+b",
-            prefix="tf",
-            suffix=".plan",
-            delete_on_close=False,
-            delete=True,
-        ) as plan_file:
-            plan_file.close()
-            subprocess.run(
-                [
-                    tf_command,
-                    f"-chdir={fixture!s}",
-                    "plan",
-                    "-no-color",
-                    "-input=false",
-                    f"-var-file={tfvar_file.name}",
-                    f"-out={plan_file.name}",
-                ],
-                check=True,
-                capture_output=True,
-            )
-            subprocess.run(
-                [
-                    tf_command,
-                    f"-chdir={fixture!s}",
-                    "apply",
-                    "-no-color",
-                    "-input=false",
-                    "-auto-approve",
-                    plan_file.name,
-                ],
-                check=True,
-                capture_output=True,
-            )
-
-        # Run plan again with -detailed-exitcode flag, which will only return an exit code of 0 if there are no further
-        # changes. This is to find subtle issues in the Terraform declaration which inadvertently triggers unexpected
-        # resource updates or recreations.
-        subprocess.run(
-            [
-                tf_command,
-                f"-chdir={fixture!s}",
-                "plan",
-                "-no-color",
-                "-input=false",
-                "-detailed-exitcode",
-                f"-var-file={tfvar_file.name}",
-            ],
-            check=True,
-            capture_output=True,
-        )
-        output = subprocess.run(
-            [
-                tf_command,
-                f"-chdir={fixture!s}",
-                "output",
-                "-no-color",
-                "-json",
-            ],
-            check=True,
-            capture_output=True,
-        )
+    with ExitStack() as stack:
         try:
-            yield {k: v["value"] for k, v in json.loads(output.stdout).items()}
-            if not skip_destroy_phase():
-                subprocess.run(
-                    [
-                        tf_command,
-                        f"-chdir={fixture!s}",
-                        "destroy",
-                        "-no-color",
-                        "-input=false",
-                        "-auto-approve",
-                        f"-var-file={tfvar_file.name}",
-                    ],
-                    check=True,
-                    capture_output=True,
-                )
-        finally:
-            subprocess.run(
-                [
-                    tf_command,
-                    f"-chdir={fixture!s}",
-                    "workspace",
-                    "select",
-                    "default",
-                ],
-                check=True,
-                capture_output=True,
+            pending = None if workspace else default_prefetch().claim(fixture, tfvars)
+            output = stack.enter_context(
+                pending
+                or default_engine().start(
+                    tf_command=tf_command,
+                    fixture=fixture,
+                    tfvars=tfvars,
+                    workspace=workspace,
+                    destroy=not skip_destroy_phase(),
+                ),
             )
+        except ResumedDestroyError as e:
+            pytest.skip(str(e))
+        if mode == RECORD:
+            cassette = fixture_cassette(tfvars["name"])
+            cassette.project_id = tfvars["project_id"]
+            cassette.output = output
+        yield output
+
+
+@contextmanager
+def plan_tofu_in_workspace(
+    fixture: pathlib.Path,
+    tfvars: dict[str, Any] | None,
+    workspace: str | None = None,
+    tf_command: str | None = None,
+) -> Generator[dict[str, Any], None, None]:
+    """Execute the plan-only tier of the tofu fixture lifecycle in an optional workspace, yielding the saved plan.
+
+    The fixture is initialized, validated, and planned but never applied; the yielded value is the JSON representation
+    of the plan from `show -json`. See harness.plans for helpers to extract planned values.
+    """
+    if tfvars is None:
+        tfvars = {}
+    if not tf_command:
+        tf_command = get_tf_command()
+    with default_engine().plan_lifecycle(
+        tf_command=tf_command,
+        fixture=fixture,
+        tfvars=tfvars,
+        workspace=workspace,
+        env=offline_plan_env(),
+    ) as plan:
+        yield plan
@@ -0,0 +1,205 @@
+"""Bulk capacity planning of the module's CIDR allocation across regions, sizes, offsets, and steps.
+
+Every range family (the primary range and each named secondary range) allocates one aligned block per region at index
+`offset + i * step`, so the blocks of a family form an arithmetic progression. The planner evaluates exhaustion and
+overlap of those progressions with closed-form integer arithmetic instead of materializing every subnet, and memoizes
+per-family and per-pair results so that sweeping a large search space mostly re-uses earlier work.
+"""
+
+import functools
+import ipaddress
+import itertools
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from .subnets import DEFAULT_PRIMARY_IPV4_CIDR, DEFAULT_SUBNET_OFFSET, DEFAULT_SUBNET_SIZE, DEFAULT_SUBNET_STEP
+
+PRIMARY = "primary"
+
+
+@dataclass(frozen=True)
+class RangeFamily:
+    """The parameters that determine the per-region blocks of a primary or secondary range."""
+
+    cidr: str
+    size: int = DEFAULT_SUBNET_SIZE
+    offset: int = DEFAULT_SUBNET_OFFSET
+    step: int = DEFAULT_SUBNET_STEP
+
+    @functools.cached_property
+    def _network(self) -> tuple[int, int]:
+        """Return the parent network address as an integer and its prefix length."""
+        network = ipaddress.IPv4Network(self.cidr, strict=False)
+        return int(network.network_address), network.prefixlen
+
+    @property
+    def base(self) -> int:
+        """Return the parent network address as an integer."""
+        return self._network[0]
+
+    @property
+    def newbits(self) -> int:
+        """Return the number of bits added to the parent prefix for each block."""
+        return self.size - self._network[1]
+
+    @property
+    def block(self) -> int:
+        """Return the number of addresses in each block."""
+        return 1 << (ipaddress.IPV4LENGTH - self.size)
+
+    def index(self, i: int) -> int:
+        """Return the block index allocated to the region at position i."""
+        return self.offset + i * self.step
+
+    def max_regions(self) -> int:
+        """Return the largest number of regions that can be allocated before the parent CIDR is exhausted."""
+        if self.newbits < 0 or self.size > ipaddress.IPV4LENGTH or self.offset < 0:
+            return 0
+        capacity = 1 << self.newbits
+        if self.offset >= capacity:
+            return 0
+        if self.step <= 0:
+            # Every region re-uses the offset block (step 0) or walks towards index 0 (negative step).
+            return capacity if self.step == 0 else self.offset // -self.step + 1
+        return (capacity - 1 - self.offset) // self.step + 1
+
+
+@dataclass(frozen=True)
+class Overlap:
+    """A pair of range families that allocate intersecting blocks, with the first colliding pair of region positions."""
+
+    first: str
+    second: str
+    first_region: int
+    second_region: int
+
+
+@dataclass(frozen=True)
+class CapacityResult:
+    """The outcome of evaluating a candidate allocation for a number of regions."""
+
+    regions: int
+    families: tuple[tuple[str, RangeFamily], ...]
+    exhausted: tuple[str, ...]
+    overlaps: tuple[Overlap, ...]
+
+    @property
+    def viable(self) -> bool:
+        """Return True if every family fits its parent CIDR and no blocks overlap."""
+        return not self.exhausted and not self.overlaps
+
+
+def families_from_cidrs(cidrs: Mapping[str, Any] | None) -> dict[str, RangeFamily]:
+    """Return the range families described by a value of the `cidrs` variable, applying the module defaults."""
+    cidrs = cidrs or {}
+
+    def _get(values: Mapping[str, Any], key: str, default: Any) -> Any:  # noqa: ANN401
+        value = values.get(key)
+        return default if value is None else value
+
+    families = {
+        PRIMARY: RangeFamily(
+            cidr=_get(cidrs, "primary_ipv4_cidr", DEFAULT_PRIMARY_IPV4_CIDR),
+            size=_get(cidrs, "primary_ipv4_subnet_size", DEFAULT_SUBNET_SIZE),
+            offset=_get(cidrs, "primary_ipv4_subnet_offset", DEFAULT_SUBNET_OFFSET),
+            step=_get(cidrs, "primary_ipv4_subnet_step", DEFAULT_SUBNET_STEP),
+        ),
+    }
+    for name, secondary in (cidrs.get("secondaries") or {}).items():
+        families[name] = RangeFamily(
+            cidr=secondary["ipv4_cidr"],
+            size=_get(secondary, "ipv4_subnet_size", DEFAULT_SUBNET_SIZE),
+            offset=_get(secondary, "ipv4_subnet_offset", DEFAULT_SUBNET_OFFSET),
+            step=_get(secondary, "ipv4_subnet_step", DEFAULT_SUBNET_STEP),
+        )
+    return families
+
+
+def _positions_hitting(family: RangeFamily, lo: int, hi: int, regions: int) -> range:
+    """Return the region positions whose block index in family falls within [lo, hi]."""
+    if family.step == 0:
+        return range(regions) if lo <= family.offset <= hi else range(0)
+    if family.step > 0:
+        first = -((family.offset - lo) // family.step)
+        last = (hi - family.offset) // family.step
+    else:
+        first = -((hi - family.offset) // -family.step)
+        last = (family.offset - lo) // -family.step
+    return range(max(first, 0), min(last, regions - 1) + 1)
+
+
+@functools.lru_cache(maxsize=65536)
+def _first_overlap(a: RangeFamily, b: RangeFamily, regions: int) -> tuple[int, int] | None:
+    """Return the first pair of region positions with intersecting blocks in families a and b, or None.
+
+    The family with the larger block is walked; each of its blocks covers a contiguous run of block indices in the
+    other family, which is intersected with that family's arithmetic progression in constant time.
+    """
+    swapped = a.block < b.block
+    outer, inner = (b, a) if swapped else (a, b)
+    for i in range(regions):
+        start = outer.base + outer.index(i) * outer.block
+        end = start + outer.block - 1
+        lo = (start - inner.base) // inner.block
+        hi = (end - inner.base) // inner.block
+        hits = _positions_hitting(inner, lo, hi, regions)
+        if hits:
+            return (hits[0], i) if swapped else (i, hits[0])
+    return None
+
+
+@functools.lru_cache(maxsize=65536)
+def _self_overlap(family: RangeFamily, regions: int) -> tuple[int, int] | None:
+    """Return the first pair of region positions that share a block within the family, or None."""
+    if regions > 1 and family.step == 0:
+        return 0, 1
+    return None
+
+
+def evaluate(families: Mapping[str, RangeFamily], regions: int) -> CapacityResult:
+    """Evaluate the families for a number of regions, reporting exhausted families and overlapping blocks."""
+    exhausted = tuple(name for name, family in families.items() if family.max_regions() < regions)
+    overlaps = []
+    for name, family in families.items():
+        if name not in exhausted and (positions := _self_overlap(family, regions)):
+            overlaps.append(Overlap(name, name, *positions))
+    for (first, a), (second, b) in itertools.combinations(families.items(), 2):
+        if first in exhausted or second in exhausted:
+            continue
+        if positions := _first_overlap(a, b, regions):
+            overlaps.append(Overlap(first, second, *positions))
+    return CapacityResult(
+        regions=regions,
+        families=tuple(families.items()),
+        exhausted=exhausted,
+        overlaps=tuple(overlaps),
+    )
+
+
+def sweep(
+    cidrs: Mapping[str, Any] | None,
+    regions: Iterable[int],
+    sizes: Mapping[str, Iterable[int]] | None = None,
+    offsets: Mapping[str, Iterable[int]] | None = None,
+    steps: Mapping[str, Iterable[int]] | None = None,
+) -> list[CapacityResult]:
+    """Evaluate every combination of region count and per-family size, offset, and step.
+
+    The sizes, offsets, and steps mappings are keyed by family name ('primary' or the secondary range name); a family
+    without an entry keeps the value from cidrs.
+    """
+    base = families_from_cidrs(cidrs)
+    sizes, offsets, steps = sizes or {}, offsets or {}, steps or {}
+    choices = [
+        [
+            (name, RangeFamily(family.cidr, size, offset, step))
+            for size, offset, step in itertools.product(
+                sizes.get(name, [family.size]),
+                offsets.get(name, [family.offset]),
+                steps.get(name, [family.step]),
+            )
+        ]
+        for name, family in base.items()
+    ]
+    return [evaluate(dict(combination), count) for count in regions for combination in itertools.product(*choices)]
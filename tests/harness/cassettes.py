@@ -0,0 +1,196 @@
+"""Record and replay of the compute_v1 requests and tofu/terraform output of a fixture.
+
+A cassette is a compact JSON file per fixture holding the module output and every compute_v1 request made to verify
+the fixture with its response. In record mode the real clients are wrapped so that each response is saved as it is
+received; in replay mode the responses are served from the cassette without credentials, network access, or applying
+the fixture, so that changes to the assertions can be checked in milliseconds.
+"""
+
+import functools
+import json
+import os
+import pathlib
+import threading
+from collections.abc import Callable, Iterable
+from typing import Any
+
+import proto
+from google.cloud import compute_v1
+
+from .snapshot import ComputeClients
+
+RECORD = "record"
+REPLAY = "replay"
+MODES = (RECORD, REPLAY)
+DEFAULT_CASSETTE_DIR = pathlib.Path(__file__).parent.parent.joinpath("cassettes")
+
+
+class CassetteMissError(LookupError):
+    """A request, or the fixture output, was not found in the cassette being replayed."""
+
+
+def cassette_mode() -> str | None:
+    """Return the cassette mode from environment variable TEST_CASSETTE_MODE, or None if cassettes are not used."""
+    mode = os.getenv("TEST_CASSETTE_MODE", "").strip().lower()
+    if not mode:
+        return None
+    assert mode in MODES, f"TEST_CASSETTE_MODE must be one of {', '.join(MODES)}"
+    return mode
+
+
+def _encode(value: Any) -> Any:  # noqa: ANN401
+    """Return value with every compute_v1 message replaced by a dict of its set fields and its type name."""
+    if isinstance(value, proto.Message):
+        return {"@type": type(value).__name__} | type(value).to_dict(
+            value,
+            use_integers_for_enums=False,
+            always_print_fields_with_no_presence=False,
+        )
+    if isinstance(value, list | tuple):
+        return [_encode(item) for item in value]
+    return value
+
+
+def _decode(value: Any) -> Any:  # noqa: ANN401
+    """Return the compute_v1 messages encoded in value."""
+    if isinstance(value, dict) and "@type" in value:
+        fields = dict(value)
+        return getattr(compute_v1, fields.pop("@type"))(fields)
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    return value
+
+
+def _key(service: str, method: str, request: proto.Message) -> str:
+    """Return the cassette key of a request, which is independent of field order."""
+    return f"{service}.{method} " + json.dumps(_encode(request), sort_keys=True, separators=(",", ":"))
+
+
+class Cassette:
+    """The recorded output and compute_v1 interactions of a fixture, persisted as JSON at path."""
+
+    def __init__(self, path: pathlib.Path, *, load: bool = True) -> None:
+        """Load the cassette from path if it exists and load is True, otherwise start an empty cassette."""
+        self.path = path
+        self._lock = threading.Lock()
+        self._data: dict[str, Any] = {"output": None, "interactions": {}}
+        if load and path.exists():
+            self._data = json.loads(path.read_text(encoding="utf-8"))
+
+    @property
+    def output(self) -> dict[str, Any]:
+        """Return the recorded fixture output."""
+        output = self._data.get("output")
+        if output is None:
+            msg = f"no output has been recorded in {self.path}"
+            raise CassetteMissError(msg)
+        return output
+
+    @output.setter
+    def output(self, value: dict[str, Any]) -> None:
+        with self._lock:
+            self._data["output"] = value
+            self._save()
+
+    @property
+    def project_id(self) -> str | None:
+        """Return the project id the cassette was recorded against."""
+        return self._data.get("project_id")
+
+    @project_id.setter
+    def project_id(self, value: str) -> None:
+        with self._lock:
+            self._data["project_id"] = value
+            self._save()
+
+    def record(self, key: str, response: Any) -> None:  # noqa: ANN401
+        """Save the response to the request identified by key."""
+        with self._lock:
+            self._data["interactions"][key] = _encode(response)
+            self._save()
+
+    def replay(self, key: str) -> Any:  # noqa: ANN401
+        """Return the response recorded for the request identified by key."""
+        try:
+            return _decode(self._data["interactions"][key])
+        except KeyError:
+            msg = f"{key} has not been recorded in {self.path}"
+            raise CassetteMissError(msg) from None
+
+    def _save(self) -> None:
+        """Write the cassette to disk; the caller must hold the lock."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self._data, sort_keys=True, separators=(",", ":")), encoding="utf-8")
+
+
+class CassetteClient:
+    """A stand-in for a compute_v1 client that records responses of the wrapped client, or replays them if it is None.
+
+    Only the get, list, and aggregated_list methods used by the compute snapshot are supported; list results are
+    materialized so that every page is recorded.
+    """
+
+    def __init__(self, cassette: Cassette, service: str, client: Any | None = None) -> None:  # noqa: ANN401
+        """Initialize the stand-in for service, e.g. 'networks'."""
+        self._cassette = cassette
+        self._service = service
+        self._client = client
+
+    def _call(self, method: str, request: proto.Message, fetch: Callable[[Any], Any]) -> Any:  # noqa: ANN401
+        key = _key(self._service, method, request)
+        if self._client is None:
+            return self._cassette.replay(key)
+        response = fetch(getattr(self._client, method)(request=request))
+        self._cassette.record(key, response)
+        return response
+
+    def get(self, request: proto.Message) -> Any:  # noqa: ANN401
+        """Return the resource identified by the request."""
+        return self._call("get", request, lambda response: response)
+
+    def list(self, request: proto.Message) -> Iterable[Any]:
+        """Return every resource matching the request."""
+        return self._call("list", request, list)
+
+    def aggregated_list(self, request: proto.Message) -> Iterable[Any]:
+        """Return every (scope, scoped list) pair matching the request."""
+        return self._call("aggregated_list", request, list)
+
+
+def cassette_clients(cassette: Cassette, clients: ComputeClients | None = None) -> ComputeClients:
+    """Return clients that record the responses of clients to cassette, or replay them from cassette if clients is None.
+
+    NOTE: The returned clients are duck-typed stand-ins for the compute_v1 clients.
+    """
+    return ComputeClients(
+        **{
+            service: CassetteClient(cassette, service, getattr(clients, service) if clients else None)
+            for service in ComputeClients.__dataclass_fields__
+        },
+    )
+
+
+def cassette_dir() -> pathlib.Path:
+    """Return the directory of cassettes from environment variable TEST_CASSETTE_DIR, or the default tests/cassettes."""
+    directory = os.getenv("TEST_CASSETTE_DIR")
+    if directory:
+        directory = directory.strip()
+    return pathlib.Path(directory) if directory else DEFAULT_CASSETTE_DIR
+
+
+@functools.cache
+def fixture_cassette(name: str) -> Cassette:
+    """Return the cassette of the named fixture shared by all tests in this process.
+
+    NOTE: In record mode any existing cassette is replaced, so that responses of a previous recording are not replayed.
+    """
+    return Cassette(cassette_dir().joinpath(f"{name}.json"), load=cassette_mode() != RECORD)
+
+
+def recorded_project_ids() -> set[str]:
+    """Return the project ids of every cassette in the cassette directory."""
+    return {
+        project_id
+        for path in sorted(cassette_dir().glob("*.json"))
+        if (project_id := Cassette(path).project_id) is not None
+    }
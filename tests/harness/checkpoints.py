@@ -0,0 +1,82 @@
+"""Per-fixture records of the lifecycle phases that completed, used to resume a fixture after a failure.
+
+A checkpoint is keyed by the fingerprint of the fixture inputs (see harness.warm_pool), so a fixture only resumes from
+phases that completed with the same module sources, tfvars, and workspace. When a session fails after `apply`, e.g. in
+the idempotency plan or a test, the next session in resume mode re-enters the lifecycle after the last completed phase
+instead of planning and applying again. When the tests of a fixture pass the verify phase is recorded, so if its
+destroy fails the next session goes straight to the destroy; see ResumedDestroyError.
+
+NOTE: Resuming needs state that outlives the fixture directory, i.e. the gcs backend or the http backend with a
+persistent TEST_TF_STATE_DIR.
+"""
+
+import json
+import os
+import pathlib
+import tempfile
+import threading
+import time
+
+from .environment import getenv_bool
+
+
+class ResumedDestroyError(Exception):
+    """The fixture was verified by a previous session, and resuming it only destroyed its resources."""
+
+
+class Checkpoints:
+    """A directory of checkpoints, one JSON file per fixture fingerprint."""
+
+    def __init__(self, directory: pathlib.Path, *, resume: bool = False) -> None:
+        """Initialize the checkpoints; completed phases are only reported if resume is True."""
+        self.directory = directory
+        self.resume = resume
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> pathlib.Path:
+        return self.directory.joinpath(f"{key}.json")
+
+    def completed(self, key: str) -> list[str]:
+        """Return the phases completed for the fingerprint in order, or an empty list if not resuming."""
+        path = self._path(key)
+        if not self.resume or not path.exists():
+            return []
+        return json.loads(path.read_text(encoding="utf-8"))["completed"]
+
+    def complete(self, key: str, fixture: pathlib.Path, phase: str) -> None:
+        """Record that the phase completed for the fingerprint."""
+        with self._lock:
+            path = self._path(key)
+            checkpoint = (
+                json.loads(path.read_text(encoding="utf-8")) if path.exists() else {"fixture": None, "completed": []}
+            )
+            checkpoint["fixture"] = fixture.name
+            checkpoint["updated"] = time.time()
+            if phase not in checkpoint["completed"]:
+                checkpoint["completed"].append(phase)
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(checkpoint), encoding="utf-8")
+
+    def clear(self, key: str) -> None:
+        """Remove the checkpoint of the fingerprint, e.g. after the fixture is destroyed or is started from scratch."""
+        self._path(key).unlink(missing_ok=True)
+
+
+def default_checkpoints() -> Checkpoints | None:
+    """Return checkpoints kept in the directory named by environment variable TEST_TF_CHECKPOINT_DIR, or None.
+
+    Checkpoints are only recorded if TEST_TF_CHECKPOINT_DIR is set or TEST_TF_RESUME is true, where the fallback is a
+    directory in the system temporary directory. A failed session is resumed by setting TEST_TF_RESUME to true.
+    """
+    directory = os.getenv("TEST_TF_CHECKPOINT_DIR")
+    if directory:
+        directory = directory.strip()
+    resume = getenv_bool("TEST_TF_RESUME")
+    if not directory and not resume:
+        return None
+    return Checkpoints(
+        directory=pathlib.Path(directory)
+        if directory
+        else pathlib.Path(tempfile.gettempdir()).joinpath(f"tofu-checkpoints-{os.getuid()}"),
+        resume=resume,
+    )
@@ -0,0 +1,636 @@
+"""Asyncio lifecycle engine that drives tofu/terraform phases for many fixtures concurrently."""
+
+import asyncio
+import concurrent.futures
+import functools
+import json
+import os
+import pathlib
+import tempfile
+import threading
+from collections.abc import AsyncGenerator, Callable, Coroutine, Generator, Iterable, Mapping
+from contextlib import AbstractAsyncContextManager, AsyncExitStack, asynccontextmanager, contextmanager
+from types import TracebackType
+from typing import Any
+
+from .checkpoints import Checkpoints, ResumedDestroyError, default_checkpoints
+from .overlaps import Interval, check_tfvars, parse_existing_cidrs
+from .quota import QuotaLimiter, default_quota_limiter, resource_keys
+from .streaming import DEFAULT_TAIL_LINES, TofuError, stream_command
+from .timing import PhaseTimer, default_timer
+from .warm_pool import WarmPool, default_warm_pool, fingerprint
+
+DEFAULT_CONCURRENCY = 8
+# Deferred destroys are started as soon as the caller of workspace() exits, or are queued until drain() is called.
+DEFERRED_DESTROY_BACKGROUND = "background"
+DEFERRED_DESTROY_SESSION = "session"
+DEFERRED_DESTROY_MODES = (DEFERRED_DESTROY_BACKGROUND, DEFERRED_DESTROY_SESSION)
+# Exit code of `plan -detailed-exitcode` when the plan has changes.
+PLAN_CHANGES_EXIT_CODE = 2
+
+
+class TofuEngine:
+    """Run tofu/terraform fixture lifecycles on a dedicated event loop.
+
+    The event loop runs in a background thread so that synchronous pytest fixtures can submit coroutines and wait on
+    the returned futures, while the number of tofu/terraform processes executing at once is bounded by a semaphore.
+    The duration of every execution is recorded by the timer as a phase of the fixture, named by its directory, and
+    output is streamed to pytest logging as it is produced, retaining only the last tail_lines lines for failure
+    reports. Only default_engine() records to the session timer; other engines have a private timer unless one is
+    given, so they are left out of the session timing report. Before a fixture is planned, the ranges it would create
+    are checked for overlaps with each other and with any existing_ranges. If a quota limiter is provided, applies and
+    destroys hold its slots for the resource keys of the fixture. If deferred_destroy is set, the destroy of a
+    successful fixture is executed in the background or at drain() instead of before workspace() returns; see
+    DEFERRED_DESTROY_MODES. If a warm pool is provided, a fixture left applied with the same inputs by a previous
+    session is reused when a refresh shows no drift. If checkpoints are provided, the phases that complete are recorded
+    so that a failed fixture can resume after the last completed phase.
+    """
+
+    def __init__(
+        self,
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        timer: PhaseTimer | None = None,
+        tail_lines: int = DEFAULT_TAIL_LINES,
+        existing_ranges: Iterable[Interval] = (),
+        quota: QuotaLimiter | None = None,
+        deferred_destroy: str | None = None,
+        warm_pool: WarmPool | None = None,
+        checkpoints: Checkpoints | None = None,
+    ) -> None:
+        """Start the event loop thread; at most concurrency tofu/terraform processes will be executed at once."""
+        assert concurrency > 0
+        assert tail_lines > 0
+        assert deferred_destroy is None or deferred_destroy in DEFERRED_DESTROY_MODES
+        self.timer = timer or PhaseTimer()
+        self.existing_ranges = tuple(existing_ranges)
+        self.quota = quota
+        self.deferred_destroy = deferred_destroy
+        self.warm_pool = warm_pool
+        self.checkpoints = checkpoints
+        self._deferred: list[asyncio.Task[None]] = []
+        self._queued: list[Callable[[], Coroutine[Any, Any, None]]] = []
+        self._tail_lines = tail_lines
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="tofu-engine", daemon=True)
+        self._thread.start()
+
+    def submit[T](self, coro: Coroutine[Any, Any, T]) -> concurrent.futures.Future[T]:
+        """Schedule the coroutine on the engine event loop, returning a future that can be waited on from any thread."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def drain(self) -> list[Exception]:
+        """Execute any queued destroys and wait for every deferred destroy to finish, returning the errors raised."""
+        if self._loop.is_closed():
+            return []
+        return self.submit(self._drain()).result()
+
+    async def _drain(self) -> list[Exception]:
+        self._deferred.extend(self._loop.create_task(down()) for down in self._queued)
+        self._queued.clear()
+        deferred, self._deferred = self._deferred, []
+        results = await asyncio.gather(*deferred, return_exceptions=True)
+        return [result for result in results if isinstance(result, Exception)]
+
+    def close(self) -> None:
+        """Wait for deferred destroys, then stop the event loop and wait for the background thread to exit.
+
+        Raises an ExceptionGroup of the errors of any deferred destroys that failed, after the engine is stopped.
+        """
+        if self._loop.is_closed():
+            return
+        try:
+            errors = self.drain()
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+        if errors:
+            msg = "deferred destroys failed"
+            raise ExceptionGroup(msg, errors)
+
+    async def execute(
+        self,
+        tf_command: str,
+        fixture: pathlib.Path,
+        *args: str,
+        phase: str | None = None,
+        capture: bool = False,
+        env: Mapping[str, str] | None = None,
+    ) -> bytes:
+        """Execute a tofu/terraform command in the fixture directory, returning stdout if capture is True.
+
+        The execution is timed as the named phase, defaulting to the tofu/terraform sub-command, and output lines are
+        logged with the fixture and phase as prefix. Any env entries are added to the inherited environment. Raises
+        TofuError if the command exits with a non-zero return code.
+        """
+        phase = phase or args[0]
+        async with self._semaphore:
+            with self.timer.measure(fixture.name, phase):
+                return await stream_command(
+                    [tf_command, f"-chdir={fixture!s}", *args],
+                    label=f"{fixture.name} {phase}",
+                    capture=capture,
+                    tail_lines=self._tail_lines,
+                    env=env,
+                )
+
+    @asynccontextmanager
+    async def limited(self, fixture: pathlib.Path, phase: str, keys: Iterable[str]) -> AsyncGenerator[None, None]:
+        """Hold the quota slots of the resource keys for the enclosed phase, if the engine has a quota limiter.
+
+        Waiting for the slots is timed as the `<phase>-quota-wait` phase of the fixture.
+        """
+        if self.quota is None:
+            yield
+            return
+        async with AsyncExitStack() as stack:
+            with self.timer.measure(fixture.name, f"{phase}-quota-wait"):
+                await stack.enter_async_context(self.quota.acquire(keys))
+            yield
+
+    def check_overlaps(self, fixture: pathlib.Path, tfvars: Mapping[str, Any]) -> None:
+        """Raise OverlapError if the ranges computed from tfvars overlap each other or the existing ranges.
+
+        The check is timed as the overlap-check phase of the fixture so that it appears in the phase timing report.
+        """
+        with self.timer.measure(fixture.name, "overlap-check"):
+            check_tfvars(tfvars, self.existing_ranges)
+
+    async def prepare(
+        self,
+        tf_command: str,
+        fixture: pathlib.Path,
+        tfvar_file: pathlib.Path,
+        workspace: str | None = None,
+        env: Mapping[str, str] | None = None,
+    ) -> None:
+        """Select the optional workspace, then initialize and validate the fixture."""
+        if workspace is not None and workspace != "":
+            await self.execute(
+                tf_command,
+                fixture,
+                "workspace",
+                "select",
+                "-or-create",
+                workspace,
+                phase="workspace-select",
+                env=env,
+            )
+        await self.execute(tf_command, fixture, "init", "-no-color", "-input=false", env=env)
+        # Validate module
+        await self.execute(tf_command, fixture, "validate", "-no-color", f"-var-file={tfvar_file!s}", env=env)
+
+    async def up(
+        self,
+        tf_command: str,
+        fixture: pathlib.Path,
+        tfvar_file: pathlib.Path,
+        workspace: str | None = None,
+        quota_keys: Iterable[str] = (),
+        *,
+        prepared: bool = False,
+        checkpoint: str | None = None,
+    ) -> dict[str, Any]:
+        """Initialize, validate, plan, and apply the fixture, returning the output values post-apply.
+
+        The apply holds the quota slots of quota_keys; see limited(). Initialization and validation are skipped if the
+        fixture has already been prepared. Completed phases are recorded under the checkpoint key, and when resuming the
+        phases that completed in a previous session are skipped. The checkpoint is removed if the idempotency plan has
+        changes, so that a resumed session applies the fixture again instead of repeating the same failed plan.
+        """
+        completed = self._completed(checkpoint)
+        if not prepared:
+            await self.prepare(tf_command, fixture, tfvar_file, workspace)
+        if "apply" not in completed:
+            # Execute plan then apply with a common plan file.
+            with _plan_file() as plan_file:
+                await self.execute(
+                    tf_command,
+                    fixture,
+                    "plan",
+                    "-no-color",
+                    "-input=false",
+                    f"-var-file={tfvar_file!s}",
+                    f"-out={plan_file!s}",
+                )
+                async with self.limited(fixture, "apply", quota_keys):
+                    await self.execute(
+                        tf_command,
+                        fixture,
+                        "apply",
+                        "-no-color",
+                        "-input=false",
+                        "-auto-approve",
+                        str(plan_file),
+                    )
+            self._complete(checkpoint, fixture, "apply")
+        if "plan-detailed-exitcode" not in completed:
+            # Run plan again with -detailed-exitcode flag, which will only return an exit code of 0 if there are no
+            # further changes. This is to find subtle issues in the Terraform declaration which inadvertently triggers
+            # unexpected resource updates or recreations.
+            try:
+                await self.execute(
+                    tf_command,
+                    fixture,
+                    "plan",
+                    "-no-color",
+                    "-input=false",
+                    "-detailed-exitcode",
+                    f"-var-file={tfvar_file!s}",
+                    phase="plan-detailed-exitcode",
+                )
+            except TofuError as e:
+                if e.returncode == PLAN_CHANGES_EXIT_CODE:
+                    self._clear(checkpoint)
+                raise
+            self._complete(checkpoint, fixture, "plan-detailed-exitcode")
+        return await self.output(tf_command, fixture)
+
+    def _completed(self, checkpoint: str | None) -> list[str]:
+        """Return the phases to skip for the checkpoint key, discarding stale checkpoints when not resuming."""
+        if self.checkpoints is None or checkpoint is None:
+            return []
+        completed = self.checkpoints.completed(checkpoint)
+        if not completed:
+            self._clear(checkpoint)
+        return completed
+
+    def _complete(self, checkpoint: str | None, fixture: pathlib.Path, phase: str) -> None:
+        """Record that the phase completed under the checkpoint key."""
+        if self.checkpoints is not None and checkpoint is not None:
+            self.checkpoints.complete(checkpoint, fixture, phase)
+
+    def _clear(self, checkpoint: str | None) -> None:
+        """Remove the checkpoint key, so that no phase is skipped the next time the fixture is brought up."""
+        if self.checkpoints is not None and checkpoint is not None:
+            self.checkpoints.clear(checkpoint)
+
+    async def output(self, tf_command: str, fixture: pathlib.Path) -> dict[str, Any]:
+        """Return the output values of the fixture."""
+        output = await self.execute(tf_command, fixture, "output", "-no-color", "-json", capture=True)
+        return {k: v["value"] for k, v in json.loads(output).items()}
+
+    async def reuse(
+        self,
+        tf_command: str,
+        fixture: pathlib.Path,
+        tfvar_file: pathlib.Path,
+        workspace: str | None = None,
+    ) -> dict[str, Any] | None:
+        """Return the output values of the fixture if its existing resources have not drifted, otherwise None.
+
+        The fixture is initialized and validated, then drift is detected with a refresh-only plan; the refresh is timed
+        as the warm-refresh phase. An empty output means there is no state to reuse.
+        """
+        await self.prepare(tf_command, fixture, tfvar_file, workspace)
+        try:
+            await self.execute(
+                tf_command,
+                fixture,
+                "plan",
+                "-no-color",
+                "-input=false",
+                "-refresh-only",
+                "-detailed-exitcode",
+                f"-var-file={tfvar_file!s}",
+                phase="warm-refresh",
+            )
+        except TofuError as e:
+            if e.returncode != PLAN_CHANGES_EXIT_CODE:
+                raise
+            return None
+        return await self.output(tf_command, fixture) or None
+
+    async def down(
+        self,
+        tf_command: str,
+        fixture: pathlib.Path,
+        tfvar_file: pathlib.Path,
+        *,
+        destroy: bool = True,
+        quota_keys: Iterable[str] = (),
+    ) -> None:
+        """Optionally destroy the fixture resources, then return the fixture to the default workspace.
+
+        The destroy holds the quota slots of quota_keys; see limited().
+        """
+        try:
+            if destroy:
+                async with self.limited(fixture, "destroy", quota_keys):
+                    await self.execute(
+                        tf_command,
+                        fixture,
+                        "destroy",
+                        "-no-color",
+                        "-input=false",
+                        "-auto-approve",
+                        f"-var-file={tfvar_file!s}",
+                    )
+        finally:
+            await self.execute(tf_command, fixture, "workspace", "select", "default", phase="workspace-default")
+
+    async def plan(
+        self,
+        tf_command: str,
+        fixture: pathlib.Path,
+        tfvar_file: pathlib.Path,
+        workspace: str | None = None,
+        env: Mapping[str, str] | None = None,
+    ) -> dict[str, Any]:
+        """Initialize, validate, and plan the fixture without refreshing state, returning the saved plan as JSON.
+
+        Nothing is applied; the result is the machine-readable representation produced by `show -json`, which includes
+        planned_values and resource_changes.
+        """
+        await self.prepare(tf_command, fixture, tfvar_file, workspace, env)
+        with _plan_file() as plan_file:
+            await self.execute(
+                tf_command,
+                fixture,
+                "plan",
+                "-no-color",
+                "-input=false",
+                "-refresh=false",
+                f"-var-file={tfvar_file!s}",
+                f"-out={plan_file!s}",
+                env=env,
+            )
+            plan = await self.execute(
+                tf_command,
+                fixture,
+                "show",
+                "-no-color",
+                "-json",
+                str(plan_file),
+                capture=True,
+                env=env,
+            )
+        return json.loads(plan)
+
+    @asynccontextmanager
+    async def workspace(
+        self,
+        tf_command: str,
+        fixture: pathlib.Path,
+        tfvars: dict[str, Any],
+        workspace: str | None = None,
+        *,
+        destroy: bool = True,
+    ) -> AsyncGenerator[dict[str, Any], None]:
+        """Execute the fixture lifecycle in an optional workspace, yielding the output post-apply.
+
+        Checkpoints only let a fixture resume after a failure. When the caller succeeds the verify phase is recorded,
+        and the checkpoint is removed once the fixture is destroyed, or straight away if it is not to be destroyed. A
+        fixture whose destroy failed after it was verified resumes straight to the destroy, then ResumedDestroyError is
+        raised instead of yielding. The checkpoint is also removed when the resources of a warm fixture have drifted, so
+        that the next lifecycle applies and verifies them again.
+
+        NOTE: Resources will not be destroyed if the caller raises an error.
+        """
+        self.check_overlaps(fixture, tfvars)
+        quota_keys = resource_keys(tfvars)
+        pool = self.warm_pool
+        key = fingerprint(fixture, tfvars, workspace)
+        with _tfvar_file(tfvars) as tfvar_file:
+            if destroy and "verify" in self._completed(key):
+                await self.prepare(tf_command, fixture, tfvar_file, workspace)
+                await self.down(tf_command, fixture, tfvar_file, quota_keys=quota_keys)
+                self._clear(key)
+                msg = f"{fixture.name} was verified by a previous session, which failed to destroy it"
+                raise ResumedDestroyError(msg)
+            warm = pool is not None and key in pool
+            output = await self.reuse(tf_command, fixture, tfvar_file, workspace) if warm else None
+            if output is None:
+                if warm:
+                    self._clear(key)
+                output = await self.up(
+                    tf_command,
+                    fixture,
+                    tfvar_file,
+                    workspace,
+                    quota_keys,
+                    prepared=warm,
+                    checkpoint=key,
+                )
+                if pool is not None:
+                    pool.add(key, fixture)
+            succeeded = False
+            try:
+                yield output
+                succeeded = True
+            finally:
+                if destroy and succeeded:
+                    self._complete(key, fixture, "verify")
+                elif succeeded:
+                    self._clear(key)
+                if destroy and succeeded and pool is not None:
+                    pool.discard(key)
+                if destroy and succeeded and self.deferred_destroy:
+                    self._defer_down(tf_command, fixture, tfvars, quota_keys, key)
+                else:
+                    await self.down(
+                        tf_command,
+                        fixture,
+                        tfvar_file,
+                        destroy=destroy and succeeded,
+                        quota_keys=quota_keys,
+                    )
+                    if destroy and succeeded:
+                        self._clear(key)
+
+    def _defer_down(
+        self,
+        tf_command: str,
+        fixture: pathlib.Path,
+        tfvars: dict[str, Any],
+        quota_keys: Iterable[str],
+        checkpoint: str,
+    ) -> None:
+        """Start the destroy of the fixture in the background, or queue it until drain(), per deferred_destroy.
+
+        The checkpoint key is removed once the destroy succeeds.
+        """
+
+        async def _down() -> None:
+            # The tfvars file of workspace() is deleted when it returns, so the deferred destroy writes its own.
+            with _tfvar_file(tfvars) as tfvar_file:
+                await self.down(tf_command, fixture, tfvar_file, quota_keys=quota_keys)
+            self._clear(checkpoint)
+
+        if self.deferred_destroy == DEFERRED_DESTROY_BACKGROUND:
+            self._deferred.append(self._loop.create_task(_down()))
+        else:
+            self._queued.append(_down)
+
+    @asynccontextmanager
+    async def planned(
+        self,
+        tf_command: str,
+        fixture: pathlib.Path,
+        tfvars: dict[str, Any],
+        workspace: str | None = None,
+        env: Mapping[str, str] | None = None,
+    ) -> AsyncGenerator[dict[str, Any], None]:
+        """Plan the fixture in an optional workspace, yielding the JSON representation of the saved plan."""
+        self.check_overlaps(fixture, tfvars)
+        with _tfvar_file(tfvars) as tfvar_file:
+            plan = await self.plan(tf_command, fixture, tfvar_file, workspace, env)
+            try:
+                yield plan
+            finally:
+                await self.execute(
+                    tf_command,
+                    fixture,
+                    "workspace",
+                    "select",
+                    "default",
+                    phase="workspace-default",
+                    env=env,
+                )
+
+    def start(
+        self,
+        tf_command: str,
+        fixture: pathlib.Path,
+        tfvars: dict[str, Any],
+        workspace: str | None = None,
+        *,
+        destroy: bool = True,
+    ) -> "PendingLifecycle[dict[str, Any]]":
+        """Start workspace() without waiting for it, returning the pending lifecycle to enter when the output is needed.
+
+        Lifecycles started one after another are brought up concurrently, bounded by the concurrency of the engine.
+        """
+        return PendingLifecycle(self, self.workspace(tf_command, fixture, tfvars, workspace, destroy=destroy))
+
+    @contextmanager
+    def lifecycle(
+        self,
+        tf_command: str,
+        fixture: pathlib.Path,
+        tfvars: dict[str, Any],
+        workspace: str | None = None,
+        *,
+        destroy: bool = True,
+    ) -> Generator[dict[str, Any], None, None]:
+        """Wrap workspace() for synchronous callers, such as pytest generator fixtures, outside of an event loop."""
+        with self.start(tf_command, fixture, tfvars, workspace, destroy=destroy) as output:
+            yield output
+
+    @contextmanager
+    def plan_lifecycle(
+        self,
+        tf_command: str,
+        fixture: pathlib.Path,
+        tfvars: dict[str, Any],
+        workspace: str | None = None,
+        env: Mapping[str, str] | None = None,
+    ) -> Generator[dict[str, Any], None, None]:
+        """Wrap planned() for synchronous callers, such as pytest generator fixtures, outside of an event loop."""
+        with PendingLifecycle(self, self.planned(tf_command, fixture, tfvars, workspace, env)) as plan:
+            yield plan
+
+
+class PendingLifecycle[T]:
+    """An asynchronous context manager that is entered on the engine event loop as soon as it is created.
+
+    Entering the pending lifecycle from a synchronous caller waits for the value, and exiting it exits the asynchronous
+    context manager on the engine event loop.
+    """
+
+    def __init__(self, engine: TofuEngine, manager: AbstractAsyncContextManager[T]) -> None:
+        """Schedule entry of the asynchronous context manager on the event loop of the engine."""
+        self._engine = engine
+        self._manager = manager
+        self._entered = engine.submit(manager.__aenter__())
+
+    def __enter__(self) -> T:
+        """Wait for the asynchronous context manager to be entered, returning its value."""
+        return self._entered.result()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> bool | None:
+        """Exit the asynchronous context manager on the event loop, suppressing the exception if it does."""
+        return self._engine.submit(self._manager.__aexit__(exc_type, exc, traceback)).result()
+
+    def close(self) -> None:
+        """Exit a pending lifecycle that will not be entered by a caller, as if its caller had succeeded.
+
+        Nothing is done if entry failed, since there is no caller to report the error to.
+        """
+        try:
+            self._entered.result()
+        except Exception:  # noqa: BLE001
+            return
+        self.__exit__(None, None, None)
+
+
+@contextmanager
+def _tfvar_file(tfvars: dict[str, Any]) -> Generator[pathlib.Path, None, None]:
+    """Write tfvars to a temporary JSON file that is deleted on exit."""
+    with tempfile.NamedTemporaryFile(
+        mode="w",
+        prefix="tfvars",
+        suffix=".json",
+        encoding="utf-8",
+        delete_on_close=False,
+        delete=True,
+    ) as tfvar_file:
+        json.dump(tfvars, tfvar_file, ensure_ascii=False, indent=2)
+        tfvar_file.close()
+        yield pathlib.Path(tfvar_file.name)
+
+
+@contextmanager
+def _plan_file() -> Generator[pathlib.Path, None, None]:
+    """Return the path to a temporary plan file that is deleted on exit."""
+    with tempfile.NamedTemporaryFile(
+        mode="w+b",
+        prefix="tf",
+        suffix=".plan",
+        delete_on_close=False,
+        delete=True,
+    ) as plan_file:
+        plan_file.close()
+        yield pathlib.Path(plan_file.name)
+
+
+@functools.cache
+def default_engine() -> TofuEngine:
+    """Return the engine shared by all fixtures in this process.
+
+    The number of concurrent tofu/terraform executions can be set with environment variable TEST_TF_CONCURRENCY, and the
+    number of output lines retained for failure reports with TEST_TF_OUTPUT_LINES. Ranges of other existing networks
+    that fixtures must not overlap can be given as a comma-separated list of CIDRs, each optionally prefixed with a
+    `label=`, in TEST_TF_EXISTING_CIDRS. Limits on concurrent applies and destroys per resource key are read from
+    TEST_TF_QUOTA_LIMITS; see harness.quota. Destroys are deferred to the background or to the end of the session if
+    TEST_TF_DEFERRED_DESTROY is 'background' or 'session' respectively. Fixtures left applied by a previous session
+    are reused if TEST_TF_WARM_POOL_DIR names a directory to record them in; see harness.warm_pool. Completed phases
+    are checkpointed if TEST_TF_CHECKPOINT_DIR is set or TEST_TF_RESUME is true, and a failed fixture resumes after its
+    last completed phase if TEST_TF_RESUME is true; see harness.checkpoints.
+    """
+    concurrency = os.getenv("TEST_TF_CONCURRENCY")
+    if concurrency:
+        concurrency = concurrency.strip()
+    tail_lines = os.getenv("TEST_TF_OUTPUT_LINES")
+    if tail_lines:
+        tail_lines = tail_lines.strip()
+    deferred_destroy = os.getenv("TEST_TF_DEFERRED_DESTROY")
+    if deferred_destroy:
+        deferred_destroy = deferred_destroy.strip().lower()
+    return TofuEngine(
+        concurrency=int(concurrency) if concurrency else DEFAULT_CONCURRENCY,
+        timer=default_timer(),
+        tail_lines=int(tail_lines) if tail_lines else DEFAULT_TAIL_LINES,
+        existing_ranges=parse_existing_cidrs(os.getenv("TEST_TF_EXISTING_CIDRS")),
+        quota=default_quota_limiter(),
+        deferred_destroy=deferred_destroy or None,
+        warm_pool=default_warm_pool(),
+        checkpoints=default_checkpoints(),
+    )
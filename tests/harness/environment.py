@@ -0,0 +1,10 @@
+"""Parsing of the environment variables that configure the test harness."""
+
+import os
+
+TRUE_VALUES = ["true", "t", "yes", "y", "1"]
+
+
+def getenv_bool(name: str) -> bool:
+    """Return True if the environment variable is set to one of the accepted true values, ignoring case."""
+    return os.getenv(name, "False").strip().lower() in TRUE_VALUES
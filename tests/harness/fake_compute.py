@@ -0,0 +1,530 @@
+"""A local fake of the Compute Engine REST API surface used by the verification tests.
+
+The fake serves get, list, and aggregatedList requests for networks, subnetworks, routes, routers, global addresses, and
+global forwarding rules from resources seeded from the JSON representation of tofu/terraform state or a saved plan. The
+compute_v1 clients can be pointed at it with client_options and anonymous credentials, so verification tests execute
+without network access or Google Cloud credentials.
+
+NOTE: Only the `<field> eq <regex>` and `<field> ne <regex>` filter expressions used by the tests are supported.
+"""
+
+import hashlib
+import http.server
+import ipaddress
+import json
+import re
+import threading
+import urllib.parse
+from collections.abc import Generator, Iterable, Mapping
+from contextlib import contextmanager
+from typing import Any
+
+from .plans import module_resources
+from .subnets import COMPUTE_API_PREFIX
+
+DEFAULT_ROUTE_PRIORITY = 1000
+DEFAULT_INTERNET_GATEWAY = "default-internet-gateway"
+GLOBAL_COLLECTIONS = {
+    "networks": "compute#network",
+    "routes": "compute#route",
+    "addresses": "compute#address",
+    "forwardingRules": "compute#forwardingRule",
+}
+REGIONAL_COLLECTIONS = {
+    "subnetworks": "compute#subnetwork",
+    "routers": "compute#router",
+}
+FILTER_PATTERN = re.compile(r"^\s*(?P<field>[A-Za-z][\w.]*)\s+(?P<op>eq|ne)\s+(?P<value>.+?)\s*$")
+PATH_PATTERN = re.compile(
+    r"^/compute/v1/projects/(?P<project>[^/]+)/"
+    r"(?:global/(?P<global>\w+)|regions/(?P<region>[^/]+)/(?P<regional>\w+)|aggregated/(?P<aggregated>\w+))"
+    r"(?:/(?P<name>[^/]+))?$",
+)
+
+
+def _camel(name: str) -> str:
+    """Return the snake_case name in lowerCamelCase, as used by the Compute REST API."""
+    first, *rest = name.split("_")
+    return first + "".join(part.title() for part in rest)
+
+
+def _without_nulls(values: Mapping[str, Any]) -> dict[str, Any]:
+    """Return values without null entries, which are omitted from REST API responses."""
+    return {k: v for k, v in values.items() if v is not None}
+
+
+def _name(value: str | None) -> str | None:
+    """Return the final path segment of a resource id, self-link, or name."""
+    return value.rsplit("/", 1)[-1] if value else None
+
+
+def _global_link(project: str, collection: str, name: str) -> str:
+    return f"{COMPUTE_API_PREFIX}projects/{project}/global/{collection}/{name}"
+
+
+def _regional_link(project: str, region: str, collection: str, name: str) -> str:
+    return f"{COMPUTE_API_PREFIX}projects/{project}/regions/{region}/{collection}/{name}"
+
+
+def _region_link(project: str, region: str) -> str:
+    return f"{COMPUTE_API_PREFIX}projects/{project}/regions/{region}"
+
+
+class FakeCompute:
+    """An in-memory store of Compute Engine resources in the REST API representation.
+
+    Global resources are keyed by (project, collection) and regional resources by (project, region, collection); each
+    value is a list of resources in insertion order.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty store."""
+        self._lock = threading.Lock()
+        self._global: dict[tuple[str, str], list[dict[str, Any]]] = {}
+        self._regional: dict[tuple[str, str, str], list[dict[str, Any]]] = {}
+
+    def add_global(self, project: str, collection: str, resource: dict[str, Any]) -> None:
+        """Add a global resource, replacing any existing resource with the same name."""
+        with self._lock:
+            items = self._global.setdefault((project, collection), [])
+            items[:] = [item for item in items if item["name"] != resource["name"]]
+            items.append(resource)
+
+    def add_regional(self, project: str, region: str, collection: str, resource: dict[str, Any]) -> None:
+        """Add a regional resource, replacing any existing resource with the same name."""
+        with self._lock:
+            items = self._regional.setdefault((project, region, collection), [])
+            items[:] = [item for item in items if item["name"] != resource["name"]]
+            items.append(resource)
+
+    def clear(self) -> None:
+        """Remove every resource."""
+        with self._lock:
+            self._global.clear()
+            self._regional.clear()
+
+    def list_global(self, project: str, collection: str) -> list[dict[str, Any]]:
+        """Return the global resources in the collection."""
+        with self._lock:
+            items = list(self._global.get((project, collection), []))
+        if collection == "networks":
+            return [self._with_subnetworks(project, network) for network in items]
+        return items
+
+    def list_regional(self, project: str, region: str, collection: str) -> list[dict[str, Any]]:
+        """Return the regional resources in the collection."""
+        with self._lock:
+            return list(self._regional.get((project, region, collection), []))
+
+    def aggregated(self, project: str, collection: str) -> dict[str, list[dict[str, Any]]]:
+        """Return the regional resources in the collection for every region, keyed by region."""
+        with self._lock:
+            return {
+                region: list(items)
+                for (item_project, region, item_collection), items in self._regional.items()
+                if item_project == project and item_collection == collection
+            }
+
+    def _with_subnetworks(self, project: str, network: dict[str, Any]) -> dict[str, Any]:
+        """Return the network with the self-links of its subnetworks, which are maintained by the API."""
+        subnetworks = [
+            subnetwork["selfLink"]
+            for items in self.aggregated(project, "subnetworks").values()
+            for subnetwork in items
+            if subnetwork.get("network") == network["selfLink"]
+        ]
+        return network | ({"subnetworks": subnetworks} if subnetworks else {})
+
+    def seed(self, document: dict[str, Any]) -> None:
+        """Add the supported resources from the JSON representation of tofu/terraform state or a saved plan.
+
+        Attributes that are unknown in a plan, such as self-links, are synthesized from the resource names, and the
+        defaults applied by the API are used for attributes that are not set.
+        """
+        resources = [
+            resource for resource in module_resources(document) if resource.get("mode", "managed") == "managed"
+        ]
+        networks = [
+            resource["values"]["name"] for resource in resources if resource["type"] == "google_compute_network"
+        ]
+        # In a plan, references to the network are unknown; they can only refer to the single network of the module.
+        fallback_network = networks[0] if len(networks) == 1 else None
+        nats = _nats_by_router(resources)
+        for resource in resources:
+            values = resource.get("values", {})
+            match resource["type"]:
+                case "google_compute_network":
+                    self.add_global(values["project"], "networks", _network(values))
+                    if not values.get("delete_default_routes_on_create"):
+                        self.add_global(values["project"], "routes", _default_route(values))
+                case "google_compute_subnetwork":
+                    network = _name(values.get("network")) or fallback_network
+                    assert network
+                    self.add_regional(
+                        values["project"],
+                        values["region"],
+                        "subnetworks",
+                        _subnetwork(values, network),
+                    )
+                case "google_compute_route":
+                    network = _name(values.get("network")) or fallback_network
+                    assert network
+                    self.add_global(values["project"], "routes", _route(values, network))
+                case "google_compute_router":
+                    network = _name(values.get("network")) or fallback_network
+                    assert network
+                    self.add_regional(
+                        values["project"],
+                        values["region"],
+                        "routers",
+                        _router(values, network, nats.get((values["project"], values["region"], values["name"]), [])),
+                    )
+                case "google_compute_global_address":
+                    network = _name(values.get("network")) or fallback_network
+                    self.add_global(values["project"], "addresses", _global_address(values, network))
+                case "google_compute_global_forwarding_rule":
+                    network = _name(values.get("network")) or fallback_network
+                    self.add_global(values["project"], "forwardingRules", _global_forwarding_rule(values, network))
+
+
+def _nats_by_router(resources: Iterable[Mapping[str, Any]]) -> dict[tuple[str, str, str], list[dict[str, Any]]]:
+    """Return the router NATs in the resources keyed by project, region, and router name."""
+    nats: dict[tuple[str, str, str], list[dict[str, Any]]] = {}
+    for resource in resources:
+        if resource["type"] == "google_compute_router_nat":
+            values = resource.get("values", {})
+            nats.setdefault((values["project"], values["region"], _name(values["router"]) or ""), []).append(
+                _nat(values),
+            )
+    return nats
+
+
+def _network(values: Mapping[str, Any]) -> dict[str, Any]:
+    project, name = values["project"], values["name"]
+    return _without_nulls(
+        {
+            "kind": GLOBAL_COLLECTIONS["networks"],
+            "id": _numeric_id(project, "networks", name),
+            "name": name,
+            "description": values.get("description") or None,
+            "selfLink": _global_link(project, "networks", name),
+            "autoCreateSubnetworks": values.get("auto_create_subnetworks", False),
+            "mtu": values.get("mtu") or 1460,
+            "routingConfig": {
+                "routingMode": values.get("routing_mode") or "REGIONAL",
+            },
+            "enableUlaInternalIpv6": values.get("enable_ula_internal_ipv6") or None,
+            "internalIpv6Range": values.get("internal_ipv6_range") or None,
+        },
+    )
+
+
+def _default_route(network: Mapping[str, Any]) -> dict[str, Any]:
+    """Return the default route to the internet gateway created with a network, unless it was deleted."""
+    project, name = network["project"], network["name"]
+    route_name = f"default-route-{hashlib.sha256(f'{project}/{name}'.encode()).hexdigest()[:16]}"
+    return {
+        "kind": GLOBAL_COLLECTIONS["routes"],
+        "id": _numeric_id(project, "routes", route_name),
+        "name": route_name,
+        "description": "Default route to the Internet.",
+        "selfLink": _global_link(project, "routes", route_name),
+        "network": _global_link(project, "networks", name),
+        "destRange": "0.0.0.0/0",
+        "priority": DEFAULT_ROUTE_PRIORITY,
+        "nextHopGateway": _global_link(project, "gateways", DEFAULT_INTERNET_GATEWAY),
+    }
+
+
+def _subnetwork(values: Mapping[str, Any], network_name: str) -> dict[str, Any]:
+    project, region, name = values["project"], values["region"], values["name"]
+    log_config = (values.get("log_config") or [None])[0]
+    primary = ipaddress.IPv4Network(values["ip_cidr_range"], strict=False)
+    return _without_nulls(
+        {
+            "kind": REGIONAL_COLLECTIONS["subnetworks"],
+            "id": _numeric_id(project, region, "subnetworks", name),
+            "name": name,
+            "description": values.get("description") or None,
+            "selfLink": _regional_link(project, region, "subnetworks", name),
+            "network": _global_link(project, "networks", network_name),
+            "region": _region_link(project, region),
+            "ipCidrRange": values["ip_cidr_range"],
+            "gatewayAddress": values.get("gateway_address") or str(primary.network_address + 1),
+            "secondaryIpRanges": [
+                {
+                    "rangeName": secondary["range_name"],
+                    "ipCidrRange": secondary["ip_cidr_range"],
+                }
+                for secondary in values.get("secondary_ip_range") or []
+            ]
+            or None,
+            "privateIpGoogleAccess": values.get("private_ip_google_access") or None,
+            "privateIpv6GoogleAccess": values.get("private_ipv6_google_access") or "DISABLE_GOOGLE_ACCESS",
+            "stackType": values.get("stack_type") or "IPV4_ONLY",
+            "ipv6AccessType": values.get("ipv6_access_type") or None,
+            "ipv6CidrRange": values.get("ipv6_cidr_range") or None,
+            "internalIpv6Prefix": values.get("internal_ipv6_prefix") or None,
+            "externalIpv6Prefix": values.get("external_ipv6_prefix") or None,
+            "purpose": values.get("purpose") or "PRIVATE",
+            "role": values.get("role") or None,
+            "enableFlowLogs": True if log_config else None,
+            "logConfig": {"enable": True} | {_camel(k): v for k, v in log_config.items() if v is not None}
+            if log_config
+            else {"enable": False},
+        },
+    )
+
+
+def _route(values: Mapping[str, Any], network: str) -> dict[str, Any]:
+    project, name = values["project"], values["name"]
+    next_hop_gateway = values.get("next_hop_gateway")
+    return _without_nulls(
+        {
+            "kind": GLOBAL_COLLECTIONS["routes"],
+            "id": _numeric_id(project, "routes", name),
+            "name": name,
+            "description": values.get("description") or None,
+            "selfLink": _global_link(project, "routes", name),
+            "network": _global_link(project, "networks", network),
+            "destRange": values["dest_range"],
+            "priority": int(values.get("priority") or DEFAULT_ROUTE_PRIORITY),
+            "nextHopGateway": _global_link(project, "gateways", _name(next_hop_gateway) or "")
+            if next_hop_gateway
+            else None,
+            "tags": values.get("tags") or None,
+        },
+    )
+
+
+def _nat(values: Mapping[str, Any]) -> dict[str, Any]:
+    """Return the router NAT in the REST representation, which is a nested attribute of the router."""
+    nat = {
+        _camel(k): v
+        for k, v in values.items()
+        if k not in {"id", "project", "region", "router", "log_config", "subnetwork", "timeouts"}
+        and v not in (None, [])
+    }
+    log_config = (values.get("log_config") or [None])[0]
+    if log_config:
+        nat["logConfig"] = {_camel(k): v for k, v in log_config.items() if v is not None}
+    subnetworks = [
+        {_camel(k): _name(v) if k == "name" else v for k, v in subnetwork.items() if v not in (None, [])}
+        for subnetwork in values.get("subnetwork") or []
+    ]
+    if subnetworks:
+        nat["subnetworks"] = subnetworks
+    return nat
+
+
+def _router(values: Mapping[str, Any], network: str, nats: list[dict[str, Any]]) -> dict[str, Any]:
+    project, region, name = values["project"], values["region"], values["name"]
+    return _without_nulls(
+        {
+            "kind": REGIONAL_COLLECTIONS["routers"],
+            "id": _numeric_id(project, region, "routers", name),
+            "name": name,
+            "description": values.get("description") or None,
+            "selfLink": _regional_link(project, region, "routers", name),
+            "network": _global_link(project, "networks", network),
+            "region": _region_link(project, region),
+            "nats": nats or None,
+        },
+    )
+
+
+def _global_address(values: Mapping[str, Any], network: str | None) -> dict[str, Any]:
+    project, name = values["project"], values["name"]
+    return _without_nulls(
+        {
+            "kind": GLOBAL_COLLECTIONS["addresses"],
+            "id": _numeric_id(project, "addresses", name),
+            "name": name,
+            "description": values.get("description") or None,
+            "selfLink": _global_link(project, "addresses", name),
+            "network": _global_link(project, "networks", network) if network else None,
+            "address": values.get("address"),
+            "addressType": values.get("address_type") or "EXTERNAL",
+            "purpose": values.get("purpose") or None,
+            "labels": values.get("effective_labels") or values.get("labels") or None,
+            "status": "RESERVED",
+        },
+    )
+
+
+def _global_forwarding_rule(values: Mapping[str, Any], network: str | None) -> dict[str, Any]:
+    project, name = values["project"], values["name"]
+    return _without_nulls(
+        {
+            "kind": GLOBAL_COLLECTIONS["forwardingRules"],
+            "id": _numeric_id(project, "forwardingRules", name),
+            "name": name,
+            "description": values.get("description") or None,
+            "selfLink": _global_link(project, "forwardingRules", name),
+            "network": _global_link(project, "networks", network) if network else None,
+            "IPAddress": values.get("ip_address"),
+            "IPProtocol": values.get("ip_protocol") or "TCP",
+            "target": values.get("target"),
+            "loadBalancingScheme": values.get("load_balancing_scheme") or None,
+            "labels": values.get("effective_labels") or values.get("labels") or None,
+            "serviceDirectoryRegistrations": [
+                {_camel(k): v for k, v in registration.items() if v}
+                for registration in values.get("service_directory_registrations") or []
+            ]
+            or None,
+        },
+    )
+
+
+def _numeric_id(*parts: str) -> str:
+    """Return a stable numeric identifier for the resource, in place of the id assigned by the API."""
+    return str(int(hashlib.sha256("/".join(parts).encode("utf-8")).hexdigest()[:15], 16))
+
+
+def _field(resource: Mapping[str, Any], path: str) -> Any:  # noqa: ANN401
+    """Return the value of a possibly nested field, given in either snake_case or lowerCamelCase."""
+    value: Any = resource
+    for part in path.split("."):
+        if not isinstance(value, Mapping):
+            return None
+        value = value.get(part, value.get(_camel(part)))
+    return value
+
+
+def matches_filter(resource: Mapping[str, Any], expression: str | None) -> bool:
+    """Return True if the resource matches the filter expression, which is an RE2 regular expression match of a field.
+
+    Raises ValueError if the expression is not supported by the fake.
+    """
+    if not expression:
+        return True
+    match = FILTER_PATTERN.match(expression)
+    if not match:
+        msg = f"unsupported filter expression: {expression}"
+        raise ValueError(msg)
+    value = _field(resource, match.group("field"))
+    pattern = match.group("value").strip("'\"")
+    matched = value is not None and re.fullmatch(pattern, str(value)) is not None
+    return matched if match.group("op") == "eq" else not matched
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    """Serve the Compute REST API from the FakeCompute store of the server."""
+
+    server: "FakeComputeServer"
+
+    def do_GET(self) -> None:
+        url = urllib.parse.urlsplit(self.path)
+        query = urllib.parse.parse_qs(url.query)
+        expression = query.get("filter", [None])[0]
+        match = PATH_PATTERN.match(url.path)
+        if not match:
+            self._error(404, f"The resource '{url.path}' was not found")
+            return
+        self.server.requests.append(url.path)
+        store = self.server.store
+        project = match.group("project")
+        name = match.group("name")
+        try:
+            if collection := match.group("global"):
+                self._collection(
+                    store.list_global(project, collection),
+                    f"projects/{project}/global/{collection}",
+                    name,
+                    expression,
+                )
+            elif collection := match.group("regional"):
+                self._collection(
+                    store.list_regional(project, match.group("region"), collection),
+                    f"projects/{project}/regions/{match.group('region')}/{collection}",
+                    name,
+                    expression,
+                )
+            elif (collection := match.group("aggregated")) and not name:
+                self._json(
+                    {
+                        "kind": f"{REGIONAL_COLLECTIONS.get(collection, 'compute#unknown')}AggregatedList",
+                        "items": {
+                            f"regions/{region}": {collection: matched}
+                            if (matched := [item for item in items if matches_filter(item, expression)])
+                            else {"warning": {"code": "NO_RESULTS_ON_PAGE", "message": "There are no results."}}
+                            for region, items in store.aggregated(project, collection).items()
+                        },
+                    },
+                )
+            else:
+                self._error(404, f"The resource '{url.path}' was not found")
+        except ValueError as e:
+            self._error(400, str(e))
+
+    def _collection(
+        self,
+        items: Iterable[dict[str, Any]],
+        resource_path: str,
+        name: str | None,
+        expression: str | None,
+    ) -> None:
+        if name:
+            item = next((item for item in items if item["name"] == name), None)
+            if item is None:
+                self._error(404, f"The resource '{resource_path}/{name}' was not found")
+                return
+            self._json(item)
+            return
+        self._json({"items": [item for item in items if matches_filter(item, expression)]})
+
+    def _json(self, payload: dict[str, Any], status: int = 200) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status: int, message: str) -> None:
+        reason = "notFound" if status == 404 else "invalid"  # noqa: PLR2004
+        self._json(
+            {
+                "error": {
+                    "code": status,
+                    "message": message,
+                    "errors": [{"message": message, "domain": "global", "reason": reason}],
+                },
+            },
+            status=status,
+        )
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002, ANN401
+        """Suppress the default logging of every request to stderr."""
+
+
+class FakeComputeServer(http.server.ThreadingHTTPServer):
+    """A localhost HTTP server that serves the Compute REST API from a FakeCompute store."""
+
+    daemon_threads = True
+
+    def __init__(self, store: FakeCompute | None = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        """Bind the server to host and port; the default port of 0 binds to an available port."""
+        super().__init__((host, port), _Handler)
+        self.store = store or FakeCompute()
+        self.requests: list[str] = []
+
+    @property
+    def endpoint(self) -> str:
+        """Return the endpoint to pass as api_endpoint in the client_options of compute_v1 clients."""
+        host, port = self.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+
+@contextmanager
+def serve_fake_compute(store: FakeCompute | None = None) -> Generator[FakeComputeServer, None, None]:
+    """Serve the store from a background thread until exit."""
+    server = FakeComputeServer(store)
+    thread = threading.Thread(target=server.serve_forever, name="fake-compute", daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""A scriptable stand-in for the tofu/terraform executable, to benchmark and test the harness without cloud access.
+
+Set TEST_TF_COMMAND to the path of this file and TEST_FAKE_TOFU_CONFIG to a JSON file of the form:
+
+    {
+        "latency": 0.0,
+        "exit_code": 0,
+        "phases": {"plan-detailed-exitcode": {"exit_code": 2, "stderr": "changes detected", "latency": 0.5}},
+        "fixtures": {"<fixture dir name>": {"phases": {"apply": {"exit_code": 1}}}},
+        "outputs": {"self_link": "https://..."},
+        "plan": {"planned_values": {}},
+        "log": "/path/to/invocations.jsonl"
+    }
+
+Every invocation is matched to a phase named as the engine times it, e.g. init, plan, plan-detailed-exitcode,
+warm-refresh, workspace-select, or workspace-default. The phase settings of the fixture take precedence over the global
+phase settings, which take precedence over the top-level latency and exit_code. A phase can set stdout and stderr text;
+if stdout is not set `output -json` prints the outputs and `show -json` prints the plan. When log is set, each
+invocation is appended to it as a JSON line with the fixture, phase, arguments, and start and end times.
+"""
+
+import json
+import os
+import pathlib
+import sys
+import time
+from collections.abc import Sequence
+from typing import Any
+
+CONFIG_ENV = "TEST_FAKE_TOFU_CONFIG"
+
+
+def phase_name(args: Sequence[str]) -> str:
+    """Return the name of the phase for tofu/terraform arguments, excluding any -chdir option."""
+    command = args[0] if args else "version"
+    if command == "plan" and "-refresh-only" in args:
+        return "warm-refresh"
+    if command == "plan" and "-detailed-exitcode" in args:
+        return "plan-detailed-exitcode"
+    if command == "workspace" and args[1:3] == ["select", "default"]:
+        return "workspace-default"
+    if command == "workspace":
+        return f"workspace-{args[1]}" if len(args) > 1 else command
+    return command
+
+
+def load_config() -> dict[str, Any]:
+    """Return the configuration from the JSON file named by environment variable TEST_FAKE_TOFU_CONFIG."""
+    path = os.getenv(CONFIG_ENV)
+    if path:
+        path = path.strip()
+    if not path:
+        return {}
+    return json.loads(pathlib.Path(path).read_text(encoding="utf-8"))
+
+
+def phase_settings(config: dict[str, Any], fixture: str, phase: str) -> dict[str, Any]:
+    """Return the effective latency, exit_code, and optional stdout and stderr of the phase for the fixture."""
+    return (
+        {"latency": config.get("latency", 0.0), "exit_code": config.get("exit_code", 0)}
+        | config.get("phases", {}).get(phase, {})
+        | config.get("fixtures", {}).get(fixture, {}).get("phases", {}).get(phase, {})
+    )
+
+
+def default_stdout(config: dict[str, Any], phase: str, args: Sequence[str]) -> str:
+    """Return the stdout of a phase without explicit stdout; JSON for output and show, otherwise a summary line."""
+    if phase == "output" and "-json" in args:
+        return json.dumps(
+            {
+                key: {"sensitive": False, "type": "dynamic", "value": value}
+                for key, value in config.get("outputs", {}).items()
+            },
+        )
+    if phase == "show" and "-json" in args:
+        return json.dumps(config.get("plan", {}))
+    return f"fake {phase} complete"
+
+
+def main(argv: Sequence[str]) -> int:
+    """Emulate tofu/terraform for argv, returning the configured exit code."""
+    args = list(argv)
+    chdir = next((arg.removeprefix("-chdir=") for arg in args if arg.startswith("-chdir=")), pathlib.Path.cwd())
+    args = [arg for arg in args if not arg.startswith("-chdir=")]
+    fixture = pathlib.Path(chdir).name
+    phase = phase_name(args)
+    config = load_config()
+    settings = phase_settings(config, fixture, phase)
+    start = time.time()
+    time.sleep(float(settings["latency"]))
+    sys.stdout.write(settings.get("stdout", default_stdout(config, phase, args)) + "\n")
+    if settings.get("stderr"):
+        sys.stderr.write(settings["stderr"] + "\n")
+    if config.get("log"):
+        with pathlib.Path(config["log"]).open("a", encoding="utf-8") as log:
+            log.write(
+                json.dumps(
+                    {"fixture": fixture, "phase": phase, "args": args, "start": start, "end": time.time()},
+                )
+                + "\n",
+            )
+    return int(settings["exit_code"])
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
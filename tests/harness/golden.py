@@ -0,0 +1,110 @@
+"""Pre-initialized golden working directory that every fixture is cloned from."""
+
+import hashlib
+import os
+import pathlib
+import shutil
+import subprocess
+from collections.abc import Callable, Collection
+from typing import Any
+
+from .locking import exclusive_lock
+
+DEPENDENCY_LOCK_FILE = ".terraform.lock.hcl"
+GOLDEN_MARKER = ".initialized"
+TF_DATA_DIR = ".terraform"
+# Files in the data directory that init may rewrite in place; these are always copied so a fixture cannot modify the
+# golden directory through a shared hardlink.
+TF_DATA_DIR_MUTABLE_FILES = frozenset(
+    {
+        pathlib.PurePath(TF_DATA_DIR, "environment"),
+        pathlib.PurePath(TF_DATA_DIR, "terraform.tfstate"),
+        pathlib.PurePath(TF_DATA_DIR, "modules", "modules.json"),
+    },
+)
+
+
+def module_digest(module_dir: pathlib.Path, exclude: Collection[str] = ()) -> str:
+    """Return a digest of the tofu/terraform sources in module_dir, used to detect changes to module requirements.
+
+    The dependency lock file is included if present, so that changing the locked provider versions is also detected.
+    Sources named in exclude are left out of the digest.
+    """
+    digest = hashlib.sha256()
+    sources = sorted(source for source in module_dir.glob("*.tf") if source.name not in exclude)
+    if module_dir.joinpath(DEPENDENCY_LOCK_FILE).exists():
+        sources.append(module_dir.joinpath(DEPENDENCY_LOCK_FILE))
+    for source in sources:
+        digest.update(source.name.encode("utf-8"))
+        digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+def prepare_golden_dir(
+    cache_dir: pathlib.Path,
+    module_dir: pathlib.Path,
+    tf_command: str,
+    ignore: Callable[[Any, list[str]], set[str]],
+) -> pathlib.Path:
+    """Return a copy of module_dir that has been initialized without a backend, seeding the plugin cache as needed.
+
+    The golden directory holds the installed providers, child modules, and dependency lock file. It is created at most
+    once per module digest and is guarded by a file lock, so concurrent pytest-xdist workers wait for the first worker
+    to finish instead of racing on partially written provider binaries.
+    """
+    golden_dir = cache_dir.with_name(f"{cache_dir.name}.golden").joinpath(module_digest(module_dir))
+    with exclusive_lock(golden_dir.with_suffix(".lock")):
+        if not golden_dir.joinpath(GOLDEN_MARKER).exists():
+            shutil.copytree(
+                src=module_dir,
+                dst=golden_dir,
+                dirs_exist_ok=True,
+                ignore=ignore,
+            )
+            subprocess.run(
+                [
+                    tf_command,
+                    f"-chdir={golden_dir!s}",
+                    "init",
+                    "-no-color",
+                    "-input=false",
+                    "-backend=false",
+                ],
+                check=True,
+                capture_output=True,
+                env=os.environ | {"TF_PLUGIN_CACHE_DIR": str(cache_dir)},
+            )
+            golden_dir.joinpath(GOLDEN_MARKER).touch()
+    return golden_dir
+
+
+def _link_or_copy(src: str, dst: str) -> str:
+    """Hardlink src to dst, falling back to a regular copy if src and dst are on different filesystems."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        return shutil.copy2(src, dst)
+    return dst
+
+
+def clone_golden_dir(golden_dir: pathlib.Path, fixture_dir: pathlib.Path) -> None:
+    """Clone the golden directory into fixture_dir.
+
+    Sources and the dependency lock file are copied since they are small and may be rewritten by a fixture. Providers
+    and child modules in the data directory are hardlinked where possible so that cloning does not depend on their size;
+    symlinks into the plugin cache are resolved so the clone does not rely on relative link targets.
+    """
+
+    def _copy(src: str, dst: str) -> str:
+        relative = pathlib.PurePath(src).relative_to(golden_dir)
+        if relative.parts[0] != TF_DATA_DIR or relative in TF_DATA_DIR_MUTABLE_FILES:
+            return shutil.copy2(src, dst)
+        return _link_or_copy(src, dst)
+
+    shutil.copytree(
+        src=golden_dir,
+        dst=fixture_dir,
+        dirs_exist_ok=True,
+        copy_function=_copy,
+        ignore=shutil.ignore_patterns(GOLDEN_MARKER),
+    )
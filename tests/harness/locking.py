@@ -0,0 +1,67 @@
+"""Cross-process file locks shared by pytest-xdist workers."""
+
+import asyncio
+import fcntl
+import pathlib
+from collections.abc import AsyncGenerator, Generator
+from contextlib import asynccontextmanager, contextmanager
+from typing import IO
+
+DEFAULT_POLL_INTERVAL = 0.5
+
+
+@contextmanager
+def exclusive_lock(path: pathlib.Path) -> Generator[None, None, None]:
+    """Hold an exclusive advisory lock on path, blocking until it can be acquired.
+
+    NOTE: The lock file is created if necessary and is never removed.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _try_slot(directory: pathlib.Path, stem: str, limit: int) -> tuple[int, IO[str]] | None:
+    """Return the first slot whose lock file could be locked without blocking, and the open lock file."""
+    directory.mkdir(parents=True, exist_ok=True)
+    for slot in range(limit):
+        lock_file = directory.joinpath(f"{stem}.{slot}.lock").open("a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            continue
+        return slot, lock_file
+    return None
+
+
+@asynccontextmanager
+async def semaphore_slot(
+    directory: pathlib.Path,
+    name: str,
+    limit: int,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+) -> AsyncGenerator[int, None]:
+    """Hold one of limit exclusive slots of the named semaphore, yielding the slot number.
+
+    Each slot is an advisory lock on a file in directory, so the semaphore is shared by every process and thread that
+    uses the same directory and name. Free slots are polled without blocking the event loop.
+
+    NOTE: The lock files are created if necessary and are never removed.
+    """
+    assert limit > 0
+    assert poll_interval > 0
+    stem = name.replace("/", "--")
+    # Another process can only signal a free slot through the lock file, so polling is required.
+    while (acquired := _try_slot(directory, stem, limit)) is None:  # noqa: ASYNC110
+        await asyncio.sleep(poll_interval)
+    slot, lock_file = acquired
+    try:
+        yield slot
+    finally:
+        fcntl.flock(lock_file, fcntl.LOCK_UN)
+        lock_file.close()
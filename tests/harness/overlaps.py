@@ -0,0 +1,109 @@
+"""Detection of overlapping IPv4 ranges with a sorted interval index.
+
+The per-region primary and secondary ranges computed from tfvars, and optionally the ranges of other existing networks,
+are indexed as integer intervals; a single sweep over the intervals sorted by start address reports every overlapping
+pair in O(n log n + k) for n ranges and k overlaps.
+"""
+
+import heapq
+import ipaddress
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from .subnets import evaluate_subnets
+
+
+@dataclass(frozen=True, order=True)
+class Interval:
+    """An IPv4 range as inclusive integer start and end addresses, with a label that identifies its source."""
+
+    start: int
+    end: int
+    label: str
+
+    @classmethod
+    def from_cidr(cls, cidr: str, label: str) -> "Interval":
+        """Return the interval covered by the IPv4 CIDR."""
+        network = ipaddress.IPv4Network(cidr, strict=False)
+        return cls(int(network.network_address), int(network.broadcast_address), label)
+
+    @property
+    def cidr(self) -> str:
+        """Return the interval as a CIDR."""
+        return next(
+            ipaddress.summarize_address_range(ipaddress.IPv4Address(self.start), ipaddress.IPv4Address(self.end)),
+        ).with_prefixlen
+
+
+class OverlapError(ValueError):
+    """One or more ranges overlap; every overlapping pair is included in the message."""
+
+    def __init__(self, overlaps: list[tuple[Interval, Interval]]) -> None:
+        """Initialize the error with the overlapping pairs."""
+        self.overlaps = overlaps
+        super().__init__(
+            "\n".join(
+                [
+                    f"{len(overlaps)} overlapping IPv4 range(s):",
+                    *[f"  {a.label} ({a.cidr}) overlaps {b.label} ({b.cidr})" for a, b in overlaps],
+                ],
+            ),
+        )
+
+
+def find_overlaps(intervals: Iterable[Interval]) -> list[tuple[Interval, Interval]]:
+    """Return every pair of overlapping intervals, ordered by the start of the later interval.
+
+    Intervals are visited in order of start address while a min-heap keyed on end address holds those that are still
+    open; each interval overlaps exactly the open intervals that remain after those ending before it are evicted.
+    """
+    overlaps: list[tuple[Interval, Interval]] = []
+    active: list[tuple[int, Interval]] = []
+    for interval in sorted(intervals):
+        while active and active[0][0] < interval.start:
+            heapq.heappop(active)
+        overlaps.extend((other, interval) for other in sorted(other for _, other in active))
+        heapq.heappush(active, (interval.end, interval))
+    return overlaps
+
+
+def subnet_intervals(subnets: Mapping[str, Mapping[str, Any]]) -> list[Interval]:
+    """Return the primary and secondary ranges of subnets, as returned by evaluate_subnets, as labelled intervals."""
+    intervals = []
+    for name, subnet in subnets.items():
+        intervals.append(Interval.from_cidr(subnet["primary_ipv4_cidr"], f"{name} primary"))
+        intervals.extend(
+            Interval.from_cidr(cidr, f"{name} {range_name}")
+            for range_name, cidr in subnet["secondary_ipv4_ranges"].items()
+        )
+    return intervals
+
+
+def parse_existing_cidrs(value: str | None) -> list[Interval]:
+    """Return the intervals described by a comma-separated list of CIDRs, each optionally prefixed with `label=`."""
+    intervals = []
+    for entry in (value or "").split(","):
+        entry = entry.strip()  # noqa: PLW2901
+        if not entry:
+            continue
+        label, _, cidr = entry.rpartition("=")
+        intervals.append(Interval.from_cidr(cidr.strip(), label.strip() or f"existing {cidr.strip()}"))
+    return intervals
+
+
+def check_tfvars(tfvars: Mapping[str, Any], existing: Iterable[Interval] = ()) -> None:
+    """Raise OverlapError if the ranges that the module would create from tfvars overlap each other or existing ranges.
+
+    NOTE: Overlaps between existing ranges are ignored; they are outside the control of the module.
+    """
+    if not tfvars.get("regions"):
+        return
+    existing = set(existing)
+    overlaps = [
+        (a, b)
+        for a, b in find_overlaps([*subnet_intervals(evaluate_subnets(tfvars)), *existing])
+        if not (a in existing and b in existing)
+    ]
+    if overlaps:
+        raise OverlapError(overlaps)
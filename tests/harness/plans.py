@@ -0,0 +1,52 @@
+"""Helpers to inspect the JSON representation of a saved tofu/terraform plan or state."""
+
+import json
+from collections.abc import Generator
+from typing import Any
+
+
+def module_resources(document: dict[str, Any]) -> Generator[dict[str, Any], None, None]:
+    """Yield every resource of the root and child modules in the JSON representation of a plan or state.
+
+    The document may be the output of `show -json` for a saved plan (planned_values) or for the current state (values),
+    or the raw content of a state file, in which case a resource is yielded for each instance with its attributes as
+    values.
+    """
+    if "resources" in document and "values" not in document:
+        for resource in document["resources"]:
+            if resource.get("mode", "managed") != "managed":
+                continue
+            for instance in resource.get("instances", []):
+                index = instance.get("index_key")
+                yield {
+                    "address": ".".join(
+                        [
+                            *([resource["module"]] if "module" in resource else []),
+                            resource["type"],
+                            resource["name"] + ("" if index is None else f"[{json.dumps(index)}]"),
+                        ],
+                    ),
+                    "type": resource["type"],
+                    "name": resource["name"],
+                    "index": index,
+                    "values": instance.get("attributes", {}),
+                }
+        return
+    modules = [(document.get("planned_values") or document.get("values") or {}).get("root_module", {})]
+    while modules:
+        module = modules.pop()
+        yield from module.get("resources", [])
+        modules.extend(module.get("child_modules", []))
+
+
+def planned_resources(plan: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """Return the planned attribute values of every resource in the plan, keyed by resource address.
+
+    NOTE: Attributes that are unknown until apply, such as self_link or id, are absent from the values.
+    """
+    return {resource["address"]: resource.get("values", {}) for resource in module_resources(plan)}
+
+
+def planned_actions(plan: dict[str, Any]) -> dict[str, list[str]]:
+    """Return the planned change actions, e.g. ["create"] or ["delete", "create"], keyed by resource address."""
+    return {change["address"]: change["change"]["actions"] for change in plan.get("resource_changes", [])}
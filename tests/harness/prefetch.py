@@ -0,0 +1,55 @@
+"""Registry of fixture lifecycles that were started ahead of the tests that use them.
+
+When environment variable TEST_TF_PREFETCH is true, the session starts the lifecycle of every collected test module
+that declares its input vars with a module-level `fixture_tfvars` function, so that all fixtures are applied at once,
+bounded by the concurrency of the engine. Each module's output fixture then claims its own lifecycle through
+run_tofu_in_workspace() and waits only for that fixture.
+
+NOTE: Prefetching requires a single pytest process, since pytest-xdist workers are not told their modules in advance.
+"""
+
+import functools
+import json
+import pathlib
+import threading
+from typing import Any
+
+from .engine import PendingLifecycle
+
+PREFETCH_VAR = "TEST_TF_PREFETCH"
+
+
+class Prefetch:
+    """Pending lifecycles keyed by the name of the fixture directory and the input vars."""
+
+    def __init__(self) -> None:
+        """Create an empty registry."""
+        self._lock = threading.Lock()
+        self._pending: dict[tuple[str, str], PendingLifecycle[dict[str, Any]]] = {}
+
+    @staticmethod
+    def _key(fixture: pathlib.Path, tfvars: dict[str, Any]) -> tuple[str, str]:
+        return fixture.name, json.dumps(tfvars, sort_keys=True)
+
+    def add(self, fixture: pathlib.Path, tfvars: dict[str, Any], pending: PendingLifecycle[dict[str, Any]]) -> None:
+        """Register the pending lifecycle of the fixture, started with the input vars."""
+        with self._lock:
+            self._pending[self._key(fixture, tfvars)] = pending
+
+    def claim(self, fixture: pathlib.Path, tfvars: dict[str, Any]) -> PendingLifecycle[dict[str, Any]] | None:
+        """Remove and return the pending lifecycle of the fixture with the same input vars, if one was started."""
+        with self._lock:
+            return self._pending.pop(self._key(fixture, tfvars), None)
+
+    def close(self) -> None:
+        """Exit every pending lifecycle that was not claimed, destroying its fixture as if its tests had passed."""
+        with self._lock:
+            pending, self._pending = list(self._pending.values()), {}
+        for lifecycle in pending:
+            lifecycle.close()
+
+
+@functools.cache
+def default_prefetch() -> Prefetch:
+    """Return the registry shared by all fixtures in this process."""
+    return Prefetch()
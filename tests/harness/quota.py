@@ -0,0 +1,101 @@
+"""Cross-worker limits on the number of applies and destroys that touch a region or resource class at once.
+
+Creating many Cloud Routers, NATs, or PSC resources concurrently is throttled by Compute Engine API rate limits, and a
+throttled tofu/terraform process spends its time in retries. A QuotaLimiter holds a slot of a file-lock semaphore for
+every resource key of a fixture while it is applied or destroyed, so all pytest-xdist workers using the same directory
+stay within the configured limits.
+"""
+
+import os
+import pathlib
+import tempfile
+from collections.abc import AsyncGenerator, Iterable, Mapping
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any
+
+from .locking import DEFAULT_POLL_INTERVAL, semaphore_slot
+
+KEY_SEPARATOR = "/"
+
+
+def resource_keys(tfvars: Mapping[str, Any]) -> list[str]:
+    """Return the sorted resource keys of the fixture, e.g. network, subnetwork/us-west1, nat/us-west1, and psc.
+
+    A key is `<resource class>/<region>` for regional resources, or the resource class for global resources.
+    """
+    regions = tfvars.get("regions") or []
+    keys = {"network", *[f"subnetwork{KEY_SEPARATOR}{region}" for region in regions]}
+    if tfvars.get("nat") is not None:
+        keys.update(f"nat{KEY_SEPARATOR}{region}" for region in regions)
+    if (tfvars.get("psc") or {}).get("address"):
+        keys.add("psc")
+    return sorted(keys)
+
+
+def parse_limits(value: str | None) -> dict[str, int]:
+    """Return the limits described by a comma-separated list of `key=limit` entries, e.g. 'nat=2,subnetwork/us-west1=4'.
+
+    A key is either a resource class, which limits every region, or a resource class and region.
+    """
+    limits = {}
+    for entry in (value or "").split(","):
+        entry = entry.strip()  # noqa: PLW2901
+        if not entry:
+            continue
+        key, _, limit = entry.partition("=")
+        assert limit.strip().isdigit(), f"invalid quota limit: {entry!r}"
+        limits[key.strip()] = int(limit)
+        assert limits[key.strip()] > 0, f"quota limit must be positive: {entry!r}"
+    return limits
+
+
+class QuotaLimiter:
+    """Bound the number of concurrent holders of each resource key, across every process sharing directory."""
+
+    def __init__(
+        self,
+        directory: pathlib.Path,
+        limits: Mapping[str, int],
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> None:
+        """Initialize the limiter; keys without a limit for the key or its resource class are not limited."""
+        self.directory = directory
+        self.limits = dict(limits)
+        self._poll_interval = poll_interval
+
+    def limit(self, key: str) -> int | None:
+        """Return the limit of the key, falling back to the limit of its resource class."""
+        return self.limits.get(key, self.limits.get(key.partition(KEY_SEPARATOR)[0]))
+
+    @asynccontextmanager
+    async def acquire(self, keys: Iterable[str]) -> AsyncGenerator[None, None]:
+        """Hold a slot for each of the limited keys.
+
+        Slots are acquired in sorted key order so that concurrent holders of overlapping keys cannot deadlock.
+        """
+        async with AsyncExitStack() as stack:
+            for key in sorted(set(keys)):
+                if (limit := self.limit(key)) is None:
+                    continue
+                await stack.enter_async_context(semaphore_slot(self.directory, key, limit, self._poll_interval))
+            yield
+
+
+def default_quota_limiter() -> QuotaLimiter | None:
+    """Return a limiter from environment variable TEST_TF_QUOTA_LIMITS, or None if no limits are set.
+
+    The lock files are kept in the directory named by TEST_TF_QUOTA_DIR, with fallback to a directory in the system
+    temporary directory, so every pytest session of the user shares the limits.
+    """
+    limits = parse_limits(os.getenv("TEST_TF_QUOTA_LIMITS"))
+    if not limits:
+        return None
+    directory = os.getenv("TEST_TF_QUOTA_DIR")
+    if directory:
+        directory = directory.strip()
+    return QuotaLimiter(
+        directory=pathlib.Path(directory)
+        if directory
+        else pathlib.Path(tempfile.gettempdir()).joinpath(f"tofu-quota-{os.getuid()}"),
+        limits=limits,
+    )
@@ -0,0 +1,104 @@
+"""Longest-processing-time-first ordering of test modules from their historical durations.
+
+With `--dist=loadfile` pytest-xdist hands each module to a worker as a unit, in collection order, so a slow fixture that
+is collected last determines when the session finishes. Ordering modules by decreasing duration (LPT) starts the slow
+fixtures first and lets the fast modules fill in the gaps.
+"""
+
+import json
+import pathlib
+from collections import defaultdict
+from collections.abc import Mapping, Sequence
+from typing import Protocol
+
+import pytest
+
+# Weight of the latest observation in the smoothed duration of a module; the remainder is given to its history.
+DEFAULT_SMOOTHING = 0.5
+
+
+class _Item(Protocol):
+    nodeid: str
+
+
+def module_id(nodeid: str) -> str:
+    """Return the module part of a pytest node id, e.g. 'tests/test_nat.py'."""
+    return nodeid.split("::", 1)[0]
+
+
+def estimate(durations: Mapping[str, float], module: str) -> float:
+    """Return the expected duration of module, defaulting to the longest known duration for modules without history.
+
+    NOTE: Unknown modules are assumed to be slow so that a new fixture is not left to run at the end of the session.
+    """
+    if module in durations:
+        return durations[module]
+    return max(durations.values(), default=0.0)
+
+
+def lpt_order[T: _Item](items: Sequence[T], durations: Mapping[str, float]) -> list[T]:
+    """Return items with modules ordered by decreasing expected duration.
+
+    The items of each module are kept together and in their original order, and modules with equal expected duration
+    keep their collection order.
+    """
+    modules: dict[str, list[T]] = {}
+    for item in items:
+        modules.setdefault(module_id(item.nodeid), []).append(item)
+    ordered = sorted(modules, key=lambda module: estimate(durations, module), reverse=True)
+    return [item for module in ordered for item in modules[module]]
+
+
+def smooth(
+    history: Mapping[str, float],
+    observed: Mapping[str, float],
+    smoothing: float = DEFAULT_SMOOTHING,
+) -> dict[str, float]:
+    """Return history updated with the observed module durations as an exponentially weighted moving average."""
+    assert 0 < smoothing <= 1
+    return dict(history) | {
+        module: duration if module not in history else smoothing * duration + (1 - smoothing) * history[module]
+        for module, duration in observed.items()
+    }
+
+
+class DurationScheduler:
+    """Pytest plugin that orders modules longest-first and records their durations for the next session.
+
+    The duration of a module is the sum of the setup, call, and teardown durations of its tests, which includes the
+    tofu/terraform lifecycle executed by its module-scoped fixtures. Durations are only recorded by the controller, as
+    pytest-xdist forwards the reports of every worker to it.
+    """
+
+    def __init__(self, config: pytest.Config, history_path: pathlib.Path | None) -> None:
+        """Initialize the plugin for the session; history is read from and written to history_path if not None."""
+        self._config = config
+        self._history_path = history_path
+        self.history: dict[str, float] = {}
+        if history_path is not None and history_path.exists():
+            self.history = {
+                module: float(duration)
+                for module, duration in json.loads(history_path.read_text(encoding="utf-8")).items()
+            }
+        self._observed: dict[str, float] = defaultdict(float)
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, items: list[pytest.Item]) -> None:
+        """Reorder the collected items longest module first, if there is any history."""
+        if self.history:
+            items[:] = lpt_order(items, self.history)
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        """Add the duration of the test phase to the observed duration of its module."""
+        self._observed[module_id(report.nodeid)] += report.duration
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:  # noqa: ARG002
+        """Merge the observed durations into the history, unless this is a pytest-xdist worker."""
+        if getattr(self._config, "workeroutput", None) is not None or self._history_path is None:
+            return
+        if not self._observed:
+            return
+        self.history = smooth(self.history, self._observed)
+        self._history_path.parent.mkdir(parents=True, exist_ok=True)
+        self._history_path.write_text(json.dumps(self.history, indent=2, sort_keys=True), encoding="utf-8")
@@ -0,0 +1,155 @@
+"""A point-in-time snapshot of the Compute Engine resources created for a fixture.
+
+Verification tests assert against a snapshot instead of calling the compute_v1 clients directly, so that every resource
+of a fixture is fetched exactly once, with the independent requests issued concurrently.
+"""
+
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+from google.cloud import compute_v1
+
+DEFAULT_MAX_WORKERS = 8
+REGION_SCOPE_PREFIX = "regions/"
+
+
+@dataclass(frozen=True)
+class ComputeClients:
+    """The compute_v1 clients needed to snapshot a fixture."""
+
+    networks: compute_v1.NetworksClient
+    subnetworks: compute_v1.SubnetworksClient
+    routes: compute_v1.RoutesClient
+    routers: compute_v1.RoutersClient
+    global_addresses: compute_v1.GlobalAddressesClient
+    global_forwarding_rules: compute_v1.GlobalForwardingRulesClient
+
+
+@dataclass(frozen=True)
+class ComputeSnapshot:
+    """The network of a fixture and the resources associated with it.
+
+    Subnetworks are keyed by name, and also indexed by region then name; routers are keyed by region. Routes, global
+    addresses, and global forwarding rules are those whose network matches the fixture network.
+    """
+
+    network: compute_v1.Network
+    subnetworks: dict[str, compute_v1.Subnetwork]
+    subnetworks_by_region: dict[str, dict[str, compute_v1.Subnetwork]]
+    routes: list[compute_v1.Route]
+    routers: dict[str, list[compute_v1.Router]]
+    global_addresses: list[compute_v1.Address]
+    global_forwarding_rules: list[compute_v1.ForwardingRule]
+
+
+def network_filter(network: str) -> str:
+    """Return the list filter expression that matches resources attached to the named network."""
+    return f"network eq .*/{network}$"
+
+
+def _list(method: Callable[..., Iterable[Any]], request: Any) -> list[Any]:  # noqa: ANN401
+    """Return every item from a paged list method, following all page tokens."""
+    return list(method(request=request))
+
+
+def _aggregated(
+    method: Callable[..., Iterable[tuple[str, Any]]],
+    request: Any,  # noqa: ANN401
+    field: str,
+) -> dict[str, list[Any]]:
+    """Return the items of an aggregated list method keyed by region, following all page tokens.
+
+    Scopes without any matching items, and scopes other than regions, are omitted from the result.
+    """
+    items: dict[str, list[Any]] = {}
+    for scope, scoped_list in method(request=request):
+        if not scope.startswith(REGION_SCOPE_PREFIX) or not getattr(scoped_list, field):
+            continue
+        items.setdefault(scope.removeprefix(REGION_SCOPE_PREFIX), []).extend(getattr(scoped_list, field))
+    return items
+
+
+def fetch_snapshot(
+    clients: ComputeClients,
+    project_id: str,
+    network: str,
+    regions: Iterable[str],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> ComputeSnapshot:
+    """Fetch the network, and the subnetworks, routes, routers, and PSC resources attached to it, concurrently.
+
+    Subnetworks and routers of all regions are fetched with one aggregated list request each, filtered by network, so
+    the number of requests does not grow with the number of regions. Each of the regions is present in the regional
+    indices even if it has no subnetworks or routers.
+    """
+    regions = list(regions)
+    filter_expression = network_filter(network)
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="compute-snapshot") as executor:
+        network_future = executor.submit(
+            clients.networks.get,
+            request=compute_v1.GetNetworkRequest(
+                network=network,
+                project=project_id,
+            ),
+        )
+        subnetworks_future = executor.submit(
+            _aggregated,
+            clients.subnetworks.aggregated_list,
+            compute_v1.AggregatedListSubnetworksRequest(
+                project=project_id,
+                filter=filter_expression,
+            ),
+            "subnetworks",
+        )
+        routers_future = executor.submit(
+            _aggregated,
+            clients.routers.aggregated_list,
+            compute_v1.AggregatedListRoutersRequest(
+                project=project_id,
+                filter=filter_expression,
+            ),
+            "routers",
+        )
+        routes_future = executor.submit(
+            _list,
+            clients.routes.list,
+            compute_v1.ListRoutesRequest(
+                project=project_id,
+                filter=filter_expression,
+            ),
+        )
+        global_addresses_future = executor.submit(
+            _list,
+            clients.global_addresses.list,
+            compute_v1.ListGlobalAddressesRequest(
+                project=project_id,
+                filter=filter_expression,
+            ),
+        )
+        global_forwarding_rules_future = executor.submit(
+            _list,
+            clients.global_forwarding_rules.list,
+            compute_v1.ListGlobalForwardingRulesRequest(
+                project=project_id,
+                filter=filter_expression,
+            ),
+        )
+        subnetworks_by_region = {region: {} for region in regions} | {
+            region: {subnetwork.name: subnetwork for subnetwork in subnetworks}
+            for region, subnetworks in subnetworks_future.result().items()
+        }
+        return ComputeSnapshot(
+            network=network_future.result(),
+            subnetworks={
+                name: subnetwork
+                for subnetworks in subnetworks_by_region.values()
+                for name, subnetwork in subnetworks.items()
+            },
+            subnetworks_by_region=subnetworks_by_region,
+            routes=routes_future.result(),
+            routers={region: [] for region in regions} | routers_future.result(),
+            global_addresses=global_addresses_future.result(),
+            global_forwarding_rules=global_forwarding_rules_future.result(),
+        )
@@ -0,0 +1,189 @@
+"""A localhost stand-in for a remote state service, implementing the tofu/terraform http backend protocol.
+
+State is kept as files in a directory, one per request path, so the states of fixtures survive a restart of the server
+and can be shared by the servers of several pytest-xdist workers. Locks are files created exclusively next to the
+state, so a lock held through one server is honoured by every other server using the same directory.
+
+NOTE: The http backend does not support workspaces; fixtures that select a workspace need the gcs or local backend.
+"""
+
+import http.server
+import json
+import os
+import pathlib
+import threading
+import urllib.parse
+from collections.abc import Generator
+from contextlib import contextmanager
+from typing import Any
+
+STATE_SUFFIX = ".tfstate"
+LOCK_SUFFIX = ".tflock"
+
+
+class StateStore:
+    """Persist states and their locks as files under directory."""
+
+    def __init__(self, directory: pathlib.Path) -> None:
+        """Initialize the store; directory is created as needed."""
+        self.directory = directory
+
+    def _path(self, name: str, suffix: str) -> pathlib.Path:
+        """Return the file for the named state, which must be a relative path without parent references."""
+        parts = [part for part in name.split("/") if part]
+        if not parts or any(part in {".", ".."} for part in parts):
+            msg = f"invalid state name: {name!r}"
+            raise ValueError(msg)
+        path = self.directory.joinpath(*parts)
+        return path.with_name(path.name + suffix)
+
+    def get(self, name: str) -> bytes | None:
+        """Return the named state, or None if it does not exist."""
+        path = self._path(name, STATE_SUFFIX)
+        return path.read_bytes() if path.exists() else None
+
+    def put(self, name: str, state: bytes) -> None:
+        """Replace the named state atomically."""
+        path = self._path(name, STATE_SUFFIX)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        staging = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}")
+        staging.write_bytes(state)
+        staging.replace(path)
+
+    def delete(self, name: str) -> None:
+        """Remove the named state, if it exists."""
+        self._path(name, STATE_SUFFIX).unlink(missing_ok=True)
+
+    def lock_info(self, name: str) -> dict[str, Any] | None:
+        """Return the lock info of the holder of the named state's lock, or None if it is not locked."""
+        path = self._path(name, LOCK_SUFFIX)
+        try:
+            return json.loads(path.read_bytes())
+        except FileNotFoundError:
+            return None
+
+    def lock(self, name: str, info: dict[str, Any]) -> dict[str, Any] | None:
+        """Acquire the lock on the named state, returning None on success or the lock info of the current holder."""
+        path = self._path(name, LOCK_SUFFIX)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            with path.open("x", encoding="utf-8") as lock_file:
+                json.dump(info, lock_file)
+        except FileExistsError:
+            return self.lock_info(name) or {}
+        return None
+
+    def unlock(self, name: str, lock_id: str | None) -> dict[str, Any] | None:
+        """Release the lock on the named state, returning None on success or the lock info if lock_id does not match.
+
+        NOTE: A lock_id of None releases the lock regardless of the holder, as for `force-unlock`.
+        """
+        info = self.lock_info(name)
+        if info is None:
+            return None
+        if lock_id is not None and info.get("ID") != lock_id:
+            return info
+        self._path(name, LOCK_SUFFIX).unlink(missing_ok=True)
+        return None
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    """Implement the http backend protocol for the StateStore of the server."""
+
+    server: "StateServer"
+
+    def _name(self) -> tuple[str, dict[str, list[str]]]:
+        url = urllib.parse.urlsplit(self.path)
+        return urllib.parse.unquote(url.path), urllib.parse.parse_qs(url.query)
+
+    def _body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    def _respond(self, status: int, body: bytes = b"", content_type: str = "application/json") -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _dispatch(self, method: str) -> None:
+        name, query = self._name()
+        self.server.requests.append((method, name))
+        store = self.server.store
+        try:
+            if method == "GET":
+                state = store.get(name)
+                self._respond(404) if state is None else self._respond(200, state)
+            elif method == "POST":
+                holder = store.lock_info(name)
+                if holder is not None and holder.get("ID") != query.get("ID", [None])[0]:
+                    self._respond(409, json.dumps(holder).encode("utf-8"))
+                    return
+                store.put(name, self._body())
+                self._respond(200)
+            elif method == "DELETE":
+                store.delete(name)
+                self._respond(200)
+            elif method == "LOCK":
+                holder = store.lock(name, json.loads(self._body() or b"{}"))
+                self._respond(200) if holder is None else self._respond(423, json.dumps(holder).encode("utf-8"))
+            elif method == "UNLOCK":
+                body = self._body()
+                holder = store.unlock(name, json.loads(body).get("ID") if body else None)
+                self._respond(200) if holder is None else self._respond(409, json.dumps(holder).encode("utf-8"))
+        except ValueError as e:
+            self._respond(400, str(e).encode("utf-8"), content_type="text/plain")
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def do_DELETE(self) -> None:
+        self._dispatch("DELETE")
+
+    def do_LOCK(self) -> None:
+        self._dispatch("LOCK")
+
+    def do_UNLOCK(self) -> None:
+        self._dispatch("UNLOCK")
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002, ANN401
+        """Suppress the default logging of every request to stderr."""
+
+
+class StateServer(http.server.ThreadingHTTPServer):
+    """A localhost HTTP server that serves states from a StateStore."""
+
+    daemon_threads = True
+
+    def __init__(self, store: StateStore, host: str = "127.0.0.1", port: int = 0) -> None:
+        """Bind the server to host and port; the default port of 0 binds to an available port."""
+        super().__init__((host, port), _Handler)
+        self.store = store
+        self.requests: list[tuple[str, str]] = []
+
+    @property
+    def endpoint(self) -> str:
+        """Return the base address of states served by the server."""
+        host, port = self.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def address(self, name: str) -> str:
+        """Return the address of the named state, for the address, lock_address, and unlock_address options."""
+        return f"{self.endpoint}/{urllib.parse.quote(name.strip('/'))}"
+
+
+@contextmanager
+def serve_state(directory: pathlib.Path) -> Generator[StateServer, None, None]:
+    """Serve the states in directory from a background thread until exit."""
+    server = StateServer(StateStore(directory))
+    thread = threading.Thread(target=server.serve_forever, name="state-server", daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
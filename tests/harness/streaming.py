@@ -0,0 +1,131 @@
+"""Incremental streaming of tofu/terraform output to pytest logging, or to a dedicated log file.
+
+Output lines are logged at INFO, which is below the configured log_cli_level, so they are only shown live when pytest
+is run with `--log-cli-level=INFO`; otherwise they are only reported in the captured log of a failed test, and a
+failed command reports the most recent lines in its TofuError. The complete output is only kept if environment
+variable TEST_TF_OUTPUT_LOG names a file: lines are appended to it instead of being propagated to pytest, so they can
+be followed with `tail -f`.
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import subprocess
+from collections import deque
+from collections.abc import Mapping, Sequence
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TAIL_LINES = 200
+# TF_LOG=json emits very long single-line records; raise the asyncio default of 64KiB per line. Longer lines are
+# truncated to this length.
+STREAM_LINE_LIMIT = 2**20
+TRUNCATED_MARKER = b" [truncated]"
+
+
+class TofuError(subprocess.CalledProcessError):
+    """A tofu/terraform command failed; the most recent lines of output are included in the message."""
+
+    def __str__(self) -> str:
+        """Return the standard CalledProcessError message followed by the output tail."""
+        message = super().__str__()
+        if not self.output:
+            return message
+        return f"{message}\n--- last {len(self.output.splitlines())} lines of output ---\n{self.output}"
+
+
+@functools.cache
+def output_logger() -> logging.Logger:
+    """Return the logger of tofu/terraform output, writing to the file named by TEST_TF_OUTPUT_LOG if it is set."""
+    output_log = os.getenv("TEST_TF_OUTPUT_LOG")
+    if output_log:
+        output_log = output_log.strip()
+    if not output_log:
+        return logger
+    file_logger = logging.getLogger(f"{__name__}.output")
+    handler = logging.FileHandler(output_log, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+    file_logger.addHandler(handler)
+    file_logger.setLevel(logging.INFO)
+    file_logger.propagate = False
+    return file_logger
+
+
+async def _readline(stream: asyncio.StreamReader) -> bytes:
+    """Return the next line of stream, or an empty bytes at EOF.
+
+    A line longer than the stream limit is truncated and marked with TRUNCATED_MARKER; the rest of the line is
+    discarded.
+    """
+    try:
+        return await stream.readuntil(b"\n")
+    except asyncio.IncompleteReadError as e:
+        return e.partial
+    except asyncio.LimitOverrunError as e:
+        line = await stream.readexactly(e.consumed)
+    while True:
+        try:
+            await stream.readuntil(b"\n")
+        except asyncio.IncompleteReadError:
+            break
+        except asyncio.LimitOverrunError as e:
+            await stream.readexactly(e.consumed)
+        else:
+            break
+    return line + TRUNCATED_MARKER
+
+
+async def _forward(stream: asyncio.StreamReader, label: str, tail: deque[str]) -> None:
+    """Read stream line by line, logging each line with label and keeping it in tail."""
+    log = output_logger()
+    while line := await _readline(stream):
+        text = line.decode("utf-8", errors="replace").rstrip()
+        tail.append(text)
+        log.info("[%s] %s", label, text)
+
+
+async def stream_command(
+    cmd: Sequence[str],
+    label: str,
+    *,
+    capture: bool = False,
+    tail_lines: int = DEFAULT_TAIL_LINES,
+    env: Mapping[str, str] | None = None,
+) -> bytes:
+    """Execute cmd, forwarding stdout and stderr to the output logger as they are produced.
+
+    Only a bounded ring buffer of recent lines is retained, which is attached to the TofuError raised if the command
+    exits with a non-zero return code. If capture is True, stdout is returned whole instead of being logged; this is
+    intended for commands like `output -json` or `show -json` that have machine-readable output. Any env entries are
+    added to the inherited environment.
+    """
+    tail: deque[str] = deque(maxlen=tail_lines)
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        limit=STREAM_LINE_LIMIT,
+        env=os.environ | dict(env) if env else None,
+    )
+    assert process.stdout
+    assert process.stderr
+    try:
+        # Captured output is machine-readable and may be a single very long line, so it is read whole.
+        captured, _ = await asyncio.gather(
+            process.stdout.read() if capture else _forward(process.stdout, label, tail),
+            _forward(process.stderr, label, tail),
+        )
+        returncode = await process.wait()
+    except BaseException:
+        # Don't leave an orphaned tofu/terraform process behind if the caller is cancelled.
+        if process.returncode is None:
+            process.kill()
+        raise
+    if returncode:
+        raise TofuError(
+            returncode=returncode,
+            cmd=list(cmd),
+            output="\n".join(tail),
+        )
+    return captured or b""
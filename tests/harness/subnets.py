@@ -0,0 +1,173 @@
+"""Pure-Python evaluation of the module's `locals.subnets` CIDR allocation and the outputs derived from it.
+
+The functions mirror the `cidrsubnet` arithmetic and the defaulting rules in main.tf and variables.tf so that expected
+values can be generated from a tfvars dict instead of being computed by hand.
+"""
+
+import functools
+import ipaddress
+from collections.abc import Mapping
+from typing import Any
+
+DEFAULT_NAME = "restricted"
+DEFAULT_PRIMARY_IPV4_CIDR = "172.16.0.0/12"
+DEFAULT_SUBNET_SIZE = 24
+DEFAULT_SUBNET_OFFSET = 0
+DEFAULT_SUBNET_STEP = 1
+COMPUTE_API_PREFIX = "https://www.googleapis.com/compute/v1/"
+
+# Location and direction abbreviations used by memes/region-detail/google to build the short region names that suffix
+# every subnet, e.g. us-west1 -> us-we1.
+LOCATION_ABBREVIATIONS = {
+    "africa": "af",
+    "asia": "as",
+    "australia": "au",
+    "europe": "eu",
+    "me": "me",
+    "northamerica": "na",
+    "southamerica": "sa",
+    "us": "us",
+}
+DIRECTION_ABBREVIATIONS = {
+    "central": "ce",
+    "east": "ea",
+    "north": "no",
+    "northeast": "ne",
+    "northwest": "nw",
+    "south": "so",
+    "southeast": "se",
+    "southwest": "sw",
+    "west": "we",
+}
+
+
+def region_abbreviation(region: str, abbreviations: Mapping[str, str] | None = None) -> str:
+    """Return the short name for the region, preferring any explicit entry in abbreviations.
+
+    NOTE: The fallback is derived from the location and direction of the region name, e.g. us-west1 -> us-we1; pass an
+    explicit mapping for regions where memes/region-detail/google uses a different abbreviation.
+    """
+    if abbreviations and region in abbreviations:
+        return abbreviations[region]
+    location, _, zone = region.partition("-")
+    direction = zone.rstrip("0123456789")
+    number = zone[len(direction) :]
+    return "-".join(
+        [
+            LOCATION_ABBREVIATIONS.get(location, location[:2]),
+            DIRECTION_ABBREVIATIONS.get(direction, direction[:2]) + number,
+        ],
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_ipv4_cidr(cidr: str) -> tuple[int, int]:
+    """Return the network address as an integer and prefix length of the IPv4 CIDR."""
+    network = ipaddress.IPv4Network(cidr, strict=False)
+    return int(network.network_address), network.prefixlen
+
+
+def cidrsubnet(prefix: str, newbits: int, netnum: int) -> str:
+    """Return the IPv4 subnet of prefix with newbits additional prefix bits and number netnum.
+
+    This is equivalent to the tofu/terraform function of the same name, raising ValueError when the requested subnet
+    does not fit within prefix.
+    """
+    base, length = _parse_ipv4_cidr(prefix)
+    subnet_length = length + newbits
+    if newbits < 0 or subnet_length > ipaddress.IPV4LENGTH:
+        msg = f"insufficient address space to extend prefix of {length} by {newbits}"
+        raise ValueError(msg)
+    if netnum < 0 or netnum >= 1 << newbits:
+        msg = f"prefix extension of {newbits} does not accommodate a subnet numbered {netnum}"
+        raise ValueError(msg)
+    address = base | (netnum << (ipaddress.IPV4LENGTH - subnet_length))
+    return f"{ipaddress.IPv4Address(address)!s}/{subnet_length}"
+
+
+def _value(values: Mapping[str, Any] | None, key: str, default: Any) -> Any:  # noqa: ANN401
+    """Return values[key], or default if it is missing or null, matching optional() attribute defaults."""
+    if not values:
+        return default
+    value = values.get(key)
+    return default if value is None else value
+
+
+def evaluate_subnets(
+    tfvars: Mapping[str, Any],
+    abbreviations: Mapping[str, str] | None = None,
+) -> dict[str, dict[str, Any]]:
+    """Return the equivalent of `local.subnets` for the tfvars, keyed by subnet name.
+
+    NOTE: The CIDRs of a region are numbered by its entry in cidrs.region_slots, with fallback to its index in regions.
+    """
+    name = _value(tfvars, "name", DEFAULT_NAME)
+    cidrs = tfvars.get("cidrs")
+    options = tfvars.get("options")
+    primary_ipv4_cidr = _value(cidrs, "primary_ipv4_cidr", DEFAULT_PRIMARY_IPV4_CIDR)
+    _, primary_length = _parse_ipv4_cidr(primary_ipv4_cidr)
+    primary_newbits = _value(cidrs, "primary_ipv4_subnet_size", DEFAULT_SUBNET_SIZE) - primary_length
+    primary_offset = _value(cidrs, "primary_ipv4_subnet_offset", DEFAULT_SUBNET_OFFSET)
+    primary_step = _value(cidrs, "primary_ipv4_subnet_step", DEFAULT_SUBNET_STEP)
+    secondaries = {
+        key: (
+            value["ipv4_cidr"],
+            _value(value, "ipv4_subnet_size", DEFAULT_SUBNET_SIZE) - _parse_ipv4_cidr(value["ipv4_cidr"])[1],
+            _value(value, "ipv4_subnet_offset", DEFAULT_SUBNET_OFFSET),
+            _value(value, "ipv4_subnet_step", DEFAULT_SUBNET_STEP),
+        )
+        for key, value in (_value(cidrs, "secondaries", {})).items()
+    }
+    region_slots = _value(cidrs, "region_slots", {})
+    slots = {region: region_slots.get(region, i) for i, region in enumerate(tfvars["regions"])}
+    ipv6_ula = _value(options, "ipv6_ula", False)  # noqa: FBT003
+    return {
+        f"{name}-{region_abbreviation(region, abbreviations)}": {
+            "region": region,
+            "primary_ipv4_cidr": cidrsubnet(primary_ipv4_cidr, primary_newbits, primary_offset + slot * primary_step),
+            "secondary_ipv4_ranges": {
+                key: cidrsubnet(cidr, newbits, offset + slot * step)
+                for key, (cidr, newbits, offset, step) in secondaries.items()
+            },
+            "stack_type": "IPV4_IPV6" if ipv6_ula else "IPV4_ONLY",
+            "ipv6_access_type": "INTERNAL" if ipv6_ula else None,
+        }
+        for region, slot in slots.items()
+    }
+
+
+def expected_output(
+    tfvars: Mapping[str, Any],
+    abbreviations: Mapping[str, str] | None = None,
+) -> dict[str, Any]:
+    """Return the module outputs expected after applying the tfvars.
+
+    NOTE: When IPv6 ULA is enabled the subnet IPv6 ranges are assigned by Google Cloud, so primary_ipv6_cidr is None in
+    the result and must be verified separately; otherwise it is the empty string reported by the provider.
+    """
+    project_id = tfvars["project_id"]
+    name = _value(tfvars, "name", DEFAULT_NAME)
+    subnets = evaluate_subnets(tfvars, abbreviations)
+    subnets_by_name = {}
+    for subnet_name, subnet in subnets.items():
+        self_link = f"{COMPUTE_API_PREFIX}projects/{project_id}/regions/{subnet['region']}/subnetworks/{subnet_name}"
+        base, _ = _parse_ipv4_cidr(subnet["primary_ipv4_cidr"])
+        subnets_by_name[subnet_name] = {
+            "region": subnet["region"],
+            "self_link": self_link,
+            "id": self_link.removeprefix(COMPUTE_API_PREFIX),
+            "primary_ipv4_cidr": subnet["primary_ipv4_cidr"],
+            "primary_ipv6_cidr": None if subnet["ipv6_access_type"] else "",
+            "secondary_ipv4_cidrs": subnet["secondary_ipv4_ranges"],
+            "gateway_address": str(ipaddress.IPv4Address(base + 1)),
+        }
+    network_self_link = f"{COMPUTE_API_PREFIX}projects/{project_id}/global/networks/{name}"
+    return {
+        "self_link": network_self_link,
+        "id": network_self_link.removeprefix(COMPUTE_API_PREFIX),
+        "subnets_by_name": subnets_by_name,
+        "subnets_by_region": {
+            subnet["region"]: {"name": subnet_name} | {k: v for k, v in subnet.items() if k != "region"}
+            for subnet_name, subnet in subnets_by_name.items()
+        },
+    }
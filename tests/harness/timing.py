@@ -0,0 +1,157 @@
+"""Per-phase timing of tofu/terraform executions and the session report built from them."""
+
+import functools
+import json
+import math
+import pathlib
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Generator, Iterable
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import pytest
+
+WORKER_OUTPUT_KEY = "tofu_phase_timings"
+PERCENTILES = (50, 90, 99)
+
+
+@dataclass(frozen=True)
+class PhaseTiming:
+    """The duration of a single tofu/terraform phase executed for a fixture."""
+
+    fixture: str
+    phase: str
+    started: float
+    duration: float
+    succeeded: bool
+
+
+class PhaseTimer:
+    """Thread-safe collector of phase timings for fixtures executed in this process."""
+
+    def __init__(self) -> None:
+        """Initialize an empty collection."""
+        self._lock = threading.Lock()
+        self._timings: list[PhaseTiming] = []
+
+    @contextmanager
+    def measure(self, fixture: str, phase: str) -> Generator[None, None, None]:
+        """Record the wall-clock duration of the enclosed block as a phase of fixture, even if it raises an error."""
+        started = time.time()
+        start = time.perf_counter()
+        succeeded = False
+        try:
+            yield
+            succeeded = True
+        finally:
+            self.add(
+                PhaseTiming(
+                    fixture=fixture,
+                    phase=phase,
+                    started=started,
+                    duration=time.perf_counter() - start,
+                    succeeded=succeeded,
+                ),
+            )
+
+    def add(self, *timings: PhaseTiming) -> None:
+        """Add the timings to the collection."""
+        with self._lock:
+            self._timings.extend(timings)
+
+    @property
+    def timings(self) -> list[PhaseTiming]:
+        """Return a copy of the collected timings, in the order they completed."""
+        with self._lock:
+            return list(self._timings)
+
+
+@functools.cache
+def default_timer() -> PhaseTimer:
+    """Return the timer shared by the engines in this process that report to the session; see default_engine()."""
+    return PhaseTimer()
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Return the nearest-rank percentile of the values."""
+    assert values
+    ordered = sorted(values)
+    return ordered[max(math.ceil(pct / 100 * len(ordered)) - 1, 0)]
+
+
+def summarize(timings: Iterable[PhaseTiming]) -> dict[str, Any]:
+    """Return a report of per-fixture durations and aggregate per-phase statistics for the timings."""
+    timings = list(timings)
+    fixtures: dict[str, dict[str, Any]] = defaultdict(lambda: {"total": 0.0, "phases": defaultdict(float)})
+    phases: dict[str, list[float]] = defaultdict(list)
+    for timing in timings:
+        fixtures[timing.fixture]["total"] += timing.duration
+        fixtures[timing.fixture]["phases"][timing.phase] += timing.duration
+        phases[timing.phase].append(timing.duration)
+    return {
+        "timings": [asdict(timing) for timing in timings],
+        "fixtures": {
+            name: {"total": summary["total"], "phases": dict(summary["phases"])}
+            for name, summary in sorted(fixtures.items(), key=lambda item: item[1]["total"], reverse=True)
+        },
+        "phases": {
+            phase: {
+                "count": len(durations),
+                "total": sum(durations),
+                **{f"p{pct}": percentile(durations, pct) for pct in PERCENTILES},
+                "max": max(durations),
+            }
+            for phase, durations in phases.items()
+        },
+    }
+
+
+class PhaseTimingReport:
+    """Pytest plugin that gathers phase timings from all workers into a JSON report and terminal summary."""
+
+    def __init__(self, config: pytest.Config, report_path: pathlib.Path | None) -> None:
+        """Initialize the plugin for the session; the JSON report will be written to report_path if it is not None."""
+        self._config = config
+        self._report_path = report_path
+        self._timer = default_timer()
+        self.report: dict[str, Any] | None = None
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node: Any, error: Any) -> None:  # noqa: ANN401, ARG002
+        """Merge the timings gathered by a pytest-xdist worker into the controller collection."""
+        timings = getattr(node, "workeroutput", {}).get(WORKER_OUTPUT_KEY, [])
+        self._timer.add(*[PhaseTiming(**timing) for timing in timings])
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:  # noqa: ARG002
+        """Send timings to the controller if this is a pytest-xdist worker, otherwise write the report."""
+        workeroutput = getattr(self._config, "workeroutput", None)
+        if workeroutput is not None:
+            workeroutput[WORKER_OUTPUT_KEY] = [asdict(timing) for timing in self._timer.timings]
+            return
+        if not self._timer.timings:
+            return
+        self.report = summarize(self._timer.timings)
+        if self._report_path is not None:
+            self._report_path.parent.mkdir(parents=True, exist_ok=True)
+            self._report_path.write_text(json.dumps(self.report, indent=2), encoding="utf-8")
+
+    def pytest_terminal_summary(self, terminalreporter: pytest.TerminalReporter) -> None:
+        """Add per-fixture and aggregate phase durations to the terminal summary."""
+        if not self.report:
+            return
+        terminalreporter.write_sep("=", "tofu phase timings")
+        for name, summary in self.report["fixtures"].items():
+            phases = " ".join(f"{phase}={duration:.1f}s" for phase, duration in summary["phases"].items())
+            terminalreporter.write_line(f"{name}: {summary['total']:.1f}s ({phases})")
+        terminalreporter.write_line("")
+        headers = ["count", "total", *[f"p{pct}" for pct in PERCENTILES], "max"]
+        terminalreporter.write_line(f"{'phase':<24}" + "".join(f"{header:>10}" for header in headers))
+        for phase, stats in self.report["phases"].items():
+            values = [f"{stats['count']:>10}", *[f"{stats[header]:>9.1f}s" for header in headers[1:]]]
+            terminalreporter.write_line(f"{phase:<24}" + "".join(values))
+        if self._report_path is not None:
+            terminalreporter.write_line(f"report: {self._report_path!s}")
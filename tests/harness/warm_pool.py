@@ -0,0 +1,75 @@
+"""Records of fixtures left applied by a previous session, keyed by a fingerprint of their inputs.
+
+When destroy is skipped the resources of a fixture outlive the session. If the next session applies the same module
+sources with the same tfvars and workspace, and a refresh finds no drift, the fixture can reuse the existing resources
+and go straight to `output -json` instead of planning and applying again.
+
+NOTE: Reuse needs state that outlives the fixture directory, i.e. the gcs backend or the http backend with a persistent
+TEST_TF_STATE_DIR.
+"""
+
+import hashlib
+import json
+import os
+import pathlib
+import re
+import time
+from collections.abc import Mapping
+from typing import Any
+
+from .golden import module_digest
+
+RECORD_SUFFIX = ".json"
+BACKEND_TF = "_backend.tf"
+# The scheme and host:port of an http backend address; the state server binds an available port in every session.
+HTTP_ENDPOINT_PATTERN = re.compile(r"https?://[^/\"]+")
+
+
+def fingerprint(fixture: pathlib.Path, tfvars: Mapping[str, Any], workspace: str | None = None) -> str:
+    """Return a digest of the module sources in the fixture directory, the tfvars, and the workspace.
+
+    The digest includes the backend type and state settings of the _backend.tf of the fixture, so that a fixture is only
+    reused from the same state, but not the endpoint of an http backend, which changes with every session.
+    """
+    digest = hashlib.sha256(module_digest(fixture, exclude={BACKEND_TF}).encode("utf-8"))
+    backend_tf = fixture.joinpath(BACKEND_TF)
+    if backend_tf.exists():
+        digest.update(HTTP_ENDPOINT_PATTERN.sub("", backend_tf.read_text(encoding="utf-8")).encode("utf-8"))
+    digest.update(json.dumps(tfvars, sort_keys=True, separators=(",", ":")).encode("utf-8"))
+    digest.update((workspace or "").encode("utf-8"))
+    return digest.hexdigest()
+
+
+class WarmPool:
+    """A directory of records of applied fixtures, one file per fingerprint."""
+
+    def __init__(self, directory: pathlib.Path) -> None:
+        """Initialize the pool; directory is created as needed."""
+        self.directory = directory
+
+    def _path(self, key: str) -> pathlib.Path:
+        return self.directory.joinpath(key + RECORD_SUFFIX)
+
+    def __contains__(self, key: str) -> bool:
+        """Return True if a fixture with the fingerprint was left applied."""
+        return self._path(key).exists()
+
+    def add(self, key: str, fixture: pathlib.Path) -> None:
+        """Record that the fixture with the fingerprint has been applied."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._path(key).write_text(
+            json.dumps({"fixture": fixture.name, "applied": time.time()}),
+            encoding="utf-8",
+        )
+
+    def discard(self, key: str) -> None:
+        """Remove the record of the fingerprint, if any, e.g. before the fixture is destroyed."""
+        self._path(key).unlink(missing_ok=True)
+
+
+def default_warm_pool() -> WarmPool | None:
+    """Return the pool in the directory named by environment variable TEST_TF_WARM_POOL_DIR, or None if it is unset."""
+    directory = os.getenv("TEST_TF_WARM_POOL_DIR")
+    if directory:
+        directory = directory.strip()
+    return WarmPool(pathlib.Path(directory)) if directory else None
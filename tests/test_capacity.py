@@ -0,0 +1,109 @@
+"""Verify the bulk CIDR capacity planner against the subnet allocation evaluator."""
+
+import ipaddress
+import itertools
+
+import pytest
+
+from .harness.capacity import PRIMARY, Overlap, RangeFamily, evaluate, families_from_cidrs, sweep
+from .harness.subnets import evaluate_subnets
+
+GKE_CIDRS = {
+    "secondaries": {
+        "pods": {
+            "ipv4_cidr": "10.0.0.0/8",
+            "ipv4_subnet_size": 16,
+        },
+        "services": {
+            "ipv4_cidr": "10.100.0.0/16",
+        },
+    },
+}
+
+
+@pytest.mark.parametrize(
+    ("family", "expected"),
+    [
+        (RangeFamily("172.16.0.0/12"), 4096),
+        (RangeFamily("172.16.0.0/12", offset=10, step=10), 409),
+        (RangeFamily("10.0.0.0/23", offset=1), 1),
+        (RangeFamily("10.0.0.0/23", offset=2), 0),
+        (RangeFamily("10.0.0.0/24", size=23), 0),
+        (RangeFamily("10.0.0.0/16", offset=9, step=-3), 4),
+    ],
+)
+def test_max_regions(family: RangeFamily, expected: int) -> None:
+    """Verify the number of regions that fit in the parent CIDR."""
+    assert family.max_regions() == expected
+
+
+@pytest.mark.parametrize("regions", [1, 2, 50, 100, 101])
+def test_evaluate_matches_evaluator(regions: int) -> None:
+    """Verify the planner agrees with materializing every subnet of the GKE fixture allocation."""
+    result = evaluate(families_from_cidrs(GKE_CIDRS), regions)
+    ranges = [
+        (subnet["primary_ipv4_cidr"], *subnet["secondary_ipv4_ranges"].values())
+        for subnet in evaluate_subnets(
+            {
+                "regions": [f"region-{i}" for i in range(regions)],
+                "cidrs": GKE_CIDRS,
+            },
+            abbreviations={f"region-{i}": f"r{i}" for i in range(regions)},
+        ).values()
+    ]
+    networks = [ipaddress.IPv4Network(cidr) for cidr in itertools.chain.from_iterable(ranges)]
+    collisions = any(a.overlaps(b) for a, b in itertools.combinations(networks, 2))
+    assert result.viable == (not collisions)
+
+
+def test_evaluate_exhausted() -> None:
+    """Verify a family that does not fit the requested number of regions is reported."""
+    result = evaluate(families_from_cidrs({"primary_ipv4_cidr": "10.0.0.0/23", "primary_ipv4_subnet_offset": 1}), 2)
+    assert result.exhausted == (PRIMARY,)
+    assert not result.overlaps
+    assert not result.viable
+
+
+def test_evaluate_overlap() -> None:
+    """Verify overlapping primary and secondary families report the first colliding regions."""
+    result = evaluate(
+        families_from_cidrs(
+            {
+                "primary_ipv4_cidr": "10.0.0.0/8",
+                "primary_ipv4_subnet_size": 16,
+                "secondaries": {
+                    "pods": {
+                        "ipv4_cidr": "10.2.0.0/16",
+                        "ipv4_subnet_size": 20,
+                    },
+                },
+            },
+        ),
+        3,
+    )
+    assert not result.exhausted
+    assert result.overlaps == (Overlap(PRIMARY, "pods", 2, 0),)
+
+
+def test_evaluate_self_overlap() -> None:
+    """Verify a zero step re-uses the same block in every region."""
+    result = evaluate(families_from_cidrs({"primary_ipv4_subnet_step": 0}), 2)
+    assert result.overlaps == (Overlap(PRIMARY, PRIMARY, 0, 1),)
+
+
+def test_sweep() -> None:
+    """Verify every combination is evaluated, with pods exhausting before services collide."""
+    results = sweep(
+        GKE_CIDRS,
+        regions=[2, 100, 200],
+        sizes={"pods": [14, 16]},
+        steps={PRIMARY: [1, 2]},
+    )
+    assert len(results) == 12  # noqa: PLR2004
+    viable = {
+        (result.regions, dict(result.families)["pods"].size, dict(result.families)[PRIMARY].step)
+        for result in results
+        if result.viable
+    }
+    assert viable == {(2, 14, 1), (2, 14, 2), (2, 16, 1), (2, 16, 2), (100, 16, 1), (100, 16, 2)}
+    assert all(PRIMARY not in result.exhausted for result in results)
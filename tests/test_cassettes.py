@@ -0,0 +1,129 @@
+"""Verify compute snapshots recorded to a cassette are replayed without the compute v1 clients."""
+
+import pathlib
+from collections.abc import Generator
+from typing import Any
+
+import pytest
+from google.auth.credentials import AnonymousCredentials
+from google.cloud import compute_v1
+
+from .conftest import run_tofu_in_workspace
+from .harness.cassettes import Cassette, CassetteMissError, cassette_clients, fixture_cassette
+from .harness.fake_compute import FakeCompute, serve_fake_compute
+from .harness.snapshot import ComputeClients, ComputeSnapshot, fetch_snapshot
+
+PROJECT_ID = "test-project"
+NAME = "cassette"
+REGIONS = ["us-west1", "us-east1"]
+
+
+def _resource(resource_type: str, values: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "address": f"{resource_type}.{NAME}",
+        "mode": "managed",
+        "type": resource_type,
+        "name": NAME,
+        "values": {"project": PROJECT_ID, "name": NAME} | values,
+    }
+
+
+@pytest.fixture(scope="module")
+def cassette_path(tmp_path_factory: pytest.TempPathFactory) -> pathlib.Path:
+    """Return the path of the cassette to record."""
+    return tmp_path_factory.mktemp("cassettes").joinpath(f"{NAME}.json")
+
+
+@pytest.fixture(scope="module")
+def recorded(cassette_path: pathlib.Path) -> Generator[ComputeSnapshot, None, None]:
+    """Return a snapshot of a fake network fetched with clients that record to the cassette."""
+    store = FakeCompute()
+    store.seed(
+        {
+            "planned_values": {
+                "root_module": {
+                    "resources": [
+                        _resource("google_compute_network", {"delete_default_routes_on_create": False}),
+                        _resource(
+                            "google_compute_subnetwork",
+                            {
+                                "region": "us-west1",
+                                "ip_cidr_range": "172.16.0.0/24",
+                                "secondary_ip_range": [{"range_name": "pods", "ip_cidr_range": "10.0.0.0/16"}],
+                            },
+                        ),
+                        _resource("google_compute_router", {"region": "us-west1"}),
+                        _resource(
+                            "google_compute_router_nat",
+                            {"router": NAME, "region": "us-west1", "log_config": [{"enable": True}]},
+                        ),
+                    ],
+                },
+            },
+        },
+    )
+    with serve_fake_compute(store) as server:
+        options: dict[str, Any] = {
+            "credentials": AnonymousCredentials(),
+            "client_options": {"api_endpoint": server.endpoint},
+        }
+        clients = ComputeClients(
+            networks=compute_v1.NetworksClient(**options),
+            subnetworks=compute_v1.SubnetworksClient(**options),
+            routes=compute_v1.RoutesClient(**options),
+            routers=compute_v1.RoutersClient(**options),
+            global_addresses=compute_v1.GlobalAddressesClient(**options),
+            global_forwarding_rules=compute_v1.GlobalForwardingRulesClient(**options),
+        )
+        yield fetch_snapshot(
+            clients=cassette_clients(Cassette(cassette_path, load=False), clients),
+            project_id=PROJECT_ID,
+            network=NAME,
+            regions=REGIONS,
+        )
+
+
+def test_replay(recorded: ComputeSnapshot, cassette_path: pathlib.Path) -> None:
+    """Verify the replayed snapshot is identical to the recorded snapshot."""
+    replayed = fetch_snapshot(
+        clients=cassette_clients(Cassette(cassette_path)),
+        project_id=PROJECT_ID,
+        network=NAME,
+        regions=REGIONS,
+    )
+    assert replayed == recorded
+    assert replayed.subnetworks[NAME].secondary_ip_ranges[0].ip_cidr_range == "10.0.0.0/16"
+    assert [nat.log_config.enable for nat in replayed.routers["us-west1"][0].nats] == [True]
+    assert not replayed.routers["us-east1"]
+    assert [route.dest_range for route in replayed.routes] == ["0.0.0.0/0"]
+
+
+def test_replay_miss(recorded: ComputeSnapshot, cassette_path: pathlib.Path) -> None:
+    """Verify a request that was not recorded raises an error rather than returning an empty response."""
+    assert recorded.network.name == NAME
+    with pytest.raises(CassetteMissError, match="has not been recorded"):
+        fetch_snapshot(
+            clients=cassette_clients(Cassette(cassette_path)),
+            project_id=PROJECT_ID,
+            network="other",
+            regions=REGIONS,
+        )
+
+
+def test_replay_output(monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path) -> None:
+    """Verify the recorded fixture output is yielded without executing tofu/terraform in replay mode."""
+    monkeypatch.setenv("TEST_CASSETTE_DIR", str(tmp_path))
+    monkeypatch.setenv("TEST_CASSETTE_MODE", "replay")
+    monkeypatch.setenv("TEST_TF_COMMAND", str(tmp_path.joinpath("missing")))
+    fixture_cassette.cache_clear()
+    try:
+        Cassette(tmp_path.joinpath(f"{NAME}.json")).output = {"id": f"projects/{PROJECT_ID}/global/networks/{NAME}"}
+        with run_tofu_in_workspace(fixture=tmp_path, tfvars={"name": NAME}) as output:
+            assert output == {"id": f"projects/{PROJECT_ID}/global/networks/{NAME}"}
+        with (
+            pytest.raises(CassetteMissError, match="no output"),
+            run_tofu_in_workspace(fixture=tmp_path, tfvars={"name": "other"}),
+        ):
+            pass
+    finally:
+        fixture_cassette.cache_clear()
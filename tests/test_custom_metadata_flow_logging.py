@@ -6,9 +6,9 @@ from collections.abc import Callable, Generator
 from typing import Any
 
 import pytest
-from google.cloud import compute_v1
 
 from .conftest import run_tofu_in_workspace
+from .harness.snapshot import ComputeSnapshot
 
 FIXTURE_NAME = "custom-meta-flow-log"
 FIXTURE_LABELS = {
@@ -31,33 +31,48 @@ def fixture_labels(labels: dict[str, str]) -> dict[str, str] | None:
     return FIXTURE_LABELS | labels
 
 
+def fixture_tfvars(project_id: str, prefix: str, labels: dict[str, str]) -> dict[str, Any]:
+    """Return the input vars suitable for this fixture, from session fixtures so that it can be prefetched."""
+    return {
+        "project_id": project_id,
+        "name": f"{prefix}-{FIXTURE_NAME}",
+        "regions": [
+            "us-west1",
+            "us-east1",
+        ],
+        "flow_logs": {
+            "metadata": "CUSTOM_METADATA",
+            "metadata_fields": FIXTURE_METADATA_FIELDS,
+        },
+        "labels": FIXTURE_LABELS | labels,
+    }
+
+
 @pytest.fixture(scope="module")
 def output(
     root_fixture_dir: Callable[[str], pathlib.Path],
     project_id: str,
-    fixture_name: str,
-    fixture_labels: dict[str, str],
+    prefix: str,
+    labels: dict[str, str],
 ) -> Generator[dict[str, Any], None, None]:
     """Execute Tofu (or Terraform) with the input vars suitable for this fixture, yielding the module output."""
     with run_tofu_in_workspace(
         fixture=root_fixture_dir(FIXTURE_NAME),
-        tfvars={
-            "project_id": project_id,
-            "name": fixture_name,
-            "regions": [
-                "us-west1",
-                "us-east1",
-            ],
-            "flow_logs": {
-                "metadata": "CUSTOM_METADATA",
-                "metadata_fields": FIXTURE_METADATA_FIELDS,
-            },
-            "labels": fixture_labels,
-        },
+        tfvars=fixture_tfvars(project_id, prefix, labels),
     ) as output:
         yield output
 
 
+@pytest.fixture(scope="module")
+def snapshot(
+    compute_snapshot: Callable[[str, dict[str, Any]], ComputeSnapshot],
+    output: dict[str, Any],
+    fixture_name: str,
+) -> ComputeSnapshot:
+    """Return a snapshot of the network and associated resources, fetched once after the fixture is applied."""
+    return compute_snapshot(fixture_name, output)
+
+
 def test_output_values(output: dict[str, Any], project_id: str, fixture_name: str) -> None:
     """Verify the output values match expectations."""
     assert output == {
@@ -106,14 +121,9 @@ def test_output_values(output: dict[str, Any], project_id: str, fixture_name: st
     }
 
 
-def test_network(networks_client: compute_v1.NetworksClient, project_id: str, fixture_name: str) -> None:
+def test_network(snapshot: ComputeSnapshot, project_id: str, fixture_name: str) -> None:
     """Verify the network exists and matches expectations."""
-    result = networks_client.get(
-        request=compute_v1.GetNetworkRequest(
-            network=fixture_name,
-            project=project_id,
-        ),
-    )
+    result = snapshot.network
     assert result
     assert not result.auto_create_subnetworks
     assert result.description == "custom vpc"
@@ -131,18 +141,12 @@ def test_network(networks_client: compute_v1.NetworksClient, project_id: str, fi
 
 
 def test_subnetwork_us_west1(
-    subnetworks_client: compute_v1.SubnetworksClient,
+    snapshot: ComputeSnapshot,
     project_id: str,
     fixture_name: str,
 ) -> None:
     """Verify the subnetwork exists and matches expectations."""
-    result = subnetworks_client.get(
-        request=compute_v1.GetSubnetworkRequest(
-            subnetwork=f"{fixture_name}-us-we1",
-            project=project_id,
-            region="us-west1",
-        ),
-    )
+    result = snapshot.subnetworks[f"{fixture_name}-us-we1"]
     assert result
     assert not result.description
     assert result.enable_flow_logs
@@ -171,18 +175,12 @@ def test_subnetwork_us_west1(
 
 
 def test_subnetwork_us_east1(
-    subnetworks_client: compute_v1.SubnetworksClient,
+    snapshot: ComputeSnapshot,
     project_id: str,
     fixture_name: str,
 ) -> None:
     """Verify the subnetwork exists and matches expectations."""
-    result = subnetworks_client.get(
-        request=compute_v1.GetSubnetworkRequest(
-            subnetwork=f"{fixture_name}-us-ea1",
-            project=project_id,
-            region="us-east1",
-        ),
-    )
+    result = snapshot.subnetworks[f"{fixture_name}-us-ea1"]
     assert result
     assert not result.description
     assert result.enable_flow_logs
@@ -210,16 +208,9 @@ def test_subnetwork_us_east1(
     assert not result.state
 
 
-def test_routes(routes_client: compute_v1.RoutesClient, project_id: str, fixture_name: str) -> None:
+def test_routes(snapshot: ComputeSnapshot, project_id: str, fixture_name: str) -> None:
     """Verify the routes meet expectations."""
-    routes = list(
-        routes_client.list(
-            request=compute_v1.ListRoutesRequest(
-                project=project_id,
-                filter=f"network eq .*/{fixture_name}$",
-            ),
-        ),
-    )
+    routes = snapshot.routes
     default_routes = [route for route in routes if route.dest_range in ["0.0.0.0/0", "::/0"] and not route.tags]
     assert len(default_routes) == 0
     restricted_apis_routes = [route for route in routes if route.dest_range == "199.36.153.4/30"]
@@ -238,56 +229,23 @@ def test_routes(routes_client: compute_v1.RoutesClient, project_id: str, fixture
     assert len(tagged_routes) == 0
 
 
-def test_routers_us_west1(routers_client: compute_v1.RoutersClient, project_id: str, fixture_name: str) -> None:
+def test_routers_us_west1(snapshot: ComputeSnapshot) -> None:
     """Verify the router and NAT meets requirements."""
-    routers = list(
-        routers_client.list(
-            request=compute_v1.ListRoutersRequest(
-                project=project_id,
-                region="us-west1",
-                filter=f"network eq .*/{fixture_name}$",
-            ),
-        ),
-    )
+    routers = snapshot.routers["us-west1"]
     assert len(routers) == 0
 
 
-def test_routers_us_east1(routers_client: compute_v1.RoutersClient, project_id: str, fixture_name: str) -> None:
+def test_routers_us_east1(snapshot: ComputeSnapshot) -> None:
     """Verify the router and NAT meets requirements."""
-    routers = list(
-        routers_client.list(
-            request=compute_v1.ListRoutersRequest(
-                project=project_id,
-                region="us-east1",
-                filter=f"network eq .*/{fixture_name}$",
-            ),
-        ),
-    )
+    routers = snapshot.routers["us-east1"]
     assert len(routers) == 0
 
 
 def test_psc(
-    global_addresses_client: compute_v1.GlobalAddressesClient,
-    global_forwarding_rules_client: compute_v1.GlobalForwardingRulesClient,
-    project_id: str,
-    fixture_name: str,
+    snapshot: ComputeSnapshot,
 ) -> None:
     """Verify PSC meets requirements."""
-    global_addresses = list(
-        global_addresses_client.list(
-            request=compute_v1.ListGlobalAddressesRequest(
-                project=project_id,
-                filter=f"network eq .*/{fixture_name}$",
-            ),
-        ),
-    )
+    global_addresses = snapshot.global_addresses
     assert len(global_addresses) == 0
-    global_forwarding_rules = list(
-        global_forwarding_rules_client.list(
-            request=compute_v1.ListGlobalForwardingRulesRequest(
-                project=project_id,
-                filter=f"network eq .*/{fixture_name}$",
-            ),
-        ),
-    )
+    global_forwarding_rules = snapshot.global_forwarding_rules
     assert len(global_forwarding_rules) == 0
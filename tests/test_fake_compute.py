@@ -0,0 +1,250 @@
+"""Verify the fake Compute REST server serves plan and state resources to the compute v1 clients."""
+
+from collections.abc import Generator
+from typing import Any
+
+import pytest
+from google.api_core import exceptions
+from google.auth.credentials import AnonymousCredentials
+from google.cloud import compute_v1
+
+from .harness.fake_compute import FakeCompute, FakeComputeServer, matches_filter, serve_fake_compute
+from .harness.snapshot import ComputeClients, ComputeSnapshot, fetch_snapshot
+
+PROJECT_ID = "test-project"
+NAME = "fake"
+API_PREFIX = f"https://www.googleapis.com/compute/v1/projects/{PROJECT_ID}"
+REGIONS = {
+    "us-west1": ("us-we1", "172.16.0.0/24", "10.0.0.0/16"),
+    "us-east1": ("us-ea1", "172.16.1.0/24", "10.1.0.0/16"),
+}
+
+
+def _resource(resource_type: str, name: str, values: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "address": f"{resource_type}.{name}",
+        "mode": "managed",
+        "type": resource_type,
+        "name": name,
+        "values": {"project": PROJECT_ID} | values,
+    }
+
+
+@pytest.fixture(scope="module")
+def plan() -> dict[str, Any]:
+    """Return a plan of the module with NAT and PSC, where references to the network are unknown."""
+    resources = [
+        _resource(
+            "google_compute_network",
+            "network",
+            {
+                "name": NAME,
+                "description": "custom vpc",
+                "auto_create_subnetworks": False,
+                "routing_mode": "GLOBAL",
+                "mtu": 1460,
+                "delete_default_routes_on_create": True,
+                "enable_ula_internal_ipv6": False,
+            },
+        ),
+        _resource(
+            "google_compute_route",
+            "apis",
+            {
+                "name": f"{NAME}-restricted-apis",
+                "description": "Route for restricted Google API access",
+                "dest_range": "199.36.153.4/30",
+                "next_hop_gateway": "default-internet-gateway",
+                "tags": None,
+            },
+        ),
+        _resource(
+            "google_compute_global_address",
+            "psc",
+            {
+                "name": f"{NAME}-goog",
+                "address": "10.10.10.10",
+                "address_type": "INTERNAL",
+                "purpose": "PRIVATE_SERVICE_CONNECT",
+                "labels": {"fixture": NAME},
+            },
+        ),
+    ]
+    for region, (abbreviation, primary, pods) in REGIONS.items():
+        resources.extend(
+            [
+                _resource(
+                    "google_compute_subnetwork",
+                    "subnet",
+                    {
+                        "name": f"{NAME}-{abbreviation}",
+                        "region": region,
+                        "ip_cidr_range": primary,
+                        "private_ip_google_access": True,
+                        "stack_type": "IPV4_ONLY",
+                        "secondary_ip_range": [{"range_name": "pods", "ip_cidr_range": pods}],
+                        "log_config": [],
+                    },
+                ),
+                _resource(
+                    "google_compute_router",
+                    "nat",
+                    {
+                        "name": f"{NAME}-{abbreviation}",
+                        "region": region,
+                        "description": "Router to support NAT gateway for internet egress",
+                    },
+                ),
+                _resource(
+                    "google_compute_router_nat",
+                    "nat",
+                    {
+                        "name": f"{NAME}-{abbreviation}",
+                        "router": f"{NAME}-{abbreviation}",
+                        "region": region,
+                        "nat_ip_allocate_option": "AUTO_ONLY",
+                        "source_subnetwork_ip_ranges_to_nat": "ALL_SUBNETWORKS_ALL_IP_RANGES",
+                        "log_config": [{"enable": True, "filter": "ERRORS_ONLY"}],
+                    },
+                ),
+            ],
+        )
+    return {"planned_values": {"root_module": {"resources": resources}}}
+
+
+@pytest.fixture(scope="module")
+def server(plan: dict[str, Any]) -> Generator[FakeComputeServer, None, None]:
+    """Serve the plan resources from a fake Compute REST server."""
+    store = FakeCompute()
+    store.seed(plan)
+    with serve_fake_compute(store) as server:
+        yield server
+
+
+@pytest.fixture(scope="module")
+def clients(server: FakeComputeServer) -> ComputeClients:
+    """Return compute v1 clients that use the fake server."""
+    options: dict[str, Any] = {
+        "credentials": AnonymousCredentials(),
+        "client_options": {"api_endpoint": server.endpoint},
+    }
+    return ComputeClients(
+        networks=compute_v1.NetworksClient(**options),
+        subnetworks=compute_v1.SubnetworksClient(**options),
+        routes=compute_v1.RoutesClient(**options),
+        routers=compute_v1.RoutersClient(**options),
+        global_addresses=compute_v1.GlobalAddressesClient(**options),
+        global_forwarding_rules=compute_v1.GlobalForwardingRulesClient(**options),
+    )
+
+
+@pytest.fixture(scope="module")
+def snapshot(clients: ComputeClients) -> ComputeSnapshot:
+    """Return a snapshot of the fake network."""
+    return fetch_snapshot(clients=clients, project_id=PROJECT_ID, network=NAME, regions=REGIONS.keys())
+
+
+def test_network(snapshot: ComputeSnapshot) -> None:
+    """Verify the network is served with the self-links of its subnetworks."""
+    network = snapshot.network
+    assert network.name == NAME
+    assert network.description == "custom vpc"
+    assert not network.auto_create_subnetworks
+    assert network.mtu == 1460  # noqa: PLR2004
+    assert network.routing_config.routing_mode == "GLOBAL"
+    assert sorted(network.subnetworks) == [
+        f"{API_PREFIX}/regions/us-east1/subnetworks/{NAME}-us-ea1",
+        f"{API_PREFIX}/regions/us-west1/subnetworks/{NAME}-us-we1",
+    ]
+
+
+def test_subnetworks(snapshot: ComputeSnapshot) -> None:
+    """Verify subnetworks are indexed by region and have API defaults for attributes unknown in the plan."""
+    assert {region: list(subnetworks) for region, subnetworks in snapshot.subnetworks_by_region.items()} == {
+        region: [f"{NAME}-{abbreviation}"] for region, (abbreviation, _, _) in REGIONS.items()
+    }
+    subnetwork = snapshot.subnetworks[f"{NAME}-us-we1"]
+    assert subnetwork.network == f"{API_PREFIX}/global/networks/{NAME}"
+    assert subnetwork.region == f"{API_PREFIX}/regions/us-west1"
+    assert subnetwork.ip_cidr_range == "172.16.0.0/24"
+    assert subnetwork.gateway_address == "172.16.0.1"
+    assert subnetwork.private_ip_google_access
+    assert subnetwork.private_ipv6_google_access == "DISABLE_GOOGLE_ACCESS"
+    assert subnetwork.purpose == "PRIVATE"
+    assert not subnetwork.enable_flow_logs
+    assert not subnetwork.log_config.enable
+    assert [(secondary.range_name, secondary.ip_cidr_range) for secondary in subnetwork.secondary_ip_ranges] == [
+        ("pods", "10.0.0.0/16"),
+    ]
+
+
+def test_routes(snapshot: ComputeSnapshot) -> None:
+    """Verify routes have the API representation of the next hop and default priority."""
+    assert len(snapshot.routes) == 1
+    route = snapshot.routes[0]
+    assert route.name == f"{NAME}-restricted-apis"
+    assert route.next_hop_gateway == f"{API_PREFIX}/global/gateways/default-internet-gateway"
+    assert route.priority == 1000  # noqa: PLR2004
+
+
+def test_routers(snapshot: ComputeSnapshot) -> None:
+    """Verify NATs are nested in their routers."""
+    for region, (abbreviation, _, _) in REGIONS.items():
+        routers = snapshot.routers[region]
+        assert [router.name for router in routers] == [f"{NAME}-{abbreviation}"]
+        assert [(nat.name, nat.log_config.enable, nat.log_config.filter) for nat in routers[0].nats] == [
+            (f"{NAME}-{abbreviation}", True, "ERRORS_ONLY"),
+        ]
+        assert routers[0].nats[0].nat_ip_allocate_option == "AUTO_ONLY"
+
+
+def test_psc(snapshot: ComputeSnapshot) -> None:
+    """Verify global addresses are served and an empty collection is returned for forwarding rules."""
+    assert [(address.name, address.address, address.labels) for address in snapshot.global_addresses] == [
+        (f"{NAME}-goog", "10.10.10.10", {"fixture": NAME}),
+    ]
+    assert not snapshot.global_forwarding_rules
+
+
+def test_not_found(clients: ComputeClients) -> None:
+    """Verify missing resources raise the same error as the API."""
+    with pytest.raises(exceptions.NotFound):
+        clients.networks.get(request=compute_v1.GetNetworkRequest(project=PROJECT_ID, network="missing"))
+
+
+def test_filter(clients: ComputeClients) -> None:
+    """Verify list filters are applied to the network field."""
+    routes = clients.routes.list(
+        request=compute_v1.ListRoutesRequest(project=PROJECT_ID, filter="network eq .*/other$"),
+    )
+    assert not list(routes)
+
+
+def test_state_default_route() -> None:
+    """Verify resources are seeded from a state file, with the default route the API creates with a network."""
+    store = FakeCompute()
+    store.seed(
+        {
+            "resources": [
+                {
+                    "mode": "managed",
+                    "type": "google_compute_network",
+                    "name": "network",
+                    "instances": [
+                        {
+                            "attributes": {
+                                "project": PROJECT_ID,
+                                "name": NAME,
+                                "delete_default_routes_on_create": False,
+                                "self_link": f"{API_PREFIX}/global/networks/{NAME}",
+                            },
+                        },
+                    ],
+                },
+            ],
+        },
+    )
+    routes = store.list_global(PROJECT_ID, "routes")
+    assert [route["destRange"] for route in routes] == ["0.0.0.0/0"]
+    assert matches_filter(routes[0], f"network eq .*/{NAME}$")
+    assert matches_filter(routes[0], "name ne foo")
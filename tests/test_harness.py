@@ -0,0 +1,556 @@
+"""Verify the tofu/terraform lifecycle of the harness offline, with the fake tofu executable as TEST_TF_COMMAND."""
+
+import itertools
+import json
+import pathlib
+from collections.abc import Callable, Generator
+from typing import Any
+
+import pytest
+
+from . import conftest
+from .conftest import plan_tofu_in_workspace, run_tofu_in_workspace
+from .harness import fake_tofu
+from .harness.checkpoints import Checkpoints, ResumedDestroyError
+from .harness.engine import TofuEngine
+from .harness.golden import DEPENDENCY_LOCK_FILE, GOLDEN_MARKER, module_digest, prepare_golden_dir
+from .harness.prefetch import Prefetch
+from .harness.streaming import TofuError
+from .harness.timing import PhaseTimer
+from .harness.warm_pool import WarmPool, fingerprint
+
+FAKE_TOFU = str(pathlib.Path(fake_tofu.__file__).resolve())
+OUTPUT = {"self_link": "https://www.googleapis.com/compute/v1/projects/test-project/global/networks/fake"}
+PLAN = {"planned_values": {"root_module": {"resources": []}}, "resource_changes": []}
+LIFECYCLE_PHASES = [
+    "workspace-select",
+    "init",
+    "validate",
+    "plan",
+    "apply",
+    "plan-detailed-exitcode",
+    "output",
+]
+
+
+@pytest.fixture
+def fake_tofu_config(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: pathlib.Path,
+) -> Callable[..., Callable[[], list[dict[str, Any]]]]:
+    """Return a function that configures the fake tofu executable, returning a reader of the logged invocations."""
+    log = tmp_path.joinpath("invocations.jsonl")
+
+    def _configure(**config: Any) -> Callable[[], list[dict[str, Any]]]:  # noqa: ANN401
+        config_file = tmp_path.joinpath("fake-tofu.json")
+        config_file.write_text(json.dumps({"outputs": OUTPUT, "plan": PLAN, "log": str(log)} | config))
+        monkeypatch.setenv("TEST_TF_COMMAND", FAKE_TOFU)
+        monkeypatch.setenv(fake_tofu.CONFIG_ENV, str(config_file))
+        return lambda: [json.loads(line) for line in log.read_text().splitlines()] if log.exists() else []
+
+    return _configure
+
+
+@pytest.fixture(autouse=True)
+def engine(monkeypatch: pytest.MonkeyPatch) -> Generator[TofuEngine, None, None]:
+    """Replace the default engine of the conftest helpers with an engine that is private to the test.
+
+    The private engine records to its own timer, so the fake tofu/terraform phases are left out of the session report.
+    """
+    engine = TofuEngine(timer=PhaseTimer())
+    monkeypatch.setattr(conftest, "default_engine", lambda: engine)
+    yield engine
+    engine.close()
+
+
+@pytest.fixture
+def fixture_dir(tmp_path: pathlib.Path) -> pathlib.Path:
+    """Return an empty fixture directory."""
+    fixture_dir = tmp_path.joinpath("fixture")
+    fixture_dir.mkdir()
+    return fixture_dir
+
+
+def test_lifecycle(
+    monkeypatch: pytest.MonkeyPatch,
+    fake_tofu_config: Callable[..., Callable[[], list[dict[str, Any]]]],
+    fixture_dir: pathlib.Path,
+) -> None:
+    """Verify the output is parsed from `output -json` and every phase is executed in order."""
+    monkeypatch.setenv("TEST_SKIP_DESTROY_PHASE", "false")
+    invocations = fake_tofu_config()
+    with run_tofu_in_workspace(fixture=fixture_dir, tfvars={"name": "fake"}, workspace="fake") as output:
+        assert output == OUTPUT
+    assert [invocation["phase"] for invocation in invocations()] == [*LIFECYCLE_PHASES, "destroy", "workspace-default"]
+    assert {invocation["fixture"] for invocation in invocations()} == {fixture_dir.name}
+
+
+def test_skip_destroy(
+    monkeypatch: pytest.MonkeyPatch,
+    fake_tofu_config: Callable[..., Callable[[], list[dict[str, Any]]]],
+    fixture_dir: pathlib.Path,
+) -> None:
+    """Verify resources are not destroyed when the destroy phase is skipped."""
+    monkeypatch.setenv("TEST_SKIP_DESTROY_PHASE", "true")
+    invocations = fake_tofu_config()
+    with run_tofu_in_workspace(fixture=fixture_dir, tfvars={"name": "fake"}, workspace="fake"):
+        pass
+    assert [invocation["phase"] for invocation in invocations()] == [*LIFECYCLE_PHASES, "workspace-default"]
+
+
+def test_failed_test_keeps_resources(
+    monkeypatch: pytest.MonkeyPatch,
+    fake_tofu_config: Callable[..., Callable[[], list[dict[str, Any]]]],
+    fixture_dir: pathlib.Path,
+) -> None:
+    """Verify resources are not destroyed if the caller raises an error, but the workspace is still reset."""
+    monkeypatch.setenv("TEST_SKIP_DESTROY_PHASE", "false")
+    invocations = fake_tofu_config()
+    with (
+        pytest.raises(AssertionError),
+        run_tofu_in_workspace(fixture=fixture_dir, tfvars={"name": "fake"}, workspace="fake"),
+    ):
+        raise AssertionError
+    assert [invocation["phase"] for invocation in invocations()] == [*LIFECYCLE_PHASES, "workspace-default"]
+
+
+def test_detailed_exitcode_failure(
+    fake_tofu_config: Callable[..., Callable[[], list[dict[str, Any]]]],
+    fixture_dir: pathlib.Path,
+) -> None:
+    """Verify changes detected after apply fail the fixture with the tail of the tofu/terraform output."""
+    invocations = fake_tofu_config(
+        fixtures={
+            fixture_dir.name: {
+                "phases": {"plan-detailed-exitcode": {"exit_code": 2, "stderr": "google_compute_network.network"}},
+            },
+        },
+    )
+    with (
+        pytest.raises(TofuError, match=r"google_compute_network\.network") as error,
+        run_tofu_in_workspace(fixture=fixture_dir, tfvars={"name": "fake"}),
+    ):
+        pass
+    assert error.value.returncode == 2  # noqa: PLR2004
+    assert [invocation["phase"] for invocation in invocations()] == [
+        "init",
+        "validate",
+        "plan",
+        "apply",
+        "plan-detailed-exitcode",
+    ]
+
+
+def test_plan_lifecycle(
+    fake_tofu_config: Callable[..., Callable[[], list[dict[str, Any]]]],
+    fixture_dir: pathlib.Path,
+) -> None:
+    """Verify the plan-only tier yields the plan from `show -json` without applying."""
+    invocations = fake_tofu_config()
+    with plan_tofu_in_workspace(fixture=fixture_dir, tfvars={"name": "fake"}) as plan:
+        assert plan == PLAN
+    assert [invocation["phase"] for invocation in invocations()] == [
+        "init",
+        "validate",
+        "plan",
+        "show",
+        "workspace-default",
+    ]
+    assert "-refresh=false" in invocations()[2]["args"]
+
+
+def test_concurrency(
+    fake_tofu_config: Callable[..., Callable[[], list[dict[str, Any]]]],
+    tmp_path: pathlib.Path,
+) -> None:
+    """Verify the engine bounds the number of concurrent tofu/terraform executions and times every phase."""
+    invocations = fake_tofu_config(phases={"apply": {"latency": 0.2}})
+    timer = PhaseTimer()
+    engine = TofuEngine(concurrency=2, timer=timer)
+    fixtures = [tmp_path.joinpath(f"fixture-{i}") for i in range(4)]
+    try:
+        futures = []
+        for fixture in fixtures:
+            fixture.mkdir()
+            futures.append(engine.submit(_apply(engine, fixture)))
+        assert [future.result() for future in futures] == [OUTPUT] * len(fixtures)
+    finally:
+        engine.close()
+    events = sorted(
+        [(invocation["start"], 1) for invocation in invocations()]
+        + [(invocation["end"], -1) for invocation in invocations()],
+    )
+    assert max(itertools.accumulate(delta for _, delta in events)) <= 2  # noqa: PLR2004
+    assert {fixture.name for fixture in fixtures} <= {timing.fixture for timing in timer.timings}
+
+
+async def _apply(engine: TofuEngine, fixture: pathlib.Path) -> dict[str, Any]:
+    async with engine.workspace(FAKE_TOFU, fixture, {"name": fixture.name}, destroy=False) as output:
+        return output
+
+
+@pytest.mark.parametrize("concurrency", [1, 2])
+def test_start_overlaps_applies(
+    fake_tofu_config: Callable[..., Callable[[], list[dict[str, Any]]]],
+    tmp_path: pathlib.Path,
+    concurrency: int,
+) -> None:
+    """Verify the applies of started lifecycles overlap while each is waited on in turn, unless the engine is serial."""
+    invocations = fake_tofu_config(phases={"apply": {"latency": 0.3}})
+    engine = TofuEngine(concurrency=concurrency, timer=PhaseTimer())
+    fixtures = [tmp_path.joinpath(f"fixture-{i}") for i in range(2)]
+    try:
+        pending = []
+        for fixture in fixtures:
+            fixture.mkdir()
+            pending.append(engine.start(FAKE_TOFU, fixture, {"name": fixture.name}, destroy=False))
+        for lifecycle in pending:
+            with lifecycle as output:
+                assert output == OUTPUT
+    finally:
+        engine.close()
+    applies = [invocation for invocation in invocations() if invocation["phase"] == "apply"]
+    assert len(applies) == len(fixtures)
+    overlapping = max(apply["start"] for apply in applies) < min(apply["end"] for apply in applies)
+    assert overlapping == (concurrency > 1)
+
+
+def test_run_tofu_in_workspace_claims_prefetch(
+    monkeypatch: pytest.MonkeyPatch,
+    fake_tofu_config: Callable[..., Callable[[], list[dict[str, Any]]]],
+    engine: TofuEngine,
+    fixture_dir: pathlib.Path,
+    tmp_path: pathlib.Path,
+) -> None:
+    """Verify a prefetched lifecycle is claimed by a fixture of the same name and input vars, and not started again."""
+    monkeypatch.setenv("TEST_SKIP_DESTROY_PHASE", "false")
+    invocations = fake_tofu_config()
+    prefetch = Prefetch()
+    monkeypatch.setattr(conftest, "default_prefetch", lambda: prefetch)
+    prefetch.add(fixture_dir, {"name": "fake"}, engine.start(FAKE_TOFU, fixture_dir, {"name": "fake"}))
+    clone = tmp_path.joinpath("clone", fixture_dir.name)
+    clone.mkdir(parents=True)
+    with run_tofu_in_workspace(fixture=clone, tfvars={"name": "fake"}) as output:
+        assert output == OUTPUT
+    assert [invocation["phase"] for invocation in invocations()] == [
+        *LIFECYCLE_PHASES[1:],
+        "destroy",
+        "workspace-default",
+    ]
+    assert prefetch.claim(fixture_dir, {"name": "fake"}) is None
+
+
+def test_prefetch_close(
+    monkeypatch: pytest.MonkeyPatch,
+    fake_tofu_config: Callable[..., Callable[[], list[dict[str, Any]]]],
+    engine: TofuEngine,
+    fixture_dir: pathlib.Path,
+) -> None:
+    """Verify lifecycles that are not claimed are destroyed, and ones started with other input vars are not claimed."""
+    monkeypatch.setenv("TEST_SKIP_DESTROY_PHASE", "false")
+    invocations = fake_tofu_config()
+    prefetch = Prefetch()
+    prefetch.add(fixture_dir, {"name": "fake"}, engine.start(FAKE_TOFU, fixture_dir, {"name": "fake"}))
+    assert prefetch.claim(fixture_dir, {"name": "other"}) is None
+    prefetch.close()
+    assert [invocation["phase"] for invocation in invocations()] == [
+        *LIFECYCLE_PHASES[1:],
+        "destroy",
+        "workspace-default",
+    ]
+
+
+def test_golden_dir_initialized_once(
+    fake_tofu_config: Callable[..., Callable[[], list[dict[str, Any]]]],
+    tmp_path: pathlib.Path,
+) -> None:
+    """Verify the golden directory is initialized without a backend once per module digest."""
+    invocations = fake_tofu_config()
+    module_dir = tmp_path.joinpath("module")
+    module_dir.mkdir()
+    module_dir.joinpath("main.tf").write_text("terraform {}\n")
+    for _ in range(2):
+        golden_dir = prepare_golden_dir(
+            cache_dir=tmp_path.joinpath("cache"),
+            module_dir=module_dir,
+            tf_command=FAKE_TOFU,
+            ignore=lambda *_: set(),
+        )
+    assert golden_dir.joinpath(GOLDEN_MARKER).exists()
+    assert [(invocation["phase"], invocation["args"]) for invocation in invocations()] == [
+        ("init", ["init", "-no-color", "-input=false", "-backend=false"]),
+    ]
+
+
+def test_module_digest_lock_file(tmp_path: pathlib.Path) -> None:
+    """Verify the module digest changes with the dependency lock file."""
+    tmp_path.joinpath("main.tf").write_text("terraform {}\n")
+    digest = module_digest(tmp_path)
+    tmp_path.joinpath(DEPENDENCY_LOCK_FILE).write_text('provider "registry.opentofu.org/hashicorp/google" {}\n')
+    assert module_digest(tmp_path) != digest
+
+
+@pytest.mark.parametrize(
+    ("args", "expected"),
+    [
+        (["workspace", "select", "-or-create", "fake"], "workspace-select"),
+        (["workspace", "select", "default"], "workspace-default"),
+        (["plan", "-no-color", "-detailed-exitcode"], "plan-detailed-exitcode"),
+        (["output", "-json"], "output"),
+    ],
+)
+def test_phase_name(args: list[str], expected: str) -> None:
+    """Verify invocations are named as the engine times them."""
+    assert fake_tofu.phase_name(args) == expected
+
+
+@pytest.mark.parametrize("mode", ["background", "session"])
+def test_deferred_destroy(
+    fake_tofu_config: Callable[..., Callable[[], list[dict[str, Any]]]],
+    fixture_dir: pathlib.Path,
+    mode: str,
+) -> None:
+    """Verify the fixture returns before its destroy finishes, and the destroy is completed when drained."""
+    invocations = fake_tofu_config(phases={"destroy": {"latency": 0.5}})
+    engine = TofuEngine(timer=PhaseTimer(), deferred_destroy=mode)
+    try:
+        with engine.lifecycle(FAKE_TOFU, fixture_dir, {"name": "fake"}) as output:
+            assert output == OUTPUT
+        assert [invocation["phase"] for invocation in invocations()] == LIFECYCLE_PHASES[1:]
+        assert engine.drain() == []
+        assert [invocation["phase"] for invocation in invocations()] == [
+            *LIFECYCLE_PHASES[1:],
+            "destroy",
+            "workspace-default",
+        ]
+        assert engine.drain() == []
+    finally:
+        engine.close()
+
+
+def test_deferred_destroy_failure(
+    fake_tofu_config: Callable[..., Callable[[], list[dict[str, Any]]]],
+    fixture_dir: pathlib.Path,
+) -> None:
+    """Verify a failed deferred destroy is returned by drain, after the workspace is reset."""
+    invocations = fake_tofu_config(phases={"destroy": {"exit_code": 1, "stderr": "Error waiting for Deleting Router"}})
+    engine = TofuEngine(timer=PhaseTimer(), deferred_destroy="session")
+    try:
+        with engine.lifecycle(FAKE_TOFU, fixture_dir, {"name": "fake"}):
+            pass
+        errors = engine.drain()
+    finally:
+        engine.close()
+    assert [type(error) for error in errors] == [TofuError]
+    assert "Deleting Router" in str(errors[0])
+    assert [invocation["phase"] for invocation in invocations()][-2:] == ["destroy", "workspace-default"]
+
+
+def test_close_raises_deferred_destroy_failure(
+    fake_tofu_config: Callable[..., Callable[[], list[dict[str, Any]]]],
+    fixture_dir: pathlib.Path,
+) -> None:
+    """Verify closing the engine raises the errors of deferred destroys that were not drained."""
+    fake_tofu_config(phases={"destroy": {"exit_code": 1, "stderr": "Error waiting for Deleting Router"}})
+    engine = TofuEngine(timer=PhaseTimer(), deferred_destroy="session")
+    with engine.lifecycle(FAKE_TOFU, fixture_dir, {"name": "fake"}):
+        pass
+    with pytest.raises(ExceptionGroup, match="deferred destroys failed") as error:
+        engine.close()
+    assert [type(e) for e in error.value.exceptions] == [TofuError]
+    engine.close()
+
+
+def test_warm_pool(
+    fake_tofu_config: Callable[..., Callable[[], list[dict[str, Any]]]],
+    tmp_path: pathlib.Path,
+) -> None:
+    """Verify a fixture left applied with the same inputs is reused after a refresh, and forgotten when destroyed."""
+    invocations = fake_tofu_config()
+    pool = WarmPool(tmp_path.joinpath("pool"))
+    engine = TofuEngine(timer=PhaseTimer(), warm_pool=pool)
+    fixtures = [tmp_path.joinpath(f"fixture-{i}") for i in range(3)]
+    for fixture in fixtures:
+        fixture.mkdir()
+    try:
+        with engine.lifecycle(FAKE_TOFU, fixtures[0], {"name": "fake"}, destroy=False) as output:
+            assert output == OUTPUT
+        assert fingerprint(fixtures[0], {"name": "fake"}) in pool
+        assert fingerprint(fixtures[0], {"name": "other"}) not in pool
+        with engine.lifecycle(FAKE_TOFU, fixtures[1], {"name": "fake"}) as output:
+            assert output == OUTPUT
+        assert [invocation["phase"] for invocation in invocations() if invocation["fixture"] == fixtures[1].name] == [
+            "init",
+            "validate",
+            "warm-refresh",
+            "output",
+            "destroy",
+            "workspace-default",
+        ]
+        assert fingerprint(fixtures[1], {"name": "fake"}) not in pool
+        with engine.lifecycle(FAKE_TOFU, fixtures[2], {"name": "fake"}, destroy=False):
+            pass
+        assert "warm-refresh" not in [
+            invocation["phase"] for invocation in invocations() if invocation["fixture"] == fixtures[2].name
+        ]
+    finally:
+        engine.close()
+
+
+def test_fingerprint_http_backend(tmp_path: pathlib.Path) -> None:
+    """Verify the fingerprint ignores the port of the http state server, but not the name of the state."""
+
+    def _fixture(name: str, port: int, state: str) -> pathlib.Path:
+        fixture = tmp_path.joinpath(name)
+        fixture.mkdir()
+        fixture.joinpath("main.tf").write_text("terraform {}\n")
+        fixture.joinpath("_backend.tf").write_text(
+            f'terraform {{\n  backend "http" {{\n    address = "http://127.0.0.1:{port}/state/{state}"\n  }}\n}}',
+        )
+        return fixture
+
+    key = fingerprint(_fixture("fixture", 40001, "fake"), {"name": "fake"})
+    assert fingerprint(_fixture("other-port", 40002, "fake"), {"name": "fake"}) == key
+    assert fingerprint(_fixture("other-state", 40001, "nat"), {"name": "fake"}) != key
+
+
+def test_warm_pool_drift(
+    fake_tofu_config: Callable[..., Callable[[], list[dict[str, Any]]]],
+    fixture_dir: pathlib.Path,
+    tmp_path: pathlib.Path,
+) -> None:
+    """Verify a fixture whose resources drifted is planned and applied again, without initializing twice.
+
+    The checkpoint of the previous session must not let the fixture resume after apply, and is removed on success.
+    """
+    invocations = fake_tofu_config(phases={"warm-refresh": {"exit_code": 2}})
+    key = fingerprint(fixture_dir, {"name": "fake"})
+    pool = WarmPool(tmp_path.joinpath("pool"))
+    pool.add(key, fixture_dir)
+    checkpoints = Checkpoints(tmp_path.joinpath("checkpoints"), resume=True)
+    for phase in ["apply", "plan-detailed-exitcode"]:
+        checkpoints.complete(key, fixture_dir, phase)
+    engine = TofuEngine(timer=PhaseTimer(), warm_pool=pool, checkpoints=checkpoints)
+    try:
+        with engine.lifecycle(FAKE_TOFU, fixture_dir, {"name": "fake"}, destroy=False) as output:
+            assert output == OUTPUT
+    finally:
+        engine.close()
+    assert [invocation["phase"] for invocation in invocations()] == [
+        "init",
+        "validate",
+        "warm-refresh",
+        *LIFECYCLE_PHASES[3:],
+        "workspace-default",
+    ]
+    assert key in pool
+    assert checkpoints.completed(key) == []
+
+
+@pytest.mark.parametrize("resume", [True, False])
+def test_resume(
+    fake_tofu_config: Callable[..., Callable[[], list[dict[str, Any]]]],
+    tmp_path: pathlib.Path,
+    resume: bool,  # noqa: FBT001
+) -> None:
+    """Verify a fixture whose idempotency plan failed resumes after apply, and restarts if not resuming."""
+    fixtures = [tmp_path.joinpath(f"fixture-{i}") for i in range(2)]
+    for fixture in fixtures:
+        fixture.mkdir()
+    key = fingerprint(fixtures[0], {"name": "fake"})
+    fake_tofu_config(phases={"plan-detailed-exitcode": {"exit_code": 1}})
+    engine = TofuEngine(timer=PhaseTimer(), checkpoints=Checkpoints(tmp_path.joinpath("checkpoints"), resume=resume))
+    try:
+        with pytest.raises(TofuError), engine.lifecycle(FAKE_TOFU, fixtures[0], {"name": "fake"}):
+            pass
+        assert json.loads(tmp_path.joinpath("checkpoints", f"{key}.json").read_text())["completed"] == ["apply"]
+        invocations = fake_tofu_config()
+        with engine.lifecycle(FAKE_TOFU, fixtures[1], {"name": "fake"}) as output:
+            assert output == OUTPUT
+    finally:
+        engine.close()
+    resumed = [invocation["phase"] for invocation in invocations() if invocation["fixture"] == fixtures[1].name]
+    assert resumed == (
+        ["init", "validate", "plan-detailed-exitcode", "output", "destroy", "workspace-default"]
+        if resume
+        else [*LIFECYCLE_PHASES[1:], "destroy", "workspace-default"]
+    )
+    assert not tmp_path.joinpath("checkpoints", f"{key}.json").exists()
+
+
+def test_resume_plan_changes(
+    fake_tofu_config: Callable[..., Callable[[], list[dict[str, Any]]]],
+    tmp_path: pathlib.Path,
+) -> None:
+    """Verify a fixture whose idempotency plan has changes is applied again when resuming, instead of planned again."""
+    fixtures = [tmp_path.joinpath(f"fixture-{i}") for i in range(2)]
+    for fixture in fixtures:
+        fixture.mkdir()
+    key = fingerprint(fixtures[0], {"name": "fake"})
+    fake_tofu_config(phases={"plan-detailed-exitcode": {"exit_code": 2}})
+    engine = TofuEngine(timer=PhaseTimer(), checkpoints=Checkpoints(tmp_path.joinpath("checkpoints"), resume=True))
+    try:
+        with pytest.raises(TofuError), engine.lifecycle(FAKE_TOFU, fixtures[0], {"name": "fake"}):
+            pass
+        assert not tmp_path.joinpath("checkpoints", f"{key}.json").exists()
+        invocations = fake_tofu_config()
+        with engine.lifecycle(FAKE_TOFU, fixtures[1], {"name": "fake"}) as output:
+            assert output == OUTPUT
+    finally:
+        engine.close()
+    assert [invocation["phase"] for invocation in invocations() if invocation["fixture"] == fixtures[1].name] == [
+        *LIFECYCLE_PHASES[1:],
+        "destroy",
+        "workspace-default",
+    ]
+
+
+def test_resume_destroy(
+    fake_tofu_config: Callable[..., Callable[[], list[dict[str, Any]]]],
+    tmp_path: pathlib.Path,
+) -> None:
+    """Verify a fixture that was verified but failed to destroy resumes straight to the destroy, and is then skipped."""
+    fixtures = [tmp_path.joinpath(f"fixture-{i}") for i in range(2)]
+    for fixture in fixtures:
+        fixture.mkdir()
+    key = fingerprint(fixtures[0], {"name": "fake"})
+    fake_tofu_config(phases={"destroy": {"exit_code": 1}})
+    engine = TofuEngine(timer=PhaseTimer(), checkpoints=Checkpoints(tmp_path.joinpath("checkpoints"), resume=True))
+    try:
+        with pytest.raises(TofuError), engine.lifecycle(FAKE_TOFU, fixtures[0], {"name": "fake"}):
+            pass
+        assert json.loads(tmp_path.joinpath("checkpoints", f"{key}.json").read_text())["completed"] == [
+            "apply",
+            "plan-detailed-exitcode",
+            "verify",
+        ]
+        invocations = fake_tofu_config()
+        with pytest.raises(ResumedDestroyError), engine.lifecycle(FAKE_TOFU, fixtures[1], {"name": "fake"}):
+            pass
+    finally:
+        engine.close()
+    assert [invocation["phase"] for invocation in invocations() if invocation["fixture"] == fixtures[1].name] == [
+        "init",
+        "validate",
+        "destroy",
+        "workspace-default",
+    ]
+    assert not tmp_path.joinpath("checkpoints", f"{key}.json").exists()
+
+
+def test_run_tofu_in_workspace_resumed_destroy(
+    fake_tofu_config: Callable[..., Callable[[], list[dict[str, Any]]]],
+    engine: TofuEngine,
+    fixture_dir: pathlib.Path,
+    tmp_path: pathlib.Path,
+) -> None:
+    """Verify the fixture of a resumed destroy is skipped rather than yielding output to the tests."""
+    fake_tofu_config()
+    engine.checkpoints = Checkpoints(tmp_path.joinpath("checkpoints"), resume=True)
+    for phase in ["apply", "plan-detailed-exitcode", "verify"]:
+        engine.checkpoints.complete(fingerprint(fixture_dir, {"name": "fake"}), fixture_dir, phase)
+    with (
+        pytest.raises(pytest.skip.Exception, match="failed to destroy"),
+        conftest.run_tofu_in_workspace(fixture=fixture_dir, tfvars={"name": "fake"}),
+    ):
+        pass
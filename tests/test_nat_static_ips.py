@@ -0,0 +1,275 @@
+"""Test fixture for dual-region deployment with Cloud NAT using static addresses in one region."""
+
+import ipaddress
+import pathlib
+from collections.abc import Callable, Generator
+from typing import Any
+
+import pytest
+
+from .conftest import run_tofu_in_workspace
+from .harness.snapshot import ComputeSnapshot
+
+FIXTURE_NAME = "nat-static-ips"
+FIXTURE_LABELS = {
+    "fixture": FIXTURE_NAME,
+}
+
+
+@pytest.fixture(scope="module")
+def fixture_name(prefix: str) -> str:
+    """Return the name to use for resources in this module."""
+    return f"{prefix}-{FIXTURE_NAME}"
+
+
+@pytest.fixture(scope="module")
+def fixture_labels(labels: dict[str, str]) -> dict[str, str] | None:
+    """Return a dict of labels for this test module."""
+    return FIXTURE_LABELS | labels
+
+
+def fixture_tfvars(project_id: str, prefix: str, labels: dict[str, str]) -> dict[str, Any]:
+    """Return the input vars suitable for this fixture, from session fixtures so that it can be prefetched."""
+    return {
+        "project_id": project_id,
+        "name": f"{prefix}-{FIXTURE_NAME}",
+        "regions": [
+            "us-west1",
+            "us-east1",
+        ],
+        "nat": {
+            "static_ips": {
+                "us-west1": 2,
+            },
+        },
+        "labels": FIXTURE_LABELS | labels,
+    }
+
+
+@pytest.fixture(scope="module")
+def output(
+    root_fixture_dir: Callable[[str], pathlib.Path],
+    project_id: str,
+    prefix: str,
+    labels: dict[str, str],
+) -> Generator[dict[str, Any], None, None]:
+    """Execute Tofu (or Terraform) with the input vars suitable for this fixture, yielding the module output."""
+    with run_tofu_in_workspace(
+        fixture=root_fixture_dir(FIXTURE_NAME),
+        tfvars=fixture_tfvars(project_id, prefix, labels),
+    ) as output:
+        yield output
+
+
+@pytest.fixture(scope="module")
+def snapshot(
+    compute_snapshot: Callable[[str, dict[str, Any]], ComputeSnapshot],
+    output: dict[str, Any],
+    fixture_name: str,
+) -> ComputeSnapshot:
+    """Return a snapshot of the network and associated resources, fetched once after the fixture is applied."""
+    return compute_snapshot(fixture_name, output)
+
+
+def test_output_values(output: dict[str, Any], project_id: str, fixture_name: str) -> None:
+    """Verify the output values match expectations; static NAT addresses are verified separately."""
+    assert {k: v for k, v in output.items() if k != "nat_addresses"} == {
+        "self_link": f"https://www.googleapis.com/compute/v1/projects/{project_id}/global/networks/{fixture_name}",
+        "id": f"projects/{project_id}/global/networks/{fixture_name}",
+        "subnets_by_name": {
+            f"{fixture_name}-us-we1": {
+                "region": "us-west1",
+                "self_link": f"https://www.googleapis.com/compute/v1/projects/{project_id}/regions/us-west1/subnetworks/{fixture_name}-us-we1",
+                "id": f"projects/{project_id}/regions/us-west1/subnetworks/{fixture_name}-us-we1",
+                "primary_ipv4_cidr": "172.16.0.0/24",
+                "primary_ipv6_cidr": "",
+                "secondary_ipv4_cidrs": {},
+                "gateway_address": "172.16.0.1",
+            },
+            f"{fixture_name}-us-ea1": {
+                "region": "us-east1",
+                "self_link": f"https://www.googleapis.com/compute/v1/projects/{project_id}/regions/us-east1/subnetworks/{fixture_name}-us-ea1",
+                "id": f"projects/{project_id}/regions/us-east1/subnetworks/{fixture_name}-us-ea1",
+                "primary_ipv4_cidr": "172.16.1.0/24",
+                "primary_ipv6_cidr": "",
+                "secondary_ipv4_cidrs": {},
+                "gateway_address": "172.16.1.1",
+            },
+        },
+        "subnets_by_region": {
+            "us-west1": {
+                "name": f"{fixture_name}-us-we1",
+                "self_link": f"https://www.googleapis.com/compute/v1/projects/{project_id}/regions/us-west1/subnetworks/{fixture_name}-us-we1",
+                "id": f"projects/{project_id}/regions/us-west1/subnetworks/{fixture_name}-us-we1",
+                "primary_ipv4_cidr": "172.16.0.0/24",
+                "primary_ipv6_cidr": "",
+                "secondary_ipv4_cidrs": {},
+                "gateway_address": "172.16.0.1",
+            },
+            "us-east1": {
+                "name": f"{fixture_name}-us-ea1",
+                "self_link": f"https://www.googleapis.com/compute/v1/projects/{project_id}/regions/us-east1/subnetworks/{fixture_name}-us-ea1",
+                "id": f"projects/{project_id}/regions/us-east1/subnetworks/{fixture_name}-us-ea1",
+                "primary_ipv4_cidr": "172.16.1.0/24",
+                "primary_ipv6_cidr": "",
+                "secondary_ipv4_cidrs": {},
+                "gateway_address": "172.16.1.1",
+            },
+        },
+    }
+
+
+def test_network(snapshot: ComputeSnapshot, project_id: str, fixture_name: str) -> None:
+    """Verify the network exists and matches expectations."""
+    result = snapshot.network
+    assert result
+    assert not result.auto_create_subnetworks
+    assert result.description == "custom vpc"
+    assert not result.enable_ula_internal_ipv6
+    assert result.mtu == 1460  # noqa: PLR2004
+    assert result.name == fixture_name
+    assert not result.peerings
+    assert result.routing_config.routing_mode == "GLOBAL"
+    assert result.subnetworks
+    for subnetwork in result.subnetworks:
+        assert subnetwork in [
+            f"https://www.googleapis.com/compute/v1/projects/{project_id}/regions/us-west1/subnetworks/{fixture_name}-us-we1",
+            f"https://www.googleapis.com/compute/v1/projects/{project_id}/regions/us-east1/subnetworks/{fixture_name}-us-ea1",
+        ]
+
+
+def test_subnetwork_us_west1(
+    snapshot: ComputeSnapshot,
+    project_id: str,
+    fixture_name: str,
+) -> None:
+    """Verify the subnetwork exists and matches expectations."""
+    result = snapshot.subnetworks[f"{fixture_name}-us-we1"]
+    assert result
+    assert not result.description
+    assert not result.enable_flow_logs
+    assert not result.external_ipv6_prefix
+    assert not result.internal_ipv6_prefix
+    assert result.ip_cidr_range == "172.16.0.0/24"
+    assert not result.ipv6_cidr_range
+    assert not result.log_config.enable
+    assert result.name == f"{fixture_name}-us-we1"
+    assert (
+        result.network == f"https://www.googleapis.com/compute/v1/projects/{project_id}/global/networks/{fixture_name}"
+    )
+    assert result.private_ip_google_access
+    assert result.private_ipv6_google_access == "DISABLE_GOOGLE_ACCESS"
+    assert result.purpose == "PRIVATE"
+    assert result.region == f"https://www.googleapis.com/compute/v1/projects/{project_id}/regions/us-west1"
+    assert not result.role
+    assert not result.secondary_ip_ranges
+    assert result.stack_type == "IPV4_ONLY"
+    assert not result.state
+
+
+def test_subnetwork_us_east1(
+    snapshot: ComputeSnapshot,
+    project_id: str,
+    fixture_name: str,
+) -> None:
+    """Verify the subnetwork exists and matches expectations."""
+    result = snapshot.subnetworks[f"{fixture_name}-us-ea1"]
+    assert result
+    assert not result.description
+    assert not result.enable_flow_logs
+    assert not result.external_ipv6_prefix
+    assert not result.internal_ipv6_prefix
+    assert result.ip_cidr_range == "172.16.1.0/24"
+    assert not result.ipv6_cidr_range
+    assert not result.log_config.enable
+    assert result.name == f"{fixture_name}-us-ea1"
+    assert (
+        result.network == f"https://www.googleapis.com/compute/v1/projects/{project_id}/global/networks/{fixture_name}"
+    )
+    assert result.private_ip_google_access
+    assert result.private_ipv6_google_access == "DISABLE_GOOGLE_ACCESS"
+    assert result.purpose == "PRIVATE"
+    assert result.region == f"https://www.googleapis.com/compute/v1/projects/{project_id}/regions/us-east1"
+    assert not result.role
+    assert not result.secondary_ip_ranges
+    assert result.stack_type == "IPV4_ONLY"
+    assert not result.state
+
+
+def test_routes(snapshot: ComputeSnapshot, project_id: str, fixture_name: str) -> None:
+    """Verify the routes meet expectations."""
+    routes = snapshot.routes
+    default_routes = [route for route in routes if route.dest_range in ["0.0.0.0/0", "::/0"] and not route.tags]
+    assert len(default_routes) == 0
+    restricted_apis_routes = [route for route in routes if route.dest_range == "199.36.153.4/30"]
+    assert len(restricted_apis_routes) == 1
+    for route in restricted_apis_routes:
+        assert route.name == f"{fixture_name}-restricted-apis"
+        assert route.description == "Route for restricted Google API access"
+        assert (
+            route.next_hop_gateway
+            == f"https://www.googleapis.com/compute/v1/projects/{project_id}/global/gateways/default-internet-gateway"
+        )
+        assert route.priority == 1000  # noqa: PLR2004
+    private_apis_routes = [route for route in routes if route.dest_range == "199.36.153.8/30"]
+    assert len(private_apis_routes) == 0
+    tagged_routes = [route for route in routes if route.tags]
+    assert len(tagged_routes) == 0
+
+
+def test_nat_addresses(output: dict[str, Any], project_id: str, fixture_name: str) -> None:
+    """Verify static NAT addresses are only reserved in us-west1."""
+    nat_addresses = output["nat_addresses"]
+    assert list(nat_addresses.keys()) == ["us-west1"]
+    assert [address["name"] for address in nat_addresses["us-west1"]] == [
+        f"{fixture_name}-us-we1-0",
+        f"{fixture_name}-us-we1-1",
+    ]
+    for address in nat_addresses["us-west1"]:
+        assert ipaddress.IPv4Address(address["address"]).is_global
+        assert (
+            address["self_link"]
+            == f"https://www.googleapis.com/compute/v1/projects/{project_id}/regions/us-west1/addresses/{address['name']}"
+        )
+
+
+def test_routers_us_west1(snapshot: ComputeSnapshot, output: dict[str, Any], fixture_name: str) -> None:
+    """Verify the router and NAT meets requirements; the NAT uses the static addresses."""
+    routers = snapshot.routers["us-west1"]
+    assert len(routers) == 1
+    for router in routers:
+        assert router.name == f"{fixture_name}-us-we1"
+        assert len(router.nats) == 1
+        for nat in router.nats:
+            assert nat.name == f"{fixture_name}-us-we1"
+            assert not nat.log_config.enable
+            assert nat.log_config.filter == "ALL"
+            assert nat.nat_ip_allocate_option == "MANUAL_ONLY"
+            assert sorted(nat.nat_ips) == sorted(
+                address["self_link"] for address in output["nat_addresses"]["us-west1"]
+            )
+
+
+def test_routers_us_east1(snapshot: ComputeSnapshot, fixture_name: str) -> None:
+    """Verify the router and NAT meets requirements."""
+    routers = snapshot.routers["us-east1"]
+    assert len(routers) == 1
+    for router in routers:
+        assert router.name == f"{fixture_name}-us-ea1"
+        assert len(router.nats) == 1
+        for nat in router.nats:
+            assert nat.name == f"{fixture_name}-us-ea1"
+            assert not nat.log_config.enable
+            assert nat.log_config.filter == "ALL"
+            assert nat.nat_ip_allocate_option == "AUTO_ONLY"
+            assert not nat.nat_ips
+
+
+def test_psc(
+    snapshot: ComputeSnapshot,
+) -> None:
+    """Verify PSC meets requirements."""
+    global_addresses = snapshot.global_addresses
+    assert len(global_addresses) == 0
+    global_forwarding_rules = snapshot.global_forwarding_rules
+    assert len(global_forwarding_rules) == 0
@@ -0,0 +1,122 @@
+"""Verify the interval-index overlap detector used before fixtures are planned."""
+
+import pathlib
+
+import pytest
+
+from .harness.engine import TofuEngine
+from .harness.overlaps import Interval, OverlapError, check_tfvars, find_overlaps, parse_existing_cidrs
+from .harness.timing import PhaseTimer
+
+REGIONS = [
+    "us-west1",
+    "us-east1",
+]
+
+
+def test_find_overlaps() -> None:
+    """Verify every overlapping pair is reported, including nested and adjacent ranges."""
+    a = Interval.from_cidr("10.0.0.0/16", "a")
+    b = Interval.from_cidr("10.0.1.0/24", "b")
+    c = Interval.from_cidr("10.0.2.0/24", "c")
+    d = Interval.from_cidr("10.1.0.0/16", "d")
+    e = Interval.from_cidr("10.0.2.128/25", "e")
+    assert find_overlaps([d, c, e, b, a]) == [(a, b), (a, c), (a, e), (c, e)]
+
+
+def test_find_overlaps_none() -> None:
+    """Verify disjoint ranges have no overlaps."""
+    assert not find_overlaps(Interval.from_cidr(f"10.{i}.0.0/16", str(i)) for i in range(256))
+
+
+def test_interval_cidr() -> None:
+    """Verify intervals round-trip to CIDR notation."""
+    assert Interval.from_cidr("10.1.2.3/16", "test").cidr == "10.1.0.0/16"
+
+
+def test_parse_existing_cidrs() -> None:
+    """Verify existing ranges can be labelled."""
+    assert parse_existing_cidrs(" shared=10.0.0.0/8, 192.168.0.0/16 ,") == [
+        Interval.from_cidr("10.0.0.0/8", "shared"),
+        Interval.from_cidr("192.168.0.0/16", "existing 192.168.0.0/16"),
+    ]
+    assert parse_existing_cidrs(None) == []
+
+
+def test_check_tfvars() -> None:
+    """Verify the GKE fixture allocation has no overlaps."""
+    check_tfvars(
+        {
+            "regions": REGIONS,
+            "cidrs": {
+                "secondaries": {
+                    "pods": {
+                        "ipv4_cidr": "10.0.0.0/8",
+                        "ipv4_subnet_size": 16,
+                    },
+                    "services": {
+                        "ipv4_cidr": "10.100.0.0/16",
+                    },
+                },
+            },
+        },
+        parse_existing_cidrs("other=192.168.0.0/16"),
+    )
+
+
+def test_check_tfvars_secondary_overlaps_primary() -> None:
+    """Verify a secondary range within the primary CIDR is reported for every affected region."""
+    with pytest.raises(OverlapError) as e:
+        check_tfvars(
+            {
+                "name": "test",
+                "regions": REGIONS,
+                "cidrs": {
+                    "primary_ipv4_cidr": "10.0.0.0/8",
+                    "primary_ipv4_subnet_size": 16,
+                    "secondaries": {
+                        "pods": {
+                            "ipv4_cidr": "10.1.0.0/16",
+                        },
+                    },
+                },
+            },
+        )
+    assert [(a.label, b.label) for a, b in e.value.overlaps] == [
+        ("test-us-we1 pods", "test-us-ea1 primary"),
+        ("test-us-ea1 primary", "test-us-ea1 pods"),
+    ]
+
+
+def test_check_tfvars_zero_step() -> None:
+    """Verify a zero step is reported as overlapping primary ranges."""
+    with pytest.raises(OverlapError, match=r"test-us-ea1 primary \(172.16.0.0/24\) overlaps test-us-we1 primary"):
+        check_tfvars(
+            {
+                "name": "test",
+                "regions": REGIONS,
+                "cidrs": {
+                    "primary_ipv4_subnet_step": 0,
+                },
+            },
+        )
+
+
+def test_check_tfvars_existing() -> None:
+    """Verify overlaps with existing ranges are reported, but not overlaps between existing ranges."""
+    existing = parse_existing_cidrs("peer=172.16.1.0/24,a=192.168.0.0/16,b=192.168.1.0/24")
+    with pytest.raises(OverlapError) as e:
+        check_tfvars({"name": "test", "regions": REGIONS}, existing)
+    assert [(a.label, b.label) for a, b in e.value.overlaps] == [("peer", "test-us-ea1 primary")]
+
+
+def test_engine_check_overlaps(tmp_path: pathlib.Path) -> None:
+    """Verify the engine records the overlap check as a fixture phase."""
+    timer = PhaseTimer()
+    engine = TofuEngine(timer=timer, existing_ranges=parse_existing_cidrs("peer=172.16.0.0/16"))
+    try:
+        with pytest.raises(OverlapError):
+            engine.check_overlaps(tmp_path, {"regions": REGIONS})
+    finally:
+        engine.close()
+    assert [(t.fixture, t.phase, t.succeeded) for t in timer.timings] == [(tmp_path.name, "overlap-check", False)]
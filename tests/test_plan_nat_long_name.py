@@ -0,0 +1,87 @@
+"""Plan-only test fixture for static NAT addresses with a maximum length name in regions that share a prefix.
+
+These tests assert against the saved plan and do not create any resources; with TEST_TF_OFFLINE enabled and a populated
+provider plugin cache they can be executed without network access.
+"""
+
+import pathlib
+from collections.abc import Callable, Generator
+from typing import Any
+
+import pytest
+
+from .conftest import plan_tofu_in_workspace
+from .harness.plans import planned_resources
+
+pytestmark = pytest.mark.plan
+
+FIXTURE_NAME = "plan-nat-long-name"
+FIXTURE_LABELS = {
+    "fixture": FIXTURE_NAME,
+}
+MAX_NAME_LENGTH = 55
+MAX_RESOURCE_NAME_LENGTH = 63
+STATIC_IPS = {
+    "us-west1": 2,
+    "us-west2": 11,
+}
+
+
+@pytest.fixture(scope="module")
+def fixture_name(prefix: str) -> str:
+    """Return the name to use for resources in this module, padded to the maximum length of the name variable."""
+    return f"{prefix}-{FIXTURE_NAME}-".ljust(MAX_NAME_LENGTH, "x")[:MAX_NAME_LENGTH]
+
+
+@pytest.fixture(scope="module")
+def fixture_labels(labels: dict[str, str]) -> dict[str, str] | None:
+    """Return a dict of labels for this test module."""
+    return FIXTURE_LABELS | labels
+
+
+@pytest.fixture(scope="module")
+def plan(
+    plan_fixture_dir: Callable[[str], pathlib.Path],
+    project_id: str,
+    fixture_name: str,
+    fixture_labels: dict[str, str],
+) -> Generator[dict[str, Any], None, None]:
+    """Execute the Tofu (or Terraform) plan-only tier with the input vars for this fixture, yielding the plan."""
+    with plan_tofu_in_workspace(
+        fixture=plan_fixture_dir(FIXTURE_NAME),
+        tfvars={
+            "project_id": project_id,
+            "name": fixture_name,
+            "regions": list(STATIC_IPS.keys()),
+            "nat": {
+                "static_ips": STATIC_IPS,
+            },
+            "labels": fixture_labels,
+        },
+    ) as plan:
+        yield plan
+
+
+def test_nat_addresses(plan: dict[str, Any], fixture_name: str) -> None:
+    """Verify each region reserves its own addresses, with names truncated from the name variable only."""
+    addresses = {
+        values["name"]: values["region"]
+        for address, values in planned_resources(plan).items()
+        if address.startswith("google_compute_address.nat[")
+    }
+    expected = {}
+    for region, abbreviation in [("us-west1", "us-we1"), ("us-west2", "us-we2")]:
+        for i in range(STATIC_IPS[region]):
+            suffix = f"-{abbreviation}-{i}"
+            expected[fixture_name[: MAX_RESOURCE_NAME_LENGTH - len(suffix)] + suffix] = region
+    assert addresses == expected
+    for name in addresses:
+        assert len(name) <= MAX_RESOURCE_NAME_LENGTH, name
+
+
+def test_nat_ips(plan: dict[str, Any]) -> None:
+    """Verify the NAT of each region uses manually allocated static addresses."""
+    resources = planned_resources(plan)
+    for region in STATIC_IPS:
+        nat = resources[f'google_compute_router_nat.nat["{region}"]']
+        assert nat["nat_ip_allocate_option"] == "MANUAL_ONLY"
@@ -0,0 +1,233 @@
+"""Plan-only test fixture for dual-region deployment with secondary ranges, tagged Cloud NAT, and PSC.
+
+These tests assert against the saved plan and do not create any resources; with TEST_TF_OFFLINE enabled and a populated
+provider plugin cache they can be executed without network access. The Compute resources are also verified with the
+compute v1 clients against the fake compute server, seeded with the plan.
+"""
+
+import pathlib
+import re
+from collections.abc import Callable, Generator
+from typing import Any
+
+import pytest
+
+from .conftest import plan_tofu_in_workspace
+from .harness.plans import planned_actions, planned_resources
+from .harness.snapshot import ComputeSnapshot
+
+pytestmark = pytest.mark.plan
+
+FIXTURE_NAME = "plan-only"
+FIXTURE_LABELS = {
+    "fixture": FIXTURE_NAME,
+}
+
+
+@pytest.fixture(scope="module")
+def fixture_name(prefix: str) -> str:
+    """Return the name to use for resources in this module."""
+    return f"{prefix}-{FIXTURE_NAME}"
+
+
+@pytest.fixture(scope="module")
+def fixture_labels(labels: dict[str, str]) -> dict[str, str] | None:
+    """Return a dict of labels for this test module."""
+    return FIXTURE_LABELS | labels
+
+
+@pytest.fixture(scope="module")
+def plan(
+    plan_fixture_dir: Callable[[str], pathlib.Path],
+    project_id: str,
+    fixture_name: str,
+    fixture_labels: dict[str, str],
+) -> Generator[dict[str, Any], None, None]:
+    """Execute the Tofu (or Terraform) plan-only tier with the input vars for this fixture, yielding the plan."""
+    with plan_tofu_in_workspace(
+        fixture=plan_fixture_dir(FIXTURE_NAME),
+        tfvars={
+            "project_id": project_id,
+            "name": fixture_name,
+            "regions": [
+                "us-west1",
+                "us-east1",
+            ],
+            "cidrs": {
+                "secondaries": {
+                    "pods": {
+                        "ipv4_cidr": "10.0.0.0/8",
+                        "ipv4_subnet_size": 16,
+                    },
+                    "services": {
+                        "ipv4_cidr": "10.100.0.0/16",
+                    },
+                },
+            },
+            "nat": {
+                "tags": [
+                    FIXTURE_NAME,
+                ],
+                "logging_filter": "ERRORS_ONLY",
+            },
+            "psc": {
+                "address": "10.10.10.10",
+            },
+            "labels": fixture_labels,
+        },
+    ) as plan:
+        yield plan
+
+
+@pytest.fixture(scope="module")
+def resources(plan: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """Return the planned resource values keyed by address."""
+    return planned_resources(plan)
+
+
+@pytest.fixture(scope="module")
+def snapshot(
+    planned_compute_snapshot: Callable[[str, dict[str, Any]], ComputeSnapshot],
+    plan: dict[str, Any],
+    fixture_name: str,
+) -> ComputeSnapshot:
+    """Return a snapshot of the planned network and associated resources, served by the fake compute server."""
+    return planned_compute_snapshot(fixture_name, plan)
+
+
+def test_actions(plan: dict[str, Any]) -> None:
+    """Verify every resource will be created."""
+    actions = planned_actions(plan)
+    assert actions
+    for address, action in actions.items():
+        assert action == ["create"], address
+
+
+def test_network(resources: dict[str, dict[str, Any]], project_id: str, fixture_name: str) -> None:
+    """Verify the planned network matches expectations."""
+    network = resources["google_compute_network.network"]
+    assert network["project"] == project_id
+    assert network["name"] == fixture_name
+    assert network["description"] == "custom vpc"
+    assert not network["auto_create_subnetworks"]
+    assert network["routing_mode"] == "GLOBAL"
+    assert network["mtu"] == 1460  # noqa: PLR2004
+    assert network["delete_default_routes_on_create"]
+    assert not network["enable_ula_internal_ipv6"]
+
+
+def test_subnetworks(resources: dict[str, dict[str, Any]], fixture_name: str) -> None:
+    """Verify the planned subnetworks have the expected primary and secondary CIDRs."""
+    subnets = {
+        values["region"]: values
+        for address, values in resources.items()
+        if address.startswith("google_compute_subnetwork.subnet[")
+    }
+    assert set(subnets.keys()) == {"us-west1", "us-east1"}
+    subnet = subnets["us-west1"]
+    assert subnet["name"] == f"{fixture_name}-us-we1"
+    assert subnet["ip_cidr_range"] == "172.16.0.0/24"
+    assert subnet["private_ip_google_access"]
+    assert subnet["stack_type"] == "IPV4_ONLY"
+    assert subnet["secondary_ip_range"] == [
+        {"range_name": "pods", "ip_cidr_range": "10.0.0.0/16"},
+        {"range_name": "services", "ip_cidr_range": "10.100.0.0/24"},
+    ]
+    assert not subnet["log_config"]
+    subnet = subnets["us-east1"]
+    assert subnet["name"] == f"{fixture_name}-us-ea1"
+    assert subnet["ip_cidr_range"] == "172.16.1.0/24"
+    assert subnet["private_ip_google_access"]
+    assert subnet["stack_type"] == "IPV4_ONLY"
+    assert subnet["secondary_ip_range"] == [
+        {"range_name": "pods", "ip_cidr_range": "10.1.0.0/16"},
+        {"range_name": "services", "ip_cidr_range": "10.100.1.0/24"},
+    ]
+    assert not subnet["log_config"]
+
+
+def test_routes(resources: dict[str, dict[str, Any]], fixture_name: str) -> None:
+    """Verify the planned routes meet expectations; PSC replaces the restricted API route."""
+    routes = {address: values for address, values in resources.items() if address.startswith("google_compute_route.")}
+    assert list(routes.keys()) == ['google_compute_route.tagged_nat["tags"]']
+    route = routes['google_compute_route.tagged_nat["tags"]']
+    assert route["name"] == f"{fixture_name}-tagged-nat"
+    assert route["description"] == "Route to NAT gateway for tagged resources"
+    assert route["dest_range"] == "0.0.0.0/0"
+    assert route["next_hop_gateway"] == "default-internet-gateway"
+    assert route["priority"] == 900  # noqa: PLR2004
+    assert route["tags"] == [FIXTURE_NAME]
+
+
+def test_routers(resources: dict[str, dict[str, Any]], fixture_name: str) -> None:
+    """Verify the planned routers and NATs meet requirements."""
+    for region, abbreviation in [("us-west1", "us-we1"), ("us-east1", "us-ea1")]:
+        router = resources[f'google_compute_router.nat["{region}"]']
+        assert router["name"] == f"{fixture_name}-{abbreviation}"
+        assert router["region"] == region
+        nat = resources[f'google_compute_router_nat.nat["{region}"]']
+        assert nat["name"] == f"{fixture_name}-{abbreviation}"
+        assert nat["router"] == f"{fixture_name}-{abbreviation}"
+        assert nat["region"] == region
+        assert nat["nat_ip_allocate_option"] == "AUTO_ONLY"
+        assert nat["source_subnetwork_ip_ranges_to_nat"] == "ALL_SUBNETWORKS_ALL_IP_RANGES"
+        assert nat["log_config"] == [{"enable": True, "filter": "ERRORS_ONLY"}]
+
+
+def test_psc(resources: dict[str, dict[str, Any]], fixture_name: str, fixture_labels: dict[str, str]) -> None:
+    """Verify the planned PSC resources meet requirements."""
+    global_address = resources[f'google_compute_global_address.psc["{fixture_name}-goog"]']
+    assert global_address["name"] == f"{fixture_name}-goog"
+    assert global_address["description"] == "PSC endpoint for restricted Google APIs access"
+    assert global_address["address"] == "10.10.10.10"
+    assert global_address["address_type"] == "INTERNAL"
+    assert global_address["purpose"] == "PRIVATE_SERVICE_CONNECT"
+    assert global_address["labels"] == fixture_labels
+    global_forwarding_rule = resources[f'google_compute_global_forwarding_rule.psc["{fixture_name}-goog"]']
+    assert global_forwarding_rule["name"] == re.sub(r"[^a-z0-9]", "", f"{fixture_name}-goog")[:20]
+    assert global_forwarding_rule["target"] == "vpc-sc"
+    assert global_forwarding_rule["ip_address"] == "10.10.10.10"
+    assert global_forwarding_rule["labels"] == fixture_labels
+    assert not global_forwarding_rule["service_directory_registrations"]
+
+
+def test_snapshot_network(snapshot: ComputeSnapshot, project_id: str, fixture_name: str) -> None:
+    """Verify the compute v1 clients report the planned network and subnetworks."""
+    result = snapshot.network
+    assert result.name == fixture_name
+    assert not result.auto_create_subnetworks
+    assert result.routing_config.routing_mode == "GLOBAL"
+    assert sorted(result.subnetworks) == [
+        f"https://www.googleapis.com/compute/v1/projects/{project_id}/regions/us-east1/subnetworks/{fixture_name}-us-ea1",
+        f"https://www.googleapis.com/compute/v1/projects/{project_id}/regions/us-west1/subnetworks/{fixture_name}-us-we1",
+    ]
+    for region, abbreviation, primary in [
+        ("us-west1", "us-we1", "172.16.0.0/24"),
+        ("us-east1", "us-ea1", "172.16.1.0/24"),
+    ]:
+        subnetwork = snapshot.subnetworks_by_region[region][f"{fixture_name}-{abbreviation}"]
+        assert subnetwork.ip_cidr_range == primary
+        assert subnetwork.private_ip_google_access
+        assert [secondary.range_name for secondary in subnetwork.secondary_ip_ranges] == ["pods", "services"]
+
+
+def test_snapshot_routers(snapshot: ComputeSnapshot, fixture_name: str) -> None:
+    """Verify the compute v1 clients report a router with the planned NAT in each region."""
+    for region, abbreviation in [("us-west1", "us-we1"), ("us-east1", "us-ea1")]:
+        routers = snapshot.routers[region]
+        assert [router.name for router in routers] == [f"{fixture_name}-{abbreviation}"]
+        for router in routers:
+            assert [nat.name for nat in router.nats] == [f"{fixture_name}-{abbreviation}"]
+            for nat in router.nats:
+                assert nat.nat_ip_allocate_option == "AUTO_ONLY"
+                assert nat.log_config.enable
+                assert nat.log_config.filter == "ERRORS_ONLY"
+
+
+def test_snapshot_psc(snapshot: ComputeSnapshot, fixture_name: str) -> None:
+    """Verify the compute v1 clients report the planned PSC address and forwarding rule on the network."""
+    assert [address.name for address in snapshot.global_addresses] == [f"{fixture_name}-goog"]
+    assert [address.address for address in snapshot.global_addresses] == ["10.10.10.10"]
+    assert [rule.name for rule in snapshot.global_forwarding_rules] == [
+        re.sub(r"[^a-z0-9]", "", f"{fixture_name}-goog")[:20],
+    ]
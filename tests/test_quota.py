@@ -0,0 +1,104 @@
+"""Verify the cross-worker limits on concurrent applies and destroys per region and resource class."""
+
+import asyncio
+import itertools
+import json
+import pathlib
+from typing import Any
+
+import pytest
+
+from .harness import fake_tofu
+from .harness.engine import TofuEngine
+from .harness.locking import semaphore_slot
+from .harness.quota import QuotaLimiter, parse_limits, resource_keys
+from .harness.timing import PhaseTimer
+
+FAKE_TOFU = str(pathlib.Path(fake_tofu.__file__).resolve())
+POLL_INTERVAL = 0.01
+
+
+def test_resource_keys() -> None:
+    """Verify regional keys are created for every region, and NAT and PSC keys only if they are enabled."""
+    assert resource_keys({"regions": ["us-west1", "us-east1"]}) == [
+        "network",
+        "subnetwork/us-east1",
+        "subnetwork/us-west1",
+    ]
+    assert resource_keys({"regions": ["us-west1"], "nat": {}, "psc": {"address": "10.10.10.10"}}) == [
+        "nat/us-west1",
+        "network",
+        "psc",
+        "subnetwork/us-west1",
+    ]
+    assert "psc" not in resource_keys({"regions": ["us-west1"], "psc": {"address": None}})
+
+
+def test_limits(tmp_path: pathlib.Path) -> None:
+    """Verify the limit of a key falls back to the limit of its resource class."""
+    limiter = QuotaLimiter(tmp_path, parse_limits(" nat=2, nat/us-west1=1,psc=1 "))
+    assert limiter.limit("nat/us-west1") == 1
+    assert limiter.limit("nat/us-east1") == 2  # noqa: PLR2004
+    assert limiter.limit("psc") == 1
+    assert limiter.limit("subnetwork/us-west1") is None
+    with pytest.raises(AssertionError, match="invalid quota limit"):
+        parse_limits("nat")
+
+
+def test_semaphore_slot(tmp_path: pathlib.Path) -> None:
+    """Verify no more than limit holders of the semaphore run at once, and every waiter eventually acquires a slot."""
+    running = 0
+    peak = 0
+
+    async def _hold() -> int:
+        nonlocal running, peak
+        async with semaphore_slot(tmp_path, "nat/us-west1", limit=2, poll_interval=POLL_INTERVAL) as slot:
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.05)
+            running -= 1
+            return slot
+
+    async def _main() -> list[int]:
+        return await asyncio.gather(*[_hold() for _ in range(6)])
+
+    slots = asyncio.run(_main())
+    assert peak == 2  # noqa: PLR2004
+    assert set(slots) == {0, 1}
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["nat--us-west1.0.lock", "nat--us-west1.1.lock"]
+
+
+def test_engine_applies_limited(monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path) -> None:
+    """Verify applies of NAT fixtures in one region are serialized, while the other phases run concurrently."""
+    log = tmp_path.joinpath("invocations.jsonl")
+    config_file = tmp_path.joinpath("fake-tofu.json")
+    config_file.write_text(json.dumps({"phases": {"apply": {"latency": 0.2}}, "outputs": {}, "log": str(log)}))
+    monkeypatch.setenv(fake_tofu.CONFIG_ENV, str(config_file))
+    timer = PhaseTimer()
+    engine = TofuEngine(
+        timer=timer,
+        quota=QuotaLimiter(tmp_path.joinpath("quota"), {"nat/us-west1": 1}, poll_interval=POLL_INTERVAL),
+    )
+
+    async def _apply(fixture: pathlib.Path) -> dict[str, Any]:
+        tfvars = {"name": fixture.name, "regions": ["us-west1"], "nat": {}}
+        async with engine.workspace(FAKE_TOFU, fixture, tfvars, destroy=False) as output:
+            return output
+
+    try:
+        futures = []
+        for i in range(3):
+            fixture = tmp_path.joinpath(f"fixture-{i}")
+            fixture.mkdir()
+            futures.append(engine.submit(_apply(fixture)))
+        assert [future.result() for future in futures] == [{}] * 3
+    finally:
+        engine.close()
+    applies = sorted(
+        (invocation["start"], invocation["end"])
+        for invocation in map(json.loads, log.read_text().splitlines())
+        if invocation["phase"] == "apply"
+    )
+    assert len(applies) == 3  # noqa: PLR2004
+    assert all(end <= start for (_, end), (start, _) in itertools.pairwise(applies))
+    assert {timing.phase for timing in timer.timings} >= {"apply", "apply-quota-wait"}
@@ -0,0 +1,109 @@
+"""Test fixture for stable region slots, where inserting a region only adds resources."""
+
+import pathlib
+from collections.abc import Callable, Generator
+from typing import Any
+
+import pytest
+
+from .conftest import plan_tofu_in_workspace, run_tofu_in_workspace
+from .harness.cassettes import REPLAY, cassette_mode
+from .harness.plans import planned_actions, planned_resources
+from .harness.subnets import expected_output
+
+FIXTURE_NAME = "region-slots"
+FIXTURE_LABELS = {
+    "fixture": FIXTURE_NAME,
+}
+REGION_SLOTS = {
+    "us-west1": 0,
+    "us-central1": 1,
+    "us-east1": 2,
+}
+
+
+@pytest.fixture(scope="module")
+def fixture_name(prefix: str) -> str:
+    """Return the name to use for resources in this module."""
+    return f"{prefix}-{FIXTURE_NAME}"
+
+
+@pytest.fixture(scope="module")
+def fixture_labels(labels: dict[str, str]) -> dict[str, str] | None:
+    """Return a dict of labels for this test module."""
+    return FIXTURE_LABELS | labels
+
+
+@pytest.fixture(scope="module")
+def fixture_dir(root_fixture_dir: Callable[[str], pathlib.Path]) -> pathlib.Path:
+    """Return the fixture directory shared by the applied fixture and the insertion plan."""
+    return root_fixture_dir(FIXTURE_NAME)
+
+
+@pytest.fixture(scope="module")
+def tfvars(project_id: str, fixture_name: str, fixture_labels: dict[str, str]) -> dict[str, Any]:
+    """Return the input vars of the applied fixture."""
+    return {
+        "project_id": project_id,
+        "name": fixture_name,
+        "regions": [
+            "us-west1",
+            "us-east1",
+        ],
+        "cidrs": {
+            "secondaries": {
+                "pods": {
+                    "ipv4_cidr": "10.0.0.0/8",
+                    "ipv4_subnet_size": 16,
+                },
+            },
+            "region_slots": REGION_SLOTS,
+        },
+        "labels": fixture_labels,
+    }
+
+
+@pytest.fixture(scope="module")
+def output(fixture_dir: pathlib.Path, tfvars: dict[str, Any]) -> Generator[dict[str, Any], None, None]:
+    """Execute Tofu (or Terraform) with the input vars suitable for this fixture, yielding the module output."""
+    with run_tofu_in_workspace(
+        fixture=fixture_dir,
+        tfvars=tfvars,
+    ) as output:
+        yield output
+
+
+@pytest.fixture(scope="module")
+def insertion_plan(
+    output: dict[str, Any],
+    fixture_dir: pathlib.Path,
+    tfvars: dict[str, Any],
+) -> Generator[dict[str, Any], None, None]:
+    """Plan the insertion of us-central1 between the applied regions, yielding the plan against the applied state."""
+    assert output
+    if cassette_mode() == REPLAY:
+        pytest.skip("the insertion plan requires the applied state of the fixture")
+    with plan_tofu_in_workspace(
+        fixture=fixture_dir,
+        tfvars=tfvars | {"regions": ["us-west1", "us-central1", "us-east1"]},
+    ) as plan:
+        yield plan
+
+
+def test_output_values(output: dict[str, Any], tfvars: dict[str, Any]) -> None:
+    """Verify the output values match expectations; us-east1 is assigned slot 2 rather than its index."""
+    assert output == expected_output(tfvars)
+    assert output["subnets_by_region"]["us-east1"]["primary_ipv4_cidr"] == "172.16.2.0/24"
+    assert output["subnets_by_region"]["us-east1"]["secondary_ipv4_cidrs"] == {"pods": "10.2.0.0/16"}
+
+
+def test_insertion_only_adds(insertion_plan: dict[str, Any], fixture_name: str) -> None:
+    """Verify inserting a region plans the new subnet without changing any existing resource."""
+    actions = planned_actions(insertion_plan)
+    changed = {address: action for address, action in actions.items() if action != ["no-op"]}
+    assert changed
+    for address, action in changed.items():
+        assert action == ["create"], address
+    subnet = planned_resources(insertion_plan)[f'google_compute_subnetwork.subnet["{fixture_name}-us-ce1"]']
+    assert subnet["ip_cidr_range"] == "172.16.1.0/24"
+    assert subnet["secondary_ip_range"] == [{"range_name": "pods", "ip_cidr_range": "10.1.0.0/16"}]
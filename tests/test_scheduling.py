@@ -0,0 +1,107 @@
+"""Verify test modules are ordered longest first from their historical durations."""
+
+import heapq
+import json
+import pathlib
+from dataclasses import dataclass
+
+import pytest
+
+from .harness.scheduling import DurationScheduler, estimate, lpt_order, module_id, smooth
+
+DURATIONS = {
+    "tests/test_minimal.py": 60.0,
+    "tests/test_nat.py": 300.0,
+    "tests/test_psc.py": 240.0,
+    "tests/test_mtu.py": 60.0,
+    "tests/test_gke.py": 180.0,
+}
+
+
+@dataclass(frozen=True)
+class FakeItem:
+    """A collected test item."""
+
+    nodeid: str
+
+
+def _items(*modules: str) -> list[FakeItem]:
+    return [FakeItem(f"{module}::{test}") for module in modules for test in ("test_output_values", "test_network")]
+
+
+def _makespan(modules: list[str], workers: int) -> float:
+    """Return the finish time when modules are handed, in order, to the first idle worker."""
+    finish = [0.0] * workers
+    for module in modules:
+        heapq.heappush(finish, heapq.heappop(finish) + DURATIONS[module])
+    return max(finish)
+
+
+def test_module_id() -> None:
+    """Verify the module is extracted from a node id."""
+    assert module_id("tests/test_nat.py::test_routers[us-west1]") == "tests/test_nat.py"
+
+
+def test_lpt_order() -> None:
+    """Verify modules are ordered by decreasing duration, keeping the items of a module together and in order."""
+    items = _items(*DURATIONS)
+    ordered = lpt_order(items, DURATIONS)
+    assert [item.nodeid for item in ordered[:2]] == [
+        "tests/test_nat.py::test_output_values",
+        "tests/test_nat.py::test_network",
+    ]
+    modules = list(dict.fromkeys(module_id(item.nodeid) for item in ordered))
+    assert modules == [
+        "tests/test_nat.py",
+        "tests/test_psc.py",
+        "tests/test_gke.py",
+        "tests/test_minimal.py",
+        "tests/test_mtu.py",
+    ]
+    assert sorted(ordered, key=items.index) == items
+    assert _makespan(modules, workers=2) < _makespan(list(DURATIONS), workers=2)
+
+
+def test_unknown_module_first() -> None:
+    """Verify a module without history is expected to be as slow as the slowest known module."""
+    assert estimate(DURATIONS, "tests/test_new.py") == DURATIONS["tests/test_nat.py"]
+    assert estimate({}, "tests/test_new.py") == 0.0
+    ordered = lpt_order(_items("tests/test_minimal.py", "tests/test_new.py", "tests/test_nat.py"), DURATIONS)
+    assert list(dict.fromkeys(module_id(item.nodeid) for item in ordered)) == [
+        "tests/test_new.py",
+        "tests/test_nat.py",
+        "tests/test_minimal.py",
+    ]
+
+
+def test_smooth() -> None:
+    """Verify observed durations are averaged with history, and new modules take their observed duration."""
+    assert smooth(
+        {"tests/test_nat.py": 300.0, "tests/test_psc.py": 240.0},
+        {"tests/test_nat.py": 200.0, "tests/test_new.py": 30.0},
+    ) == {"tests/test_nat.py": 250.0, "tests/test_psc.py": 240.0, "tests/test_new.py": 30.0}
+
+
+def test_history_round_trip(request: pytest.FixtureRequest, tmp_path: pathlib.Path) -> None:
+    """Verify the scheduler reads history and merges observed durations into it at the end of the session."""
+    history_path = tmp_path.joinpath("module-durations.json")
+    history_path.write_text(json.dumps({"tests/test_nat.py": 300.0}))
+    scheduler = DurationScheduler(config=request.config, history_path=history_path)
+    assert scheduler.history == {"tests/test_nat.py": 300.0}
+    for duration in (10.0, 20.0):
+        scheduler.pytest_runtest_logreport(
+            pytest.TestReport(
+                nodeid="tests/test_minimal.py::test_network",
+                location=("tests/test_minimal.py", 0, "test_network"),
+                keywords={},
+                outcome="passed",
+                longrepr=None,
+                when="call",
+                duration=duration,
+            ),
+        )
+    scheduler.pytest_sessionfinish(session=request.session)
+    if getattr(request.config, "workeroutput", None) is None:
+        assert json.loads(history_path.read_text()) == {"tests/test_minimal.py": 30.0, "tests/test_nat.py": 300.0}
+    else:
+        assert json.loads(history_path.read_text()) == {"tests/test_nat.py": 300.0}
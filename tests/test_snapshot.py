@@ -0,0 +1,89 @@
+"""Verify a compute snapshot fetches each resource of a fixture once."""
+
+import threading
+from collections import Counter
+from collections.abc import Iterable
+from typing import Any
+
+from google.cloud import compute_v1
+
+from .harness.snapshot import ComputeClients, fetch_snapshot, network_filter
+
+PROJECT_ID = "test-project"
+NETWORK = "test"
+REGIONS = [
+    "us-west1",
+    "us-east1",
+]
+
+
+class RecordingClient:
+    """Return canned results for get and list, counting every request."""
+
+    def __init__(self, calls: Counter[str], items: dict[str, list[Any]]) -> None:
+        """Initialize the client with a shared counter and the items to return, keyed by region or empty string."""
+        self._calls = calls
+        self._items = items
+        self._lock = threading.Lock()
+
+    def _record(self, request: Any) -> str:  # noqa: ANN401
+        region = getattr(request, "region", "")
+        with self._lock:
+            self._calls[f"{type(request).__name__}:{region}"] += 1
+        return region
+
+    def get(self, request: Any) -> Any:  # noqa: ANN401
+        """Return the first item."""
+        return self._items[self._record(request)][0]
+
+    def list(self, request: Any) -> list[Any]:  # noqa: ANN401
+        """Return the items for the region of the request, verifying the network filter."""
+        assert request.filter == network_filter(NETWORK)
+        return self._items.get(self._record(request), [])
+
+    def aggregated_list(self, request: Any) -> Iterable[tuple[str, Any]]:  # noqa: ANN401
+        """Return the items of every region as scoped lists, including a global scope and an empty region."""
+        assert request.filter == network_filter(NETWORK)
+        self._record(request)
+        field = "subnetworks" if "Subnetworks" in type(request).__name__ else "routers"
+        scoped_list = compute_v1.SubnetworksScopedList if field == "subnetworks" else compute_v1.RoutersScopedList
+        return [
+            ("global", scoped_list()),
+            ("regions/europe-west4", scoped_list()),
+            *[(f"regions/{region}", scoped_list(**{field: items})) for region, items in self._items.items()],
+        ]
+
+
+def test_fetch_snapshot() -> None:
+    """Verify every resource is requested exactly once, with one request for each regional resource type."""
+    calls: Counter[str] = Counter()
+    snapshot = fetch_snapshot(
+        clients=ComputeClients(
+            networks=RecordingClient(calls, {"": [compute_v1.Network(name=NETWORK)]}),
+            subnetworks=RecordingClient(
+                calls,
+                {region: [compute_v1.Subnetwork(name=f"{NETWORK}-{region}")] for region in REGIONS},
+            ),
+            routes=RecordingClient(calls, {"": [compute_v1.Route(name=f"{NETWORK}-route")]}),
+            routers=RecordingClient(calls, {"us-west1": [compute_v1.Router(name=NETWORK)]}),
+            global_addresses=RecordingClient(calls, {}),
+            global_forwarding_rules=RecordingClient(calls, {}),
+        ),
+        project_id=PROJECT_ID,
+        network=NETWORK,
+        regions=REGIONS,
+    )
+    assert snapshot.network.name == NETWORK
+    assert set(snapshot.subnetworks.keys()) == {f"{NETWORK}-{region}" for region in REGIONS}
+    assert {region: list(subnetworks.keys()) for region, subnetworks in snapshot.subnetworks_by_region.items()} == {
+        region: [f"{NETWORK}-{region}"] for region in REGIONS
+    }
+    assert [route.name for route in snapshot.routes] == [f"{NETWORK}-route"]
+    assert {region: [router.name for router in routers] for region, routers in snapshot.routers.items()} == {
+        "us-west1": [NETWORK],
+        "us-east1": [],
+    }
+    assert not snapshot.global_addresses
+    assert not snapshot.global_forwarding_rules
+    assert set(calls.values()) == {1}
+    assert len(calls) == 6  # noqa: PLR2004
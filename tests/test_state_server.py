@@ -0,0 +1,79 @@
+"""Verify the localhost state server implements the http backend protocol, including locking."""
+
+import http.client
+import json
+import pathlib
+import urllib.parse
+from collections.abc import Generator
+
+import pytest
+
+from .harness.state_server import StateServer, StateStore, serve_state
+
+NAME = "tests/fixture"
+LOCK = {"ID": "3b2f1c3e-lock", "Operation": "OperationTypeApply", "Who": "tester@localhost"}
+STATE = b'{"version":4,"serial":1,"resources":[]}'
+
+
+@pytest.fixture
+def server(tmp_path: pathlib.Path) -> Generator[StateServer, None, None]:
+    """Serve states from a temporary directory."""
+    with serve_state(tmp_path) as server:
+        yield server
+
+
+def _request(
+    server: StateServer,
+    method: str,
+    name: str,
+    body: bytes | None = None,
+    lock_id: str | None = None,
+) -> tuple[int, bytes]:
+    """Send the request to the state server, returning the status and response body."""
+    url = urllib.parse.urlsplit(server.address(name))
+    connection = http.client.HTTPConnection(url.netloc, timeout=5)
+    try:
+        connection.request(method, url.path + (f"?ID={lock_id}" if lock_id else ""), body=body)
+        response = connection.getresponse()
+        return response.status, response.read()
+    finally:
+        connection.close()
+
+
+def test_state(server: StateServer, tmp_path: pathlib.Path) -> None:
+    """Verify state is missing until it is posted, is persisted to the directory, and can be deleted."""
+    assert _request(server, "GET", NAME)[0] == 404  # noqa: PLR2004
+    assert _request(server, "POST", NAME, STATE)[0] == 200  # noqa: PLR2004
+    assert _request(server, "GET", NAME) == (200, STATE)
+    assert tmp_path.joinpath("tests", "fixture.tfstate").read_bytes() == STATE
+    assert _request(server, "DELETE", NAME)[0] == 200  # noqa: PLR2004
+    assert _request(server, "GET", NAME)[0] == 404  # noqa: PLR2004
+
+
+def test_lock(server: StateServer) -> None:
+    """Verify a second lock is refused with the holder's lock info, and only the holder can update and unlock."""
+    assert _request(server, "LOCK", NAME, json.dumps(LOCK).encode())[0] == 200  # noqa: PLR2004
+    status, body = _request(server, "LOCK", NAME, json.dumps(LOCK | {"ID": "other"}).encode())
+    assert status == 423  # noqa: PLR2004
+    assert json.loads(body) == LOCK
+    assert _request(server, "POST", NAME, STATE, lock_id="other")[0] == 409  # noqa: PLR2004
+    assert _request(server, "POST", NAME, STATE, lock_id=LOCK["ID"])[0] == 200  # noqa: PLR2004
+    assert _request(server, "UNLOCK", NAME, json.dumps({"ID": "other"}).encode())[0] == 409  # noqa: PLR2004
+    assert _request(server, "UNLOCK", NAME, json.dumps(LOCK).encode())[0] == 200  # noqa: PLR2004
+    assert _request(server, "LOCK", NAME, json.dumps(LOCK | {"ID": "other"}).encode())[0] == 200  # noqa: PLR2004
+
+
+def test_lock_shared_between_servers(tmp_path: pathlib.Path) -> None:
+    """Verify a lock acquired through one server is honoured by another server using the same directory."""
+    with serve_state(tmp_path) as first, serve_state(tmp_path) as second:
+        assert _request(first, "LOCK", NAME, json.dumps(LOCK).encode())[0] == 200  # noqa: PLR2004
+        assert _request(second, "LOCK", NAME, json.dumps(LOCK | {"ID": "other"}).encode())[0] == 423  # noqa: PLR2004
+        assert _request(second, "UNLOCK", NAME)[0] == 200  # noqa: PLR2004
+        assert _request(first, "LOCK", NAME, json.dumps(LOCK | {"ID": "other"}).encode())[0] == 200  # noqa: PLR2004
+
+
+def test_invalid_name(tmp_path: pathlib.Path) -> None:
+    """Verify state names cannot escape the directory."""
+    store = StateStore(tmp_path)
+    with pytest.raises(ValueError, match="invalid state name"):
+        store.get("../outside")
@@ -0,0 +1,57 @@
+"""Verify tofu/terraform output is streamed with a bounded line length and retained tail."""
+
+import asyncio
+import logging
+import pathlib
+import sys
+
+import pytest
+
+from .harness import streaming
+from .harness.streaming import STREAM_LINE_LIMIT, TRUNCATED_MARKER, TofuError, stream_command
+
+
+def _python(script: str) -> list[str]:
+    return [sys.executable, "-c", script]
+
+
+def test_long_line_truncated() -> None:
+    """Verify a line longer than the stream limit is truncated instead of failing the command."""
+    with pytest.raises(TofuError) as error:
+        asyncio.run(
+            stream_command(
+                _python(f"import sys; print('x' * {2 * STREAM_LINE_LIMIT}); print('done'); sys.exit(1)"),
+                label="long-line",
+                tail_lines=2,
+            ),
+        )
+    first, last = error.value.output.splitlines()
+    assert first.endswith(TRUNCATED_MARKER.decode())
+    assert len(first) < 2 * STREAM_LINE_LIMIT
+    assert last == "done"
+
+
+def test_capture_long_line() -> None:
+    """Verify captured output is returned whole, even when it is a single line longer than the stream limit."""
+    output = asyncio.run(
+        stream_command(_python(f"print('x' * {2 * STREAM_LINE_LIMIT})"), label="capture", capture=True),
+    )
+    assert output == b"x" * (2 * STREAM_LINE_LIMIT) + b"\n"
+
+
+def test_output_log(monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path) -> None:
+    """Verify output lines are written to TEST_TF_OUTPUT_LOG and are not propagated to pytest."""
+    output_log = tmp_path.joinpath("output.log")
+    monkeypatch.setenv("TEST_TF_OUTPUT_LOG", str(output_log))
+    streaming.output_logger.cache_clear()
+    try:
+        logger = streaming.output_logger()
+        assert not logger.propagate
+        asyncio.run(stream_command(_python("print('hello')"), label="output-log"))
+    finally:
+        streaming.output_logger.cache_clear()
+        file_logger = logging.getLogger(f"{streaming.__name__}.output")
+        for handler in file_logger.handlers:
+            handler.close()
+            file_logger.removeHandler(handler)
+    assert output_log.read_text().rstrip().endswith("[output-log] hello")
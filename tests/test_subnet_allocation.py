@@ -0,0 +1,291 @@
+"""Verify the pure-Python subnet allocation evaluator against the expectations of the deployment fixtures."""
+
+from typing import Any
+
+import pytest
+
+from .harness.subnets import cidrsubnet, evaluate_subnets, expected_output, region_abbreviation
+
+PROJECT_ID = "test-project"
+NAME = "allocation"
+
+
+@pytest.mark.parametrize(
+    ("region", "expected"),
+    [
+        ("us-west1", "us-we1"),
+        ("us-east1", "us-ea1"),
+        ("us-central1", "us-ce1"),
+        ("europe-west4", "eu-we4"),
+        ("asia-southeast1", "as-se1"),
+        ("northamerica-northeast2", "na-ne2"),
+    ],
+)
+def test_region_abbreviation(region: str, expected: str) -> None:
+    """Verify region abbreviations follow the location and direction convention."""
+    assert region_abbreviation(region) == expected
+
+
+def test_region_abbreviation_override() -> None:
+    """Verify an explicit abbreviation takes precedence."""
+    assert region_abbreviation("me-central2", {"me-central2": "me-cn2"}) == "me-cn2"
+
+
+@pytest.mark.parametrize(
+    ("prefix", "newbits", "netnum", "expected"),
+    [
+        ("172.16.0.0/12", 12, 0, "172.16.0.0/24"),
+        ("172.16.0.0/12", 12, 1, "172.16.1.0/24"),
+        ("172.16.0.0/12", 4, 1, "172.17.0.0/16"),
+        ("10.0.0.0/8", 8, 14, "10.14.0.0/16"),
+        ("192.168.0.0/16", 8, 255, "192.168.255.0/24"),
+        ("10.1.2.3/8", 0, 0, "10.0.0.0/8"),
+    ],
+)
+def test_cidrsubnet(prefix: str, newbits: int, netnum: int, expected: str) -> None:
+    """Verify cidrsubnet matches the tofu/terraform function."""
+    assert cidrsubnet(prefix, newbits, netnum) == expected
+
+
+@pytest.mark.parametrize(
+    ("prefix", "newbits", "netnum"),
+    [
+        ("192.168.0.0/16", 8, 256),
+        ("192.168.0.0/16", 17, 0),
+        ("192.168.0.0/16", -1, 0),
+    ],
+)
+def test_cidrsubnet_errors(prefix: str, newbits: int, netnum: int) -> None:
+    """Verify cidrsubnet rejects subnets that do not fit the prefix."""
+    with pytest.raises(ValueError, match="prefix"):
+        cidrsubnet(prefix, newbits, netnum)
+
+
+@pytest.mark.parametrize(
+    ("cidrs", "expected"),
+    [
+        (
+            None,
+            {
+                "us-west1": ("172.16.0.0/24", {}),
+                "us-east1": ("172.16.1.0/24", {}),
+            },
+        ),
+        (
+            {
+                "primary_ipv4_subnet_offset": 10,
+                "primary_ipv4_subnet_step": 10,
+            },
+            {
+                "us-west1": ("172.16.10.0/24", {}),
+                "us-east1": ("172.16.20.0/24", {}),
+            },
+        ),
+        (
+            {
+                "secondaries": {
+                    "pods": {
+                        "ipv4_cidr": "10.0.0.0/8",
+                        "ipv4_subnet_size": 16,
+                    },
+                    "services": {
+                        "ipv4_cidr": "10.100.0.0/16",
+                    },
+                },
+            },
+            {
+                "us-west1": ("172.16.0.0/24", {"pods": "10.0.0.0/16", "services": "10.100.0.0/24"}),
+                "us-east1": ("172.16.1.0/24", {"pods": "10.1.0.0/16", "services": "10.100.1.0/24"}),
+            },
+        ),
+        (
+            {
+                "primary_ipv4_cidr": "10.0.0.0/8",
+                "primary_ipv4_subnet_size": 16,
+                "primary_ipv4_subnet_offset": 7,
+                "primary_ipv4_subnet_step": 7,
+                "secondaries": {
+                    "test": {
+                        "ipv4_cidr": "192.168.0.0/16",
+                        "ipv4_subnet_offset": 5,
+                        "ipv4_subnet_step": 9,
+                    },
+                },
+            },
+            {
+                "us-west1": ("10.7.0.0/16", {"test": "192.168.5.0/24"}),
+                "us-east1": ("10.14.0.0/16", {"test": "192.168.14.0/24"}),
+            },
+        ),
+        (
+            {
+                "primary_ipv4_cidr": "172.16.0.0/12",
+                "primary_ipv4_subnet_size": 16,
+                "primary_ipv6_cidr": "fd20:0:0309:0:0:0:0:0/48",
+            },
+            {
+                "us-west1": ("172.16.0.0/16", {}),
+                "us-east1": ("172.17.0.0/16", {}),
+            },
+        ),
+    ],
+)
+def test_evaluate_subnets(cidrs: dict[str, Any] | None, expected: dict[str, tuple[str, dict[str, str]]]) -> None:
+    """Verify the evaluated subnets match the CIDRs asserted by the deployment fixtures."""
+    subnets = evaluate_subnets(
+        {
+            "name": NAME,
+            "regions": [
+                "us-west1",
+                "us-east1",
+            ],
+            "cidrs": cidrs,
+        },
+    )
+    assert {
+        subnet["region"]: (subnet["primary_ipv4_cidr"], subnet["secondary_ipv4_ranges"]) for subnet in subnets.values()
+    } == expected
+    assert set(subnets.keys()) == {f"{NAME}-us-we1", f"{NAME}-us-ea1"}
+    for subnet in subnets.values():
+        assert subnet["stack_type"] == "IPV4_ONLY"
+        assert subnet["ipv6_access_type"] is None
+
+
+def test_evaluate_subnets_region_slots() -> None:
+    """Verify regions with a stable slot keep their CIDRs when a region is inserted before them."""
+    cidrs = {
+        "secondaries": {
+            "pods": {
+                "ipv4_cidr": "10.0.0.0/8",
+                "ipv4_subnet_size": 16,
+            },
+        },
+        "region_slots": {
+            "us-west1": 0,
+            "us-east1": 2,
+            "us-central1": 1,
+        },
+    }
+    before = evaluate_subnets({"name": NAME, "regions": ["us-west1", "us-east1"], "cidrs": cidrs})
+    after = evaluate_subnets({"name": NAME, "regions": ["us-west1", "us-central1", "us-east1"], "cidrs": cidrs})
+    assert {key: value for key, value in after.items() if key in before} == before
+    assert before[f"{NAME}-us-ea1"]["primary_ipv4_cidr"] == "172.16.2.0/24"
+    assert after[f"{NAME}-us-ce1"]["primary_ipv4_cidr"] == "172.16.1.0/24"
+    assert after[f"{NAME}-us-ce1"]["secondary_ipv4_ranges"] == {"pods": "10.1.0.0/16"}
+    unslotted = evaluate_subnets({"name": NAME, "regions": ["us-west1", "us-central1", "us-east1"], "cidrs": None})
+    assert unslotted[f"{NAME}-us-ea1"] != before[f"{NAME}-us-ea1"]
+
+
+def test_evaluate_subnets_exhausted() -> None:
+    """Verify a configuration that exhausts the primary CIDR is rejected."""
+    with pytest.raises(ValueError, match="does not accommodate"):
+        evaluate_subnets(
+            {
+                "regions": [
+                    "us-west1",
+                    "us-east1",
+                ],
+                "cidrs": {
+                    "primary_ipv4_cidr": "10.0.0.0/23",
+                    "primary_ipv4_subnet_offset": 1,
+                },
+            },
+        )
+
+
+def test_expected_output_ipv6_ula() -> None:
+    """Verify subnets are dual-stack with provider-assigned IPv6 ranges when IPv6 ULA is enabled."""
+    output = expected_output(
+        {
+            "project_id": PROJECT_ID,
+            "name": NAME,
+            "regions": [
+                "us-west1",
+            ],
+            "options": {
+                "ipv6_ula": True,
+            },
+        },
+    )
+    assert output["subnets_by_region"]["us-west1"]["primary_ipv6_cidr"] is None
+    assert output["subnets_by_name"][f"{NAME}-us-we1"]["primary_ipv6_cidr"] is None
+
+
+def test_expected_output() -> None:
+    """Verify the generated output matches the hand-written expectation of the GKE fixture."""
+    assert expected_output(
+        {
+            "project_id": PROJECT_ID,
+            "name": NAME,
+            "regions": [
+                "us-west1",
+                "us-east1",
+            ],
+            "cidrs": {
+                "secondaries": {
+                    "pods": {
+                        "ipv4_cidr": "10.0.0.0/8",
+                        "ipv4_subnet_size": 16,
+                    },
+                    "services": {
+                        "ipv4_cidr": "10.100.0.0/16",
+                    },
+                },
+            },
+        },
+    ) == {
+        "self_link": f"https://www.googleapis.com/compute/v1/projects/{PROJECT_ID}/global/networks/{NAME}",
+        "id": f"projects/{PROJECT_ID}/global/networks/{NAME}",
+        "subnets_by_name": {
+            f"{NAME}-us-we1": {
+                "region": "us-west1",
+                "self_link": f"https://www.googleapis.com/compute/v1/projects/{PROJECT_ID}/regions/us-west1/subnetworks/{NAME}-us-we1",
+                "id": f"projects/{PROJECT_ID}/regions/us-west1/subnetworks/{NAME}-us-we1",
+                "primary_ipv4_cidr": "172.16.0.0/24",
+                "primary_ipv6_cidr": "",
+                "secondary_ipv4_cidrs": {
+                    "pods": "10.0.0.0/16",
+                    "services": "10.100.0.0/24",
+                },
+                "gateway_address": "172.16.0.1",
+            },
+            f"{NAME}-us-ea1": {
+                "region": "us-east1",
+                "self_link": f"https://www.googleapis.com/compute/v1/projects/{PROJECT_ID}/regions/us-east1/subnetworks/{NAME}-us-ea1",
+                "id": f"projects/{PROJECT_ID}/regions/us-east1/subnetworks/{NAME}-us-ea1",
+                "primary_ipv4_cidr": "172.16.1.0/24",
+                "primary_ipv6_cidr": "",
+                "secondary_ipv4_cidrs": {
+                    "pods": "10.1.0.0/16",
+                    "services": "10.100.1.0/24",
+                },
+                "gateway_address": "172.16.1.1",
+            },
+        },
+        "subnets_by_region": {
+            "us-west1": {
+                "name": f"{NAME}-us-we1",
+                "self_link": f"https://www.googleapis.com/compute/v1/projects/{PROJECT_ID}/regions/us-west1/subnetworks/{NAME}-us-we1",
+                "id": f"projects/{PROJECT_ID}/regions/us-west1/subnetworks/{NAME}-us-we1",
+                "primary_ipv4_cidr": "172.16.0.0/24",
+                "primary_ipv6_cidr": "",
+                "secondary_ipv4_cidrs": {
+                    "pods": "10.0.0.0/16",
+                    "services": "10.100.0.0/24",
+                },
+                "gateway_address": "172.16.0.1",
+            },
+            "us-east1": {
+                "name": f"{NAME}-us-ea1",
+                "self_link": f"https://www.googleapis.com/compute/v1/projects/{PROJECT_ID}/regions/us-east1/subnetworks/{NAME}-us-ea1",
+                "id": f"projects/{PROJECT_ID}/regions/us-east1/subnetworks/{NAME}-us-ea1",
+                "primary_ipv4_cidr": "172.16.1.0/24",
+                "primary_ipv6_cidr": "",
+                "secondary_ipv4_cidrs": {
+                    "pods": "10.1.0.0/16",
+                    "services": "10.100.1.0/24",
+                },
+                "gateway_address": "172.16.1.1",
+            },
+        },
+    }
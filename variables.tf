@@ -52,7 +52,7 @@ variable "regions" {
   type     = list(string)
   nullable = false
   validation {
-    condition     = length(var.regions) > 0 && alltrue([for region in var.regions : can(regex("^[a-z]{2,}-[a-z]{2,}[0-9]$", region))])
+    condition     = length(var.regions) > 0 && alltrue([for region in var.regions : can(regex("^[a-z]{2,}-[a-z]{2,}[0-9]+$", region))])
     error_message = "There must be at least one entry, and it must be a valid Google Cloud region name."
   }
   description = <<-EOD
@@ -73,8 +73,13 @@ variable "cidrs" {
       ipv4_subnet_offset = optional(number, 0)
       ipv4_subnet_step   = optional(number, 1)
     })), null)
+    region_slots = optional(map(number), null)
   })
   nullable = true
+  validation {
+    condition     = try(var.cidrs.region_slots, null) == null ? true : alltrue([for slot in values(var.cidrs.region_slots) : floor(slot) == slot && slot >= 0]) && length(distinct(values(var.cidrs.region_slots))) == length(var.cidrs.region_slots)
+    error_message = "Each region_slots entry must be a unique non-negative integer."
+  }
   default = {
     primary_ipv4_cidr          = "172.16.0.0/12"
     primary_ipv4_subnet_size   = 24
@@ -82,10 +87,14 @@ variable "cidrs" {
     primary_ipv4_subnet_step   = 1
     primary_ipv6_cidr          = null
     secondaries                = null
+    region_slots               = null
   }
   description = <<-EOD
   Sets the primary IPv4 CIDR and regional subnet size to use with the network, an optional IPv6 ULA CIDR to use with the
-  network, and any optional secondary IPv4 CIDRs and sizes.
+  network, and any optional secondary IPv4 CIDRs and sizes. By default the subnet CIDRs of a region are numbered by the
+  position of the region in `regions`; set `region_slots` to a map of region to a fixed slot number so that adding or
+  removing a region does not renumber, and replace, the subnets of the other regions. A region without an entry falls
+  back to its position in `regions`.
   EOD
 }
 
@@ -139,18 +148,55 @@ variable "flow_logs" {
 
 variable "nat" {
   type = object({
-    tags           = optional(set(string), [])
-    logging_filter = optional(string, null)
+    tags                                = optional(set(string), [])
+    logging_filter                      = optional(string, null)
+    enable_dynamic_port_allocation      = optional(bool, false)
+    min_ports_per_vm                    = optional(number, null)
+    max_ports_per_vm                    = optional(number, null)
+    enable_endpoint_independent_mapping = optional(bool, null)
+    static_ips                          = optional(map(number), {})
+    tcp_established_idle_timeout_sec    = optional(number, null)
+    tcp_transitory_idle_timeout_sec     = optional(number, null)
+    tcp_time_wait_timeout_sec           = optional(number, null)
+    udp_idle_timeout_sec                = optional(number, null)
+    icmp_idle_timeout_sec               = optional(number, null)
+    include_secondary_ranges            = optional(list(string), null)
+    exclude_secondary_ranges            = optional(list(string), null)
   })
   nullable = true
   validation {
     condition     = var.nat == null ? true : alltrue([for tag in(var.nat.tags == null ? [] : var.nat.tags) : can(regex("^[a-z][a-z0-9-]{0,62}$", tag))]) && var.nat.logging_filter == null ? true : contains(["ALL", "ERRORS_ONLY", "TRANSLATIONS_ONLY", "unspecified"], coalesce(try(var.nat.logging_filter, null), "unspecified"))
     error_message = "If nat is not null, every tag entry has to be RFC1035 compliant, and, if not empty, the logging_filter entry must be one of 'ERRORS_ONLY', 'TRANSLATIONS_ONLY', or 'ALL'"
   }
+  validation {
+    condition     = var.nat == null ? true : try(var.nat.enable_dynamic_port_allocation, false) ? (try(var.nat.min_ports_per_vm, null) == null || contains([for i in range(5, 16) : pow(2, i)], try(var.nat.min_ports_per_vm, 0))) && (try(var.nat.max_ports_per_vm, null) == null || contains([for i in range(6, 17) : pow(2, i)], try(var.nat.max_ports_per_vm, 0))) && coalesce(try(var.nat.min_ports_per_vm, null), 32) < coalesce(try(var.nat.max_ports_per_vm, null), 65536) && !coalesce(try(var.nat.enable_endpoint_independent_mapping, null), false) : (try(var.nat.min_ports_per_vm, null) == null || (floor(try(var.nat.min_ports_per_vm, 0)) == try(var.nat.min_ports_per_vm, 0) && try(var.nat.min_ports_per_vm, 0) >= 2 && try(var.nat.min_ports_per_vm, 0) <= 65536)) && try(var.nat.max_ports_per_vm, null) == null
+    error_message = "With dynamic port allocation, min_ports_per_vm must be a power of 2 between 32 and 32768, max_ports_per_vm a power of 2 between 64 and 65536 that is greater than min_ports_per_vm, and endpoint independent mapping must not be enabled. Without it, min_ports_per_vm must be an integer between 2 and 65536 and max_ports_per_vm must not be set."
+  }
+  validation {
+    condition     = var.nat == null ? true : alltrue([for region, count in coalesce(try(var.nat.static_ips, null), {}) : can(regex("^[a-z]{2,}-[a-z]{2,}[0-9]+$", region)) && floor(count) == count && count >= 0 && count <= 300])
+    error_message = "Each static_ips entry must be keyed by a valid Google Cloud region name and have an integer count between 0 and 300 inclusive."
+  }
+  validation {
+    condition     = var.nat == null ? true : alltrue([for timeout in [try(var.nat.tcp_established_idle_timeout_sec, null), try(var.nat.tcp_transitory_idle_timeout_sec, null), try(var.nat.tcp_time_wait_timeout_sec, null), try(var.nat.udp_idle_timeout_sec, null), try(var.nat.icmp_idle_timeout_sec, null)] : timeout == null ? true : floor(timeout) == timeout && timeout > 0])
+    error_message = "If set, each NAT timeout must be a positive integer number of seconds."
+  }
+  validation {
+    condition     = var.nat == null ? true : (try(var.nat.include_secondary_ranges, null) == null || try(var.nat.exclude_secondary_ranges, null) == null) && alltrue([for range_name in concat(coalesce(try(var.nat.include_secondary_ranges, null), []), coalesce(try(var.nat.exclude_secondary_ranges, null), [])) : can(regex("^[a-z][a-z0-9-]{0,62}$", range_name))])
+    error_message = "Only one of include_secondary_ranges or exclude_secondary_ranges can be set, and every entry has to be an RFC1035 compliant secondary range name."
+  }
   default     = null
   description = <<-EOD
   If not null, Cloud NAT instances and supporting Cloud Routers will be added to each subnet along with supporting
   routes with tags, if applicable. Log collection is controlled by the presence of a non empty logging_filter field.
+  Set `enable_dynamic_port_allocation` to let each VM grow its NAT port allocation from `min_ports_per_vm` up to
+  `max_ports_per_vm` as its connection count rises; endpoint independent mapping must be disabled, or left unset, when
+  dynamic port allocation is enabled. Unset port limits and mapping use the Cloud NAT defaults. The NAT in a region with
+  a positive `static_ips` count uses that many reserved static external addresses instead of automatically allocated
+  addresses, so egress capacity is fixed up front and the source addresses seen by partners do not change. The TCP
+  established, TCP transitory, TCP time-wait, UDP, and ICMP timeouts default to the Cloud NAT values when unset; lower
+  values return NAT ports to the pool sooner for workloads with many short-lived connections. By default the NAT serves
+  every IP range of every subnet; if `include_secondary_ranges` or `exclude_secondary_ranges` is set, the NAT serves the
+  primary range of each subnet and only those secondary ranges that are included, or not excluded, respectively.
   EOD
 }
 